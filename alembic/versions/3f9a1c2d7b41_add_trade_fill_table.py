@@ -0,0 +1,49 @@
+"""Add trade_fill table
+
+Revision ID: 3f9a1c2d7b41
+Revises: 7400b00e0fa6
+Create Date: 2026-10-17 09:12:31.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b41'
+down_revision: Union[str, None] = '7400b00e0fa6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('trade_fill',
+    sa.Column('fill_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('maker_trade_id', sa.Integer(), nullable=False),
+    sa.Column('taker_trade_id', sa.Integer(), nullable=True),
+    sa.Column('maker_discord_id', sa.BigInteger(), nullable=False),
+    sa.Column('taker_discord_id', sa.BigInteger(), nullable=False),
+    sa.Column('base_currency_id', sa.Integer(), nullable=False),
+    sa.Column('quote_currency_id', sa.Integer(), nullable=False),
+    sa.Column('taker_side', sa.Enum('BUY', 'SELL', name='tradetype'), nullable=False),
+    sa.Column('price', sa.Numeric(precision=18, scale=8), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=18, scale=8), nullable=False),
+    sa.Column('executed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['maker_trade_id'], ['trade_list.trade_id'], ),
+    sa.ForeignKeyConstraint(['taker_trade_id'], ['trade_list.trade_id'], ),
+    sa.ForeignKeyConstraint(['base_currency_id'], ['currency.currency_id'], ),
+    sa.ForeignKeyConstraint(['quote_currency_id'], ['currency.currency_id'], ),
+    sa.PrimaryKeyConstraint('fill_id')
+    )
+    op.create_index('idx_fill_maker_trade', 'trade_fill', ['maker_trade_id'], unique=False)
+    op.create_index('idx_fill_taker_trade', 'trade_fill', ['taker_trade_id'], unique=False)
+    op.create_index('idx_fill_pair_executed', 'trade_fill', ['base_currency_id', 'quote_currency_id', 'executed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fill_pair_executed', table_name='trade_fill')
+    op.drop_index('idx_fill_taker_trade', table_name='trade_fill')
+    op.drop_index('idx_fill_maker_trade', table_name='trade_fill')
+    op.drop_table('trade_fill')
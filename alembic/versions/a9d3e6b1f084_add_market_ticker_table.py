@@ -0,0 +1,114 @@
+"""Add market_ticker table
+
+Revision ID: a9d3e6b1f084
+Revises: f2a7c4e0b519
+Create Date: 2026-10-17 17:11:36.027459
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e6b1f084'
+down_revision: Union[str, None] = 'f2a7c4e0b519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'market_ticker',
+        sa.Column('base_currency_id', sa.Integer(), nullable=False),
+        sa.Column('quote_currency_id', sa.Integer(), nullable=False),
+        sa.Column('last_price', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('open_24h', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('high_24h', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('low_24h', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('volume_24h', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('change_24h', sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column('trade_count_24h', sa.Integer(), nullable=False),
+        sa.Column('last_traded_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['base_currency_id'], ['currency.currency_id'], ),
+        sa.ForeignKeyConstraint(['quote_currency_id'], ['currency.currency_id'], ),
+        sa.PrimaryKeyConstraint('base_currency_id', 'quote_currency_id')
+    )
+
+    # One ticker per traded pair: its last trade, and the 5 minute candles of the 24 hours before it
+    connection = op.get_bind()
+    market_ticker = sa.table(
+        'market_ticker',
+        sa.column('base_currency_id', sa.Integer()),
+        sa.column('quote_currency_id', sa.Integer()),
+        *(sa.column(name, sa.Numeric()) for name in ('last_price', 'open_24h', 'high_24h', 'low_24h', 'volume_24h',
+                                                     'change_24h')),
+        sa.column('trade_count_24h', sa.Integer()),
+        sa.column('last_traded_at', sa.DateTime()),
+    )
+    pairs = connection.execute(sa.text("SELECT DISTINCT base_currency_id, quote_currency_id FROM trade_log")).all()
+    for base_currency_id, quote_currency_id in pairs:
+        pair = {"base": base_currency_id, "quote": quote_currency_id}
+        last_price, last_traded_at = connection.execute(
+            sa.text(
+                "SELECT price, date_traded FROM trade_log "
+                "WHERE base_currency_id = :base AND quote_currency_id = :quote "
+                "ORDER BY date_traded DESC, trade_log_id DESC LIMIT 1"
+            ),
+            pair
+        ).one()
+        if isinstance(last_traded_at, str):  # SQLite returns raw text for textual queries
+            last_traded_at = datetime.fromisoformat(last_traded_at)
+        elapsed = int((last_traded_at - timedelta(hours=24) - EPOCH).total_seconds())
+        candles = connection.execute(
+            sa.text(
+                "SELECT open, high, low, volume, trade_count FROM candle "
+                "WHERE base_currency_id = :base AND quote_currency_id = :quote "
+                "AND `interval` = '5m' AND open_time >= :since ORDER BY open_time"
+            ),
+            {**pair, "since": EPOCH + timedelta(seconds=elapsed - elapsed % 300)}
+        ).all()
+
+        # Reference price of the change: the last price before the 24 hours, else the first one in them
+        open_price = connection.execute(
+            sa.text(
+                "SELECT price FROM trade_log "
+                "WHERE base_currency_id = :base AND quote_currency_id = :quote AND date_traded < :threshold "
+                "ORDER BY date_traded DESC, trade_log_id DESC LIMIT 1"
+            ),
+            {**pair, "threshold": last_traded_at - timedelta(hours=24)}
+        ).scalar()
+        if open_price is None:
+            open_price = connection.execute(
+                sa.text(
+                    "SELECT price FROM trade_log "
+                    "WHERE base_currency_id = :base AND quote_currency_id = :quote AND date_traded >= :threshold "
+                    "ORDER BY date_traded, trade_log_id LIMIT 1"
+                ),
+                {**pair, "threshold": last_traded_at - timedelta(hours=24)}
+            ).scalar()
+
+        last_price = Decimal(str(last_price))
+        open_price = Decimal(str(open_price))
+        connection.execute(market_ticker.insert(), {
+            'base_currency_id': base_currency_id,
+            'quote_currency_id': quote_currency_id,
+            'last_price': last_price,
+            'open_24h': open_price,
+            'high_24h': max((candle.high for candle in candles), default=last_price),
+            'low_24h': min((candle.low for candle in candles), default=last_price),
+            'volume_24h': sum((candle.volume for candle in candles), 0),
+            'change_24h': ((last_price - open_price) / open_price * 100).quantize(Decimal('0.0001'))
+            if open_price else 0,
+            'trade_count_24h': sum(candle.trade_count for candle in candles),
+            'last_traded_at': last_traded_at,
+        })
+
+
+def downgrade() -> None:
+    op.drop_table('market_ticker')
@@ -0,0 +1,31 @@
+"""Add composite index for order matching on trade_list
+
+Revision ID: b6e2d4f8a913
+Revises: 3f9a1c2d7b41
+Create Date: 2026-10-17 11:04:52.918204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d4f8a913'
+down_revision: Union[str, None] = '3f9a1c2d7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_trade_matching',
+        'trade_list',
+        ['base_currency_id', 'quote_currency_id', 'type', 'status', 'price_offered', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trade_matching', table_name='trade_list')
@@ -0,0 +1,34 @@
+"""Add indexes for keyset pagination of transactions and open trades
+
+Revision ID: c5e8a2f7d130
+Revises: a9d3e6b1f084
+Create Date: 2026-10-17 21:42:37.516094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2f7d130'
+down_revision: Union[str, None] = 'a9d3e6b1f084'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_transaction_sender_date', 'transaction', ['sender_account_id', 'transaction_date'], unique=False
+    )
+    op.create_index(
+        'idx_transaction_receiver_date', 'transaction', ['receiver_account_id', 'transaction_date'], unique=False
+    )
+    op.create_index('idx_trade_status_price', 'trade_list', ['status', 'type', 'price_offered'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trade_status_price', table_name='trade_list')
+    op.drop_index('idx_transaction_receiver_date', table_name='transaction')
+    op.drop_index('idx_transaction_sender_date', table_name='transaction')
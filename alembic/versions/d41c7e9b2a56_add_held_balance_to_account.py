@@ -0,0 +1,46 @@
+"""Add held_balance to account
+
+Revision ID: d41c7e9b2a56
+Revises: b6e2d4f8a913
+Create Date: 2026-10-17 13:27:05.164830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c7e9b2a56'
+down_revision: Union[str, None] = 'b6e2d4f8a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('account', sa.Column('held_balance', sa.DECIMAL(precision=15, scale=2), nullable=False,
+                                       server_default='0.00'))
+
+    # Backfill what every OPEN order reserves: quote currency for BUY orders, base currency for SELL orders.
+    # Orders were not escrowed before, so the reserved amount is moved out of the available balance.
+    op.execute(
+        """
+        UPDATE account SET held_balance = (
+            SELECT COALESCE(SUM(CASE WHEN trade_list.type = 'BUY'
+                                     THEN trade_list.amount * trade_list.price_offered
+                                     ELSE trade_list.amount END), 0)
+            FROM trade_list
+            WHERE trade_list.discord_id = account.discord_id
+              AND trade_list.status = 'OPEN'
+              AND ((trade_list.type = 'BUY' AND trade_list.quote_currency_id = account.currency_id)
+                OR (trade_list.type = 'SELL' AND trade_list.base_currency_id = account.currency_id))
+        )
+        """
+    )
+    op.execute("UPDATE account SET balance = balance - held_balance")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE account SET balance = balance + held_balance")
+    op.drop_column('account', 'held_balance')
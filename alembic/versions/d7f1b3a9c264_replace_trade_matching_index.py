@@ -0,0 +1,39 @@
+"""Replace the trade matching index with an index on the open orders of a pair
+
+Revision ID: d7f1b3a9c264
+Revises: c5e8a2f7d130
+Create Date: 2026-10-17 23:18:04.662915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f1b3a9c264'
+down_revision: Union[str, None] = 'c5e8a2f7d130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matching runs on the in-memory order book; the database only reads the OPEN orders of a pair
+    op.create_index(
+        'idx_trade_open_book',
+        'trade_list',
+        ['base_currency_id', 'quote_currency_id', 'status', 'type', 'price_offered'],
+        unique=False
+    )
+    op.drop_index('idx_trade_matching', table_name='trade_list')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_trade_matching',
+        'trade_list',
+        ['base_currency_id', 'quote_currency_id', 'type', 'status', 'price_offered', 'created_at'],
+        unique=False
+    )
+    op.drop_index('idx_trade_open_book', table_name='trade_list')
@@ -0,0 +1,95 @@
+"""Add candle table and trade_log quantity
+
+Revision ID: e83b5f1c9d27
+Revises: d41c7e9b2a56
+Create Date: 2026-10-17 15:02:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83b5f1c9d27'
+down_revision: Union[str, None] = 'd41c7e9b2a56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000  # Rows read or written per round trip
+# Copy of services.candleservice.INTERVALS, so the migration does not depend on application code
+INTERVALS = {'1m': 60, '5m': 300, '15m': 900, '1h': 3600, '1d': 86400}
+EPOCH = datetime(1970, 1, 1)
+
+
+def upgrade() -> None:
+    op.add_column('trade_log', sa.Column('quantity', sa.DECIMAL(precision=18, scale=8), nullable=True))
+    op.create_table(
+        'candle',
+        sa.Column('base_currency_id', sa.Integer(), nullable=False),
+        sa.Column('quote_currency_id', sa.Integer(), nullable=False),
+        sa.Column('interval', sa.String(length=3), nullable=False),
+        sa.Column('open_time', sa.DateTime(), nullable=False),
+        sa.Column('open', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('high', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('low', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('close', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('volume', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.Column('trade_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['base_currency_id'], ['currency.currency_id'], ),
+        sa.ForeignKeyConstraint(['quote_currency_id'], ['currency.currency_id'], ),
+        sa.PrimaryKeyConstraint('base_currency_id', 'quote_currency_id', 'interval', 'open_time')
+    )
+
+    # Build the candles of the existing trade logs, one pair at a time in execution order.
+    # The table is new, so every candle of a pair is complete once all its logs are read.
+    connection = op.get_bind()
+    candle = sa.table(
+        'candle',
+        *(sa.column(name) for name in ('base_currency_id', 'quote_currency_id', 'interval', 'open_time', 'open',
+                                       'high', 'low', 'close', 'volume', 'trade_count'))
+    )
+    pairs = connection.execute(sa.text("SELECT DISTINCT base_currency_id, quote_currency_id FROM trade_log")).all()
+    for base_currency_id, quote_currency_id in pairs:
+        candles = {}
+        last_id = 0
+        while rows := connection.execute(
+            sa.text(
+                "SELECT trade_log_id, price, quantity, date_traded FROM trade_log "
+                "WHERE base_currency_id = :base AND quote_currency_id = :quote AND trade_log_id > :last_id "
+                "ORDER BY trade_log_id LIMIT :limit"
+            ),
+            {"base": base_currency_id, "quote": quote_currency_id, "last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all():
+            last_id = rows[-1].trade_log_id
+            for row in rows:
+                # Same flooring as CandleService.get_bucket, on the naive UTC dates of the table
+                date_traded = row.date_traded
+                if isinstance(date_traded, str):  # SQLite returns raw text for textual queries
+                    date_traded = datetime.fromisoformat(date_traded)
+                elapsed = int((date_traded - EPOCH).total_seconds())
+                for interval, seconds in INTERVALS.items():
+                    key = (interval, EPOCH + timedelta(seconds=elapsed - elapsed % seconds))
+                    current = candles.get(key)
+                    if current is None:
+                        candles[key] = {
+                            'base_currency_id': base_currency_id, 'quote_currency_id': quote_currency_id,
+                            'interval': interval, 'open_time': key[1], 'open': row.price, 'high': row.price,
+                            'low': row.price, 'close': row.price, 'volume': row.quantity or 0, 'trade_count': 1,
+                        }
+                    else:
+                        current['high'] = max(current['high'], row.price)
+                        current['low'] = min(current['low'], row.price)
+                        current['close'] = row.price
+                        current['volume'] += row.quantity or 0
+                        current['trade_count'] += 1
+        rows = list(candles.values())
+        for offset in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            connection.execute(candle.insert(), rows[offset:offset + BACKFILL_BATCH_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_table('candle')
+    op.drop_column('trade_log', 'quantity')
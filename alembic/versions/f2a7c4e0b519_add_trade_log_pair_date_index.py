@@ -0,0 +1,31 @@
+"""Add composite (pair, date_traded) index on trade_log
+
+Revision ID: f2a7c4e0b519
+Revises: e83b5f1c9d27
+Create Date: 2026-10-17 16:20:13.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c4e0b519'
+down_revision: Union[str, None] = 'e83b5f1c9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_trade_log_pair_date',
+        'trade_log',
+        ['base_currency_id', 'quote_currency_id', 'date_traded'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trade_log_pair_date', table_name='trade_log')
@@ -1,12 +1,19 @@
+from utilities.startupreport import StartupReport  # First, so the import phase covers every other module
 import datetime
 
 import discord
 import asyncio
+import importlib
 import logging
 from discord.ext import commands
 import os
 import sys
+import time
 from dotenv import load_dotenv
+from db import engine
+from services.orderbook import OrderBookService
+from plotting.renderpool import ChartRenderPool
+from utilities.commandsync import CommandTreeSync
 
 # Set up logging to file
 logging.basicConfig(
@@ -38,29 +45,78 @@ sys.excepthook = log_uncaught_exception
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 
+# Modules too heavy to import before connecting, loaded in the background once the bot is ready
+WARM_UP_MODULES = ("plotting.chartplotter",)
+
 # Bot setup
 intents = discord.Intents.default()
 bot = commands.Bot(command_prefix=["!", "?", "&"], intents=intents)
-# Event: Bot is ready
+_warm_up_task = None
+
+
+async def warm_up():
+    # Import on a worker thread so the event loop keeps serving interactions meanwhile
+    for module in WARM_UP_MODULES:
+        await asyncio.to_thread(importlib.import_module, module)
+    await ChartRenderPool.warm_up()
+    print(f"Warmed up the plotting stack in {StartupReport.mark('warm-up'):.2f}s")
+
+
+# Event: Bot is ready. The only on_ready handler of the bot; cogs must not register their own.
 @bot.event
 async def on_ready():
-    await bot.tree.sync()  # Sync slash commands globally
+    global _warm_up_task
+    if hasattr(bot, "start_time"):
+        # on_ready fires again after every reconnect; only the first one finishes startup
+        return
+    bot.start_time = time.time()
+    StartupReport.mark("gateway")
+
+    try:
+        synced = await CommandTreeSync.sync_if_changed(bot)
+        print("Synced slash commands" if synced else "Slash commands unchanged, skipped sync")
+    except Exception as e:
+        logging.error(f"Failed to sync slash commands: {e}")
+    StartupReport.mark("command sync")
 
-# Function to dynamically load cogs
+    print(f"Startup: {StartupReport.format()}")
+    _warm_up_task = asyncio.create_task(warm_up())
+
+
+async def load_cog(filename: str):
+    start = time.perf_counter()
+    try:
+        await bot.load_extension(f"cogs.{filename[:-3]}")
+        print(f"Loaded cog: {filename} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    except Exception as e:
+        print(f"Failed to load cog {filename}: {e}")
+
+
+# Function to dynamically load cogs, all at once so their async setups overlap
 async def load_cogs():
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and filename != "__init__.py":
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                print(f"Loaded cog: {filename}")
-            except Exception as e:
-                print(f"Failed to load cog {filename}: {e}")
+    await asyncio.gather(*(
+        load_cog(filename) for filename in sorted(os.listdir("./cogs"))
+        if filename.endswith(".py") and filename != "__init__.py"
+    ))
 
 
 # Run the bot
 async def main():
+    StartupReport.mark("imports")
     async with bot:
         await load_cogs()
-        await bot.start(TOKEN)
+        StartupReport.mark("cogs")
+        # Hydrate the in-memory order books from the OPEN trades before accepting orders
+        await OrderBookService.load_order_books()
+        StartupReport.mark("database")
+        try:
+            await bot.start(TOKEN)
+        finally:
+            # Close the pooled database connections and the chart workers
+            await engine.dispose()
+            ChartRenderPool.shutdown()
+
 
-asyncio.run(main())
+# Guarded so the spawned chart render workers can import this module without starting the bot
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,4 @@
-import datetime
-
 import discord
-import time
 from discord import app_commands
 from discord.ext import commands
 from modals.createaccountmodal import CreateAccountModal
@@ -83,6 +80,8 @@ class AccountCog(commands.Cog):
         embed = discord.Embed(title="ACCOUNT INFORMATION", color=0xbababa)
         embed.add_field(name="Account Number", value=f"`{ticker.upper()}-{interaction.user.id}`", inline=True)
         embed.add_field(name="Balance", value=f"**{account.balance} {ticker.upper()}**", inline=True)
+        if account.held_balance:
+            embed.add_field(name="In Open Orders", value=f"**{account.held_balance} {ticker.upper()}**", inline=True)
         embed.add_field(name="Role", value=f"**{'NO ROLE' if not role else RoleType(role.role_number).name}**",
                         inline=True)
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -94,13 +93,3 @@ class AccountCog(commands.Cog):
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(AccountCog(bot))
-
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        print(datetime.datetime.now())
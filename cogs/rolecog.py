@@ -1,7 +1,4 @@
-import datetime
-
 import discord
-import time
 from discord import app_commands
 from discord.ext import commands
 
@@ -122,13 +119,3 @@ class RoleCog(commands.Cog):
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(RoleCog(bot))
-
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        datetime.datetime.now()
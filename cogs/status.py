@@ -1,9 +1,10 @@
-import datetime
-
 import discord
 from discord.ext import commands
 from discord import app_commands
 import time
+from db import get_pool_stats
+from plotting.renderpool import ChartRenderPool
+from plotting.chartcache import ChartCache
 
 
 class StatusCog(commands.Cog):
@@ -25,6 +26,23 @@ class StatusCog(commands.Cog):
 
         return latency, uptime, hours, minutes, seconds, server_count
 
+    @staticmethod
+    def get_pool_info():
+        """Helper function to format the database connection pool usage."""
+        stats = get_pool_stats()
+        return (f"{stats['checked_out']} in use / {stats['checked_in']} idle\n"
+                f"size {stats['size']} + overflow {stats['overflow']}/{stats['max_overflow']}")
+
+    @staticmethod
+    def get_render_info():
+        """Helper function to format the chart render pool usage."""
+        stats = ChartRenderPool.get_stats()
+        cache = ChartCache.get_stats()
+        return (f"{stats['running']}/{stats['concurrency']} rendering, {stats['waiting']} queued\n"
+                f"{stats['rendered']} rendered, {stats['failed']} failed, avg {stats['avg_render_ms']:.0f} ms\n"
+                f"cache {cache['hits']} hits / {cache['misses']} misses, "
+                f"{cache['entries']} charts, {cache['bytes'] / 1024 / 1024:.1f}/{cache['max_bytes'] / 1024 / 1024:.0f} MB")
+
     # Prefix command to check bot status
     @commands.command()
     async def status(self, ctx):
@@ -36,6 +54,8 @@ class StatusCog(commands.Cog):
         embed.add_field(name="Latency", value=f"{latency} ms")
         embed.add_field(name="Uptime", value=f"{hours}h {minutes}m {seconds}s")
         embed.add_field(name="Servers", value=f"{server_count} servers")
+        embed.add_field(name="DB Pool", value=self.get_pool_info())
+        embed.add_field(name="Chart Renders", value=self.get_render_info())
         embed.set_footer(text=f"Requested by {ctx.author.name}")
 
         await ctx.send(embed=embed)
@@ -51,6 +71,8 @@ class StatusCog(commands.Cog):
         embed.add_field(name="Latency", value=f"{latency} ms")
         embed.add_field(name="Uptime", value=f"{hours}h {minutes}m {seconds}s")
         embed.add_field(name="Servers", value=f"{server_count} servers")
+        embed.add_field(name="DB Pool", value=self.get_pool_info())
+        embed.add_field(name="Chart Renders", value=self.get_render_info())
         embed.set_footer(text=f"Requested by {interaction.user.name}")
 
         await interaction.response.send_message(embed=embed)
@@ -59,13 +81,3 @@ class StatusCog(commands.Cog):
 
 async def setup(bot):
     await bot.add_cog(StatusCog(bot))  # Await the add_cog() method
-
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        print(datetime.datetime.now())
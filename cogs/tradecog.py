@@ -1,8 +1,6 @@
-import datetime
 from typing import Tuple
 
 import discord
-import time
 import io
 from datetime import timedelta
 from discord import app_commands, Embed, File
@@ -13,7 +11,7 @@ from modals.burnmodal import BurnModal
 from models.trade import TradeStatus, TradeType
 from views.tradelimitview import TradeLimitView
 from views.tradelogview import TradeLogView
-from plotting.chartplotter import ChartPlotter
+from views.tradedepthview import TradeDepthView
 from services.tradelogservice import TradeLogService
 from services.currencyservice import CurrencyService
 from services.tradeservice import TradeService
@@ -69,6 +67,11 @@ class TradeCog(commands.Cog):
         
         Cancels your trade. Doesn't work for trades that is isn't yours.
         
+        **/trade depth <ticker pair>**
+        
+        Shows the open orders of a pair grouped by price level,
+        with the total quantity and number of orders on each level.
+        
         **/trade active <trade type (OPTIONAL)>** 
         
         Views Trades. It defaults to your trade but you can adjust the filters
@@ -86,6 +89,10 @@ class TradeCog(commands.Cog):
     async def trade_limit(self, interaction: discord.Interaction, ticker_pair: str):
         await TradeLimitView.display(bot=self.bot, interaction=interaction, ticker_pair=ticker_pair)
 
+    @group.command(name="depth", description="View the order book depth of a pair")
+    async def trade_depth(self, interaction: discord.Interaction, ticker_pair: str):
+        await TradeDepthView.display(interaction=interaction, ticker_pair=ticker_pair)
+
     @group.command(name="cancel", description="Cancel your trade")
     async def cancel_trade(self, interaction: discord.Interaction, trade_id: int) -> None:
         await interaction.response.defer(ephemeral=True)
@@ -179,13 +186,3 @@ class TradeCog(commands.Cog):
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(TradeCog(bot))
-
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        print(datetime.datetime.now())
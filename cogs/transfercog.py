@@ -1,8 +1,7 @@
-import datetime
-
+import csv
 import discord
-import time
-from decimal import Decimal
+import io
+from decimal import Decimal, InvalidOperation
 from discord import app_commands
 from discord.ext import commands
 
@@ -10,7 +9,10 @@ from models import Transaction
 from services.accountservice import AccountService
 from services.currencyservice import CurrencyService
 from modals.transfermodal import TransferModal
-from utilities.tools import validate_decimal
+from utilities.tools import validate_decimal, separate_account_number
+
+# Maximum number of rows accepted in one /transfer batch file
+MAX_BATCH_TRANSFERS = 500
 
 class TransferCog(commands.GroupCog, group_name="transfer"):
     def __init__(self, bot: commands.Bot) -> None:
@@ -25,6 +27,12 @@ class TransferCog(commands.GroupCog, group_name="transfer"):
         Transfers your money into a user. You can just enter `/transfer funds`
         and input the **account number** of the receiver.
         
+        **/transfer batch <ticker> <csv file>**
+        
+        Pays many users at once (ex. salaries, airdrops). Each line of the
+        file is `<receiver>,<amount>` where the receiver is a Discord ID or
+        an account number. Either every transfer is made or none is.
+        
         """
 
         embed = discord.Embed(
@@ -155,14 +163,118 @@ class TransferCog(commands.GroupCog, group_name="transfer"):
         await interaction.response.send_modal(modal)
 
 
+    @staticmethod
+    def parse_batch_file(content: bytes, ticker: str) -> list[tuple[int, Decimal]]:
+        """
+        Parses the rows of a batch transfer CSV file.
+
+        Args:
+            content (bytes): The file content, one `<receiver>,<amount>` row per line. A header row is allowed.
+            ticker (str): The ticker of the transferred currency, checked against account numbers.
+
+        Returns:
+            list[tuple[int, Decimal]]: (receiver Discord ID, amount) pairs.
+
+        Raises:
+            ValueError: If a row is malformed, with the line number in the message.
+        """
+        transfers = []
+        rows = csv.reader(io.StringIO(content.decode("utf-8-sig")))
+        for line_number, row in enumerate(rows, start=1):
+            row = [value.strip() for value in row]
+            if not any(row):
+                continue
+            if len(row) != 2:
+                raise ValueError(f"Line {line_number}: expected `<receiver>,<amount>`")
+
+            receiver, text = row
+            try:
+                amount = Decimal(text)
+            except InvalidOperation:
+                if line_number == 1:
+                    continue  # Header row
+                raise ValueError(f"Line {line_number}: `{text}` is not a number")
+            if not amount.is_finite():
+                raise ValueError(f"Line {line_number}: `{text}` is not a number")
+            if amount.as_tuple().exponent < -2:
+                raise ValueError(f"Line {line_number}: amount shall have at most 2 decimal places")
+            if not validate_decimal(amount):
+                raise ValueError(f"Line {line_number}: amount shall be between 0.01 and 999,999,999,999,999.99")
+
+            if not receiver.isdigit():
+                account_number = separate_account_number(receiver)
+                if account_number == -1 or account_number[0].upper() != ticker.upper():
+                    raise ValueError(f"Line {line_number}: `{receiver}` is not a {ticker.upper()} account number")
+                receiver = account_number[1]
+            if not str(receiver).isdigit():
+                raise ValueError(f"Line {line_number}: `{receiver}` is not a Discord ID")
+            transfers.append((int(receiver), amount))
+        return transfers
+
+    @app_commands.command(name="batch", description="Transfers funds to many users from a CSV file")
+    async def batch_transfer(self, interaction: discord.Interaction, ticker: str, file: discord.Attachment) -> None:
+        await interaction.response.defer(ephemeral=True)
+
+        currency = await CurrencyService.read_currency_by_ticker(ticker.upper())
+        if not currency:
+            embed = discord.Embed(
+                title="Currency doesn't exist",
+                description="The currency ticker that you have entered doesn't exist\n"
+                            "Please check your currency ticker again",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        try:
+            transfers = TransferCog.parse_batch_file(await file.read(), ticker)
+        except (ValueError, UnicodeDecodeError) as e:
+            embed = discord.Embed(
+                title="INVALID FILE",
+                description=f"{e}\nEach line shall be `<receiver>,<amount>`",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        if len(transfers) > MAX_BATCH_TRANSFERS:
+            embed = discord.Embed(
+                title="TOO MANY TRANSFERS",
+                description=f"A batch can have at most {MAX_BATCH_TRANSFERS} transfers",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        transfer_result = await AccountService.batch_transfer(interaction.user.id, currency.currency_id, transfers)
+
+        if isinstance(transfer_result, list):
+            total = sum(transaction.amount for transaction in transfer_result)
+            embed = discord.Embed(
+                title="BATCH TRANSFER COMPLETE",
+                description=f"You have transferred **{total} {currency.name}** "
+                            f"to **{len({t.receiver_account_id for t in transfer_result})}** accounts "
+                            f"in **{len(transfer_result)}** transfers.",
+                color=0x00ff00
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        description = {
+            -1: "The file has no transfers",
+            -2: "Sender's account does not exist for the specified currency.",
+            -3: "You cannot transfer to your own account",
+            -4: "Insufficient balance in the sender's account for the total",
+            -5: f"One or more receivers do not have an {ticker.upper()} account",
+            -6: "Sender or receiver account is disabled.",
+        }.get(transfer_result, "Unexpected error")
+        embed = discord.Embed(
+            title="TRANSFER FAILED",
+            description=description,
+            color=0xff0000
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(TransferCog(bot))
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        print(datetime.datetime.now())
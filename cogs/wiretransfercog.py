@@ -1,10 +1,8 @@
-import datetime
 import discord
 from discord.app_commands import describe
 from discord.ext import commands
 from discord import app_commands
 from views.boatwiretransferview import BoatWireTransferView
-import time
 
 class WireTransfer(commands.GroupCog, group_name="wire"):
     def __init__(self, bot):
@@ -38,13 +36,3 @@ class WireTransfer(commands.GroupCog, group_name="wire"):
 
 async def setup(bot):
     await bot.add_cog(WireTransfer(bot))  # Await the add_cog() method
-
-    # Sync the slash commands to Discord
-    @bot.event
-    async def on_ready():
-        # Initialize the start_time when the bot is ready
-        bot.start_time = time.time()  # This sets the start_time attribute
-
-        # Syncing the slash commands (if needed)
-        await bot.tree.sync()
-        print(datetime.datetime.now())
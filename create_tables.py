@@ -8,6 +8,7 @@ async def create_tables():
     # Use the engine to run create_all synchronously in an async context
     async with engine.begin() as conn:  # engine.begin() is used for transaction
         await conn.run_sync(Base.metadata.create_all)  # Run create_all synchronously
+    await engine.dispose()  # Close the pooled connections
 
 # Run the function asynchronously
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import DBAPIError
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import asyncio
+import random
 from models.base import Base  # Make sure your models are imported here
 
 # Load environment variables
@@ -16,22 +19,170 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in .env file.")
 
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # Connections kept open
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # Extra connections allowed under load
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Reconnect after this many seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_DEADLOCK_RETRIES = int(os.getenv("DB_DEADLOCK_RETRIES", "3"))  # Retries of a transaction chosen as deadlock victim
+
+# MySQL errors after which the whole transaction was rolled back and can safely be run again
+DEADLOCK_ERROR_CODES = (
+    1205,  # Lock wait timeout exceeded
+    1213,  # Deadlock found when trying to get lock
+)
+
 # Create an async engine
-engine = create_async_engine(DATABASE_URL, echo=False, poolclass=NullPool, pool_recycle=3600)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+
+class UnitOfWorkRolledBack(Exception):
+    """
+    Raised when the outermost block of a unit of work tries to commit after a nested
+    service call rolled back; the whole transaction was rolled back instead.
+    """
+
+
+class UnitOfWorkSession(AsyncSession):
+    """
+    Session shared by every service call made within the same unit of work.
+
+    While a nested service call is running, its commit() only flushes; the changes
+    are committed together with the outermost caller's transaction. Its rollback()
+    cannot undo only its own changes, so it marks the unit of work as failed and the
+    outermost caller's commit rolls everything back and raises UnitOfWorkRolledBack.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.nesting = 0  # Number of nested get_session() blocks currently using this session
+        self.pending_commit = False  # A nested call asked to commit
+        self.rollback_only = False  # A nested call asked to roll back
+
+    async def commit(self) -> None:
+        if self.nesting > 0:
+            await self.flush()
+            self.pending_commit = True
+            return
+        if self.rollback_only:
+            await self.rollback()
+            raise UnitOfWorkRolledBack("A nested service call rolled back the unit of work.")
+        await super().commit()
+        self.pending_commit = False
+
+    async def rollback(self) -> None:
+        if self.nesting > 0:
+            self.rollback_only = True
+            return
+        await super().rollback()
+        self.pending_commit = False
+        self.rollback_only = False
+
 
 # Create a sessionmaker for async sessions
 async_session = sessionmaker(
     bind=engine,
     expire_on_commit=False,
-    class_=AsyncSession
+    class_=UnitOfWorkSession
 )
 
+# The session of the unit of work running in the current context, if any
+_current_session: ContextVar[UnitOfWorkSession | None] = ContextVar("current_session", default=None)
+
 
 # Function to get the session
 @asynccontextmanager
 async def get_session() -> AsyncSession:
     """
     Provide a database session in an async context manager.
+
+    If the caller is already inside a get_session() block, the caller's session and
+    transaction are reused, so nested service calls share one connection. Commits made
+    by nested calls are deferred to the outermost block, which also commits them when it
+    exits normally, and a rollback by a nested call makes that commit roll back and raise
+    UnitOfWorkRolledBack instead. Tasks started inside a block inherit the session, so do not run
+    concurrent queries (e.g. asyncio.gather) from within one.
     """
+    session = _current_session.get()
+    if session is not None:
+        session.nesting += 1
+        try:
+            yield session
+        finally:
+            session.nesting -= 1
+        return
+
     async with async_session() as session:
-        yield session
+        token = _current_session.set(session)
+        try:
+            yield session
+            if session.pending_commit or session.rollback_only:
+                await session.commit()
+        finally:
+            _current_session.reset(token)
+
+
+def is_deadlock(error: DBAPIError) -> bool:
+    """
+    Tells whether a database error means the transaction lost a lock conflict and can be retried.
+    """
+    orig = error.orig
+    if orig is None:
+        return False
+    if orig.args and orig.args[0] in DEADLOCK_ERROR_CODES:
+        return True
+    return "database is locked" in str(orig)  # SQLite
+
+
+async def retry_on_deadlock(func, *args, retries: int = DB_DEADLOCK_RETRIES, **kwargs):
+    """
+    Runs a coroutine function that opens its own unit of work, running it again with a short
+    randomized backoff if its transaction is rolled back by a deadlock or lock wait timeout.
+
+    Only a complete unit of work can be retried: when called from inside another get_session()
+    block, the error is raised to the caller, whose transaction was rolled back as well.
+
+    Args:
+        func: The coroutine function to run.
+        *args: Positional arguments for `func`.
+        retries (int): Maximum number of retries (default is DB_DEADLOCK_RETRIES).
+        **kwargs: Keyword arguments for `func`.
+
+    Returns:
+        The value returned by `func`.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await func(*args, **kwargs)
+        except DBAPIError as e:
+            if attempt == retries or _current_session.get() is not None or not is_deadlock(e):
+                raise
+            await asyncio.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns the current state of the connection pool.
+
+    Returns:
+        dict: Configured size and overflow, plus the connections currently
+              checked in (idle), checked out (in use) and in overflow.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
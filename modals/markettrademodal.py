@@ -0,0 +1,96 @@
+import discord
+from decimal import Decimal, InvalidOperation
+from discord.ext import commands
+from utilities.tools import validate_decimal
+from services.tradeservice import TradeService, TradeType, MARKET_MAX_SLIPPAGE
+from models.currency import Currency
+from models.trade import OrderType
+
+
+class MarketTradeModal(discord.ui.Modal, title="Create a market trade"):
+    amount = discord.ui.TextInput(
+        label="Amount",
+        placeholder="Amount of units to be traded",
+        max_length=18
+    )
+    max_slippage = discord.ui.TextInput(
+        label="Max slippage (%)",
+        placeholder="How far from the best price the trade may go",
+        default=f"{MARKET_MAX_SLIPPAGE * 100:g}",
+        required=False,
+        max_length=6
+    )
+
+    def __init__(self, bot: commands.Bot, trade_type: TradeType,
+                 base_currency: Currency, quote_currency: Currency, view: discord.ui.View):
+        super().__init__()
+        self.bot = bot
+        self.trade_type = trade_type
+        self.base_currency = base_currency
+        self.quote_currency = quote_currency
+        self.view = view
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            amount = Decimal(self.amount.value)
+            max_slippage = Decimal(self.max_slippage.value or MARKET_MAX_SLIPPAGE * 100) / 100
+            if not amount.is_finite() or not max_slippage.is_finite():
+                raise InvalidOperation
+        except InvalidOperation:
+            amount = max_slippage = None
+
+        if amount is None or not validate_decimal(amount) or not 0 <= max_slippage < 1:
+            embed = discord.Embed(
+                title="Invalid amount format",
+                description="Make sure the amount is not more than 999,999,999,999,999.99\n"
+                            "or less than 0.01 and the slippage is between 0 and 100%",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        result = await TradeService.process_trade(
+            discord_id=interaction.user.id,
+            trade_type=self.trade_type,
+            base_currency_id=self.base_currency.currency_id,
+            quote_currency_id=self.quote_currency.currency_id,
+            price=None,
+            amount=amount,
+            order_type=OrderType.MARKET,
+            max_slippage=max_slippage
+        )
+
+        if result == 1:
+            embed = discord.Embed(
+                title="TRADE SUCCESS",
+                description=f"Your market {self.trade_type.value} of "
+                            f"{amount:,.2f} {self.base_currency.ticker.upper()} has been fulfilled",
+                color=0x00ff00,
+            )
+        elif result == 6:
+            embed = discord.Embed(
+                title="TRADE SUCCESS",
+                description="Trade partially fulfilled within your slippage and the rest canceled",
+                color=0x00ff00,
+            )
+        elif result == 5:
+            embed = discord.Embed(
+                title="TRADE NOT FILLED",
+                description="There are no orders within your slippage to trade against",
+                color=0xff0000,
+            )
+        elif result == 3:
+            embed = discord.Embed(
+                title="INSUFFICIENT FUNDS",
+                description="You do not have enough funds",
+                color=0xff0000,
+            )
+        else:
+            embed = discord.Embed(
+                title="ACCOUNT DISABLED",
+                description="Either you or the other parties account is disabled",
+                color=0xff0000,
+            )
+        await interaction.followup.send(embed=embed, ephemeral=True)
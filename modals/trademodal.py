@@ -6,7 +6,7 @@ from utilities.tools import separate_account_number,  validate_decimal
 from services.currencyservice import CurrencyService
 from services.tradeservice import TradeService, TradeType
 from models.currency import Currency
-from models.trade import TradeList
+from models.trade import TradeList, TimeInForce
 
 class TradeModal(discord.ui.Modal, title="Create a trade"):
     price = discord.ui.TextInput(
@@ -19,6 +19,13 @@ class TradeModal(discord.ui.Modal, title="Create a trade"):
         placeholder="Amount of units to be traded",
         max_length=18
     )
+    time_in_force = discord.ui.TextInput(
+        label="Time in force",
+        placeholder="GTC (rest on the book), IOC (cancel the rest) or FOK (all or nothing)",
+        default="GTC",
+        required=False,
+        max_length=3
+    )
 
     def __init__(self, bot: commands.Bot, trade_type: TradeType,
                  base_currency: Currency, quote_currency: Currency, view: discord.ui.View):
@@ -38,6 +45,17 @@ class TradeModal(discord.ui.Modal, title="Create a trade"):
 
         await interaction.response.defer(ephemeral=True)
 
+        try:
+            time_in_force = TimeInForce((self.time_in_force.value or "GTC").strip().upper())
+        except ValueError:
+            embed = discord.Embed(
+                title="Invalid time in force",
+                description="Time in force should be GTC, IOC or FOK",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
         if not validate_decimal(Decimal(price)) and not validate_decimal(Decimal(amount)):
             embed = discord.Embed(
                 title="Invalid amount format",
@@ -54,7 +72,8 @@ class TradeModal(discord.ui.Modal, title="Create a trade"):
             base_currency_id=self.base_currency.currency_id,
             quote_currency_id=self.quote_currency.currency_id,
             price=Decimal(price),
-            amount=Decimal(amount)
+            amount=Decimal(amount),
+            time_in_force=time_in_force
         )
 
         # embed_prompt = ""
@@ -89,6 +108,23 @@ class TradeModal(discord.ui.Modal, title="Create a trade"):
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
+        elif result == 6:
+            embed = discord.Embed(
+                title="TRADE SUCCESS",
+                description="Trade partially fulfilled and the rest canceled\n"
+                            f"Total: {total}",
+                color=0x00ff00,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        elif result == 5:
+            embed = discord.Embed(
+                title="TRADE NOT FILLED",
+                description="There were not enough orders at your price to fill this trade",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
         elif result == 3:
             embed = discord.Embed(
                 title="INSUFFICIENT FUNDS",
@@ -2,6 +2,9 @@ from .account import Account
 from .transaction import Transaction
 from .trade import TradeList, TradeType
 from .tradelog import TradeLog
+from .tradefill import TradeFill
+from .candle import Candle
+from .marketticker import MarketTicker
 from. currency import Currency
 from .role import Role
 from .base import Base
@@ -12,7 +12,8 @@ class Account(Base):
     account_id = Column(Integer, primary_key=True)
     discord_id = Column(BigInteger, unique=False, nullable=False)
     currency_id = Column(Integer, ForeignKey('currency.currency_id'), nullable=False)
-    balance = Column(DECIMAL(15, 2), nullable=False, default=0.00)
+    balance = Column(DECIMAL(15, 2), nullable=False, default=0.00)  # Available to spend
+    held_balance = Column(DECIMAL(15, 2), nullable=False, default=0.00, server_default="0.00")  # Reserved by open orders
     is_disabled = Column(Boolean, default=False)
 
     # Relationship to Currency table
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime, String
+from .base import Base
+
+
+class Candle(Base):
+    """
+    OHLCV aggregate of the trade log of a pair over one time bucket.
+    One row per (pair, interval, bucket), kept current as trades are logged.
+    """
+    __tablename__ = "candle"
+
+    base_currency_id = Column(Integer, ForeignKey("currency.currency_id"), primary_key=True)
+    quote_currency_id = Column(Integer, ForeignKey("currency.currency_id"), primary_key=True)
+    interval = Column(String(3), primary_key=True)  # 1m, 5m, 15m, 1h or 1d
+    open_time = Column(DateTime, primary_key=True)  # Start of the bucket (UTC)
+    open = Column(Numeric(precision=18, scale=8), nullable=False)
+    high = Column(Numeric(precision=18, scale=8), nullable=False)
+    low = Column(Numeric(precision=18, scale=8), nullable=False)
+    close = Column(Numeric(precision=18, scale=8), nullable=False)
+    volume = Column(Numeric(precision=18, scale=8), nullable=False, default=0)  # Base currency traded
+    trade_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class MarketTicker(Base):
+    """
+    Latest price and trailing 24 hour statistics of a pair, as of its last trade.
+    Upserted whenever a trade is logged, so the board never scans the trade log.
+    """
+    __tablename__ = "market_ticker"
+
+    base_currency_id = Column(Integer, ForeignKey("currency.currency_id"), primary_key=True)
+    quote_currency_id = Column(Integer, ForeignKey("currency.currency_id"), primary_key=True)
+    last_price = Column(Numeric(precision=18, scale=8), nullable=False)
+    open_24h = Column(Numeric(precision=18, scale=8), nullable=False)  # Last price before the window, else first in it
+    high_24h = Column(Numeric(precision=18, scale=8), nullable=False)
+    low_24h = Column(Numeric(precision=18, scale=8), nullable=False)
+    volume_24h = Column(Numeric(precision=18, scale=8), nullable=False, default=0)  # Base currency traded
+    change_24h = Column(Numeric(precision=12, scale=4), nullable=False, default=0)  # Percentage from open_24h
+    trade_count_24h = Column(Integer, nullable=False, default=0)
+    last_traded_at = Column(DateTime, nullable=False)
+
+    base_currency = relationship("Currency", foreign_keys=[base_currency_id])
+    quote_currency = relationship("Currency", foreign_keys=[quote_currency_id])
@@ -10,10 +10,15 @@ class TradeType(enum.Enum):
     SELL = "SELL"
 
 class OrderType(enum.Enum):
-    LIMIT = "limit",
+    LIMIT = "limit"
     MARKET = "market"
     P2P = "P2P"
 
+class TimeInForce(enum.Enum):
+    GTC = "GTC"  # Good till canceled: the unfilled remainder rests on the book
+    IOC = "IOC"  # Immediate or cancel: the unfilled remainder is canceled
+    FOK = "FOK"  # Fill or kill: the order executes in full or not at all
+
 class TradeStatus(enum.Enum):
     OPEN = "OPEN"
     CLOSED = "CLOSED"
@@ -45,5 +50,9 @@ class TradeList(Base):
     __table_args__ = (
         Index('idx_discord_id', 'discord_id'),
         Index('idx_base_quote_currency', 'base_currency_id', 'quote_currency_id'),
+        # Order book hydration and the depth ladder: the OPEN orders of a pair, grouped by side and price
+        Index('idx_trade_open_book', 'base_currency_id', 'quote_currency_id', 'status', 'type', 'price_offered'),
+        # Keyset pagination of the open trades of one type by price
+        Index('idx_trade_status_price', 'status', 'type', 'price_offered'),
     )
 
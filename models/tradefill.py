@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Numeric, BigInteger, DateTime, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from .trade import TradeType
+from .base import Base
+
+
+class TradeFill(Base):
+    __tablename__ = "trade_fill"
+
+    fill_id = Column(Integer, primary_key=True, autoincrement=True)
+    maker_trade_id = Column(Integer, ForeignKey("trade_list.trade_id"), nullable=False)
+    taker_trade_id = Column(Integer, ForeignKey("trade_list.trade_id"), nullable=True)  # Only if the taker rested a remainder
+    maker_discord_id = Column(BigInteger, nullable=False)
+    taker_discord_id = Column(BigInteger, nullable=False)
+    base_currency_id = Column(Integer, ForeignKey("currency.currency_id"), nullable=False)
+    quote_currency_id = Column(Integer, ForeignKey("currency.currency_id"), nullable=False)
+    taker_side = Column(Enum(TradeType), nullable=False)
+    price = Column(Numeric(precision=18, scale=8), nullable=False)
+    quantity = Column(Numeric(precision=18, scale=8), nullable=False)
+    executed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    maker_trade = relationship("TradeList", foreign_keys=[maker_trade_id])
+    taker_trade = relationship("TradeList", foreign_keys=[taker_trade_id])
+
+    # Indexing for performance
+    __table_args__ = (
+        Index('idx_fill_maker_trade', 'maker_trade_id'),
+        Index('idx_fill_taker_trade', 'taker_trade_id'),
+        Index('idx_fill_pair_executed', 'base_currency_id', 'quote_currency_id', 'executed_at'),
+    )
@@ -11,6 +11,7 @@ class TradeLog(Base):
     base_currency_id = Column(Integer, ForeignKey('currency.currency_id'), nullable=False)
     quote_currency_id = Column(Integer, ForeignKey('currency.currency_id'), nullable=False)
     price = Column(DECIMAL(precision=18, scale=8), nullable=False)
+    quantity = Column(DECIMAL(precision=18, scale=8), nullable=True)  # Base amount traded; unknown for older logs
     date_traded = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
 
     base_currency = relationship("Currency", foreign_keys=[base_currency_id])
@@ -18,3 +19,5 @@ class TradeLog(Base):
 
 
 Index('idx_date_traded', TradeLog.date_traded)
+# Per pair range scans in date order; the primary key stored in the index breaks ties between equal dates
+Index('idx_trade_log_pair_date', TradeLog.base_currency_id, TradeLog.quote_currency_id, TradeLog.date_traded)
@@ -1,6 +1,6 @@
 # models/transaction.py
 
-from sqlalchemy import Column, String, Integer, DECIMAL, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DECIMAL, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -18,4 +18,10 @@ class Transaction(Base):
 
     # Relationships to other models
     sender = relationship("Account", foreign_keys=[sender_account_id])
-    receiver = relationship("Account", foreign_keys=[receiver_account_id])
\ No newline at end of file
+    receiver = relationship("Account", foreign_keys=[receiver_account_id])
+
+    __table_args__ = (
+        # Keyset pagination of the transactions of an account, on either side, by date
+        Index('idx_transaction_sender_date', 'sender_account_id', 'transaction_date'),
+        Index('idx_transaction_receiver_date', 'receiver_account_id', 'transaction_date'),
+    )
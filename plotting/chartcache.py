@@ -0,0 +1,114 @@
+import asyncio
+import os
+from collections import OrderedDict
+
+# Upper bounds of the rendered chart cache
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CHART_CACHE_MAX_ENTRIES = int(os.getenv("CHART_CACHE_MAX_ENTRIES", "256"))
+
+
+class ChartCache:
+    """
+    LRU cache of rendered chart PNGs, bounded both by entry count and total size in bytes.
+
+    Keys include the ID of the pair's last trade log, so a new trade naturally makes the
+    next request render a fresh chart, while older entries age out of the LRU.
+    Concurrent requests for the same key share a single render.
+    """
+    _entries: OrderedDict[tuple, bytes] = OrderedDict()
+    _pending: dict[tuple, asyncio.Future] = {}
+    _size = 0
+    _hits = 0
+    _misses = 0
+
+    @staticmethod
+    def get(key: tuple) -> bytes | None:
+        """
+        Returns the cached image for a key and marks it as recently used, or None on a miss.
+        """
+        image = ChartCache._entries.get(key)
+        if image is not None:
+            ChartCache._entries.move_to_end(key)
+        return image
+
+    @staticmethod
+    def put(key: tuple, image: bytes) -> None:
+        """
+        Stores an image, evicting the least recently used entries until both caps are respected.
+        Images larger than the whole byte cap are not cached.
+        """
+        if len(image) > CHART_CACHE_MAX_BYTES:
+            return
+        old_image = ChartCache._entries.pop(key, None)
+        if old_image is not None:
+            ChartCache._size -= len(old_image)
+
+        ChartCache._entries[key] = image
+        ChartCache._size += len(image)
+        while ChartCache._size > CHART_CACHE_MAX_BYTES or len(ChartCache._entries) > CHART_CACHE_MAX_ENTRIES:
+            _, evicted = ChartCache._entries.popitem(last=False)
+            ChartCache._size -= len(evicted)
+
+    @staticmethod
+    async def get_or_render(key: tuple, render, *args, **kwargs) -> bytes:
+        """
+        Returns the cached image for a key, rendering and caching it on a miss.
+
+        Args:
+            key (tuple): The cache key.
+            render: Coroutine function producing the PNG bytes.
+            *args: Positional arguments for `render`.
+            **kwargs: Keyword arguments for `render`.
+
+        Returns:
+            bytes: The PNG image.
+        """
+        image = ChartCache.get(key)
+        if image is not None:
+            ChartCache._hits += 1
+            return image
+
+        # Another request is already rendering this chart; wait for its result
+        pending = ChartCache._pending.get(key)
+        if pending is not None:
+            ChartCache._hits += 1
+            return await asyncio.shield(pending)
+
+        ChartCache._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        ChartCache._pending[key] = future
+        try:
+            image = await render(*args, **kwargs)
+            ChartCache.put(key, image)
+            future.set_result(image)
+            return image
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else was waiting
+            raise
+        finally:
+            del ChartCache._pending[key]
+
+    @staticmethod
+    def clear() -> None:
+        ChartCache._entries.clear()
+        ChartCache._size = 0
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Returns the current state of the cache.
+
+        Returns:
+            dict: Number of entries, bytes used and cap, and hit/miss counts since startup.
+        """
+        return {
+            "entries": len(ChartCache._entries),
+            "bytes": ChartCache._size,
+            "max_bytes": CHART_CACHE_MAX_BYTES,
+            "hits": ChartCache._hits,
+            "misses": ChartCache._misses,
+        }
@@ -1,18 +1,39 @@
-import mplfinance as mpf
+import os
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 import io
 from services.tradelogservice import TradeLogService
+from services.candleservice import CandleService, INTERVALS
+from plotting.renderpool import ChartRenderPool
+from plotting.chartcache import ChartCache
+from plotting.downsampling import downsample_line, downsample_ohlc
+from services.indicators import IndicatorService, IndicatorState
+
+# Aggregate raw trade logs into buckets inside the database for pairs that have no candles
+CHART_SQL_BUCKETING = os.getenv("CHART_SQL_BUCKETING", "false").lower() in ("1", "true", "yes")
+
+# Columns added to the frame by each indicator
+INDICATOR_COLUMNS = {
+    'MA': ('MA_14',),
+    'RSI': ('RSI',),
+    'MACD': ('MACD', 'Signal_Line'),
+    'Bollinger': ('Bollinger_Upper', 'Bollinger_Lower'),
+}
 
 
 class ChartPlotter:
-    def __init__(self, base_currency_id: int, quote_currency_id: int, time_period: timedelta = None, chart_type='line'):
+    def __init__(self, base_currency_id: int, quote_currency_id: int, time_period: timedelta = None, chart_type='line',
+                 sql_bucketing: bool = CHART_SQL_BUCKETING):
         self.base_currency_id = base_currency_id
         self.quote_currency_id = quote_currency_id
         self.time_period = time_period
         self.chart_type = chart_type
+        self.sql_bucketing = sql_bucketing
         self.data_frame = None
         self.resample_rule = "min"
+        self.aggregated = False  # The data is already bucketed and needs no resampling
+        self.candle_interval = None  # Interval of the candles the data was read from, if any
         self.image_bytes = io.BytesIO()
 
     def add_moving_average(self, window=14):
@@ -24,12 +45,12 @@ class ChartPlotter:
 
     def calculate_rsi(self, window=14):
         """
-        Calculate the Relative Strength Index (RSI).
+        Calculate the Relative Strength Index (RSI) with Wilder's smoothing of the average gain and loss.
         :param window: Number of periods for calculating RSI.
         """
         delta = self.data_frame['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+        gain = delta.clip(lower=0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
 
         rs = gain / loss
         self.data_frame['RSI'] = 100 - (100 / (1 + rs))
@@ -59,38 +80,72 @@ class ChartPlotter:
         self.data_frame['Bollinger_Upper'] = rolling_mean + (rolling_std * num_std_dev)
         self.data_frame['Bollinger_Lower'] = rolling_mean - (rolling_std * num_std_dev)
 
+    @staticmethod
+    def build_ohlc_frame(rows, unix_dates: bool = False) -> pd.DataFrame:
+        """
+        Build an OHLC DataFrame from (date, open, high, low, close) rows, casting every column once.
+        :param rows: The rows, in chronological order.
+        :param unix_dates: Whether the dates are UNIX seconds rather than datetimes.
+        """
+        dates, opens, highs, lows, closes = zip(*rows)
+        df = pd.DataFrame(
+            {
+                'Open': np.fromiter(opens, dtype=np.float64, count=len(rows)),
+                'High': np.fromiter(highs, dtype=np.float64, count=len(rows)),
+                'Low': np.fromiter(lows, dtype=np.float64, count=len(rows)),
+                'Close': np.fromiter(closes, dtype=np.float64, count=len(rows)),
+            },
+            index=pd.DatetimeIndex(
+                np.array(dates, dtype=np.int64).astype('datetime64[s]') if unix_dates
+                else np.array(dates, dtype='datetime64[us]'),
+                name='Date'
+            ),
+        )
+        df['Price'] = df['Close']
+        return df
+
     async def fetch_data(self):
         """
-        Fetch trade logs and prepare a DataFrame for plotting.
+        Fetch the candles of the pair and prepare a DataFrame for plotting.
+        Falls back to the raw trade logs for pairs that have no candles yet, bucketed in SQL if enabled.
+        Only the needed columns are selected, as plain tuples, and converted to float64 in one pass.
         """
-        trade_logs = await TradeLogService.get_trade_logs_by_currency_pair(
+        interval = CandleService.choose_interval(self.time_period)
+        rows = await CandleService.get_candle_rows(
+            self.base_currency_id, self.quote_currency_id, interval, time_period=self.time_period
+        )
+        if rows:
+            self.data_frame = self.build_ohlc_frame(rows)
+            self.aggregated = True
+            self.candle_interval = interval
+            return
+        self.candle_interval = None
+
+        if self.sql_bucketing:
+            rows = await TradeLogService.get_bucketed_prices(
+                self.base_currency_id, self.quote_currency_id, INTERVALS[interval], time_delta=self.time_period
+            )
+            if not rows:
+                raise FileNotFoundError("No trade logs found.")
+            self.data_frame = self.build_ohlc_frame(rows, unix_dates=True)
+            self.aggregated = True
+            return
+
+        rows = await TradeLogService.get_price_rows(
             self.base_currency_id, self.quote_currency_id, time_delta=self.time_period
         )
 
-        if not trade_logs:
+        if not rows:
             raise FileNotFoundError("No trade logs found.")
 
-        ohlc_data = {
-            'Date': [],
-            'Price': [],
-            'Open': [],
-            'High': [],
-            'Low': [],
-            'Close': [],
-        }
-
-        for log in trade_logs:
-            ohlc_data['Date'].append(log.date_traded)
-            ohlc_data['Price'].append(log.price)
-            ohlc_data['Open'].append(log.price)
-            ohlc_data['High'].append(log.price)
-            ohlc_data['Low'].append(log.price)
-            ohlc_data['Close'].append(log.price)
-
-        # Convert to DataFrame and set index
-        df = pd.DataFrame(ohlc_data)
-        df.set_index('Date', inplace=True)
-        self.data_frame = df.apply(pd.to_numeric, errors='coerce')
+        # Every trade is its own OHLC point until resample_data buckets them
+        dates, prices = zip(*rows)
+        prices = np.fromiter(prices, dtype=np.float64, count=len(rows))
+        self.data_frame = pd.DataFrame(
+            {column: prices for column in ('Price', 'Open', 'High', 'Low', 'Close')},
+            index=pd.DatetimeIndex(np.array(dates, dtype='datetime64[us]'), name='Date'),
+        )
+        self.aggregated = False
 
     def determine_resample_rule(self):
         """
@@ -119,59 +174,74 @@ class ChartPlotter:
             'Price': 'mean'
         }).dropna()
 
-    def plot_chart(self):
-        """
-        Plot the chart with optional indicators and save it to an in-memory byte buffer.
-        """
-        figsize = (15, 10)  # Adjust size for multiple panels
-        additional_plots = []
-        panel_count = 1  # Start with the main panel
-
-        # Add Moving Average
-        if f"MA_{14}" in self.data_frame.columns:
-            additional_plots.append(mpf.make_addplot(self.data_frame[f"MA_{14}"], color='blue'))
-
-        # Add RSI as a separate subplot
-        if 'RSI' in self.data_frame.columns:
-            rsi_plot = mpf.make_addplot(self.data_frame['RSI'], panel=panel_count, color='purple', ylabel='RSI')
-            additional_plots.append(rsi_plot)
-            panel_count += 1
-
-        # Add MACD as a separate subplot
-        if 'MACD' in self.data_frame.columns and 'Signal_Line' in self.data_frame.columns:
-            macd_plot = mpf.make_addplot(self.data_frame['MACD'], panel=panel_count, color='green', ylabel='MACD')
-            signal_plot = mpf.make_addplot(self.data_frame['Signal_Line'], panel=panel_count, color='red')
-            additional_plots.extend([macd_plot, signal_plot])
-            panel_count += 1
-
-        # Add Bollinger Bands to the main panel
-        if 'Bollinger_Upper' in self.data_frame.columns and 'Bollinger_Lower' in self.data_frame.columns:
-            additional_plots.append(mpf.make_addplot(self.data_frame['Bollinger_Upper'], color='orange'))
-            additional_plots.append(mpf.make_addplot(self.data_frame['Bollinger_Lower'], color='orange'))
-
-        # Dynamically create panel ratios
-        panel_ratios = [4] + [2] * (panel_count - 1)
-
-        mpf.plot(
-            self.data_frame,
-            type='candle' if self.chart_type == 'candlestick' else 'line',
-            style='charles',
-            xlabel="Time",
-            ylabel="Price",
-            savefig=dict(fname=self.image_bytes, format='png'),
-            figsize=figsize,
-            addplot=additional_plots,
-            panel_ratios=panel_ratios  # Dynamically adjust panel ratios
-        )
-        self.image_bytes.seek(0)
+    async def apply_streamed_indicators(self, indicators) -> bool:
+        """
+        Take the indicator columns from the streaming IndicatorService instead of recomputing them.
+        :param indicators: List of indicators to apply (e.g., ['RSI', 'MA', 'MACD', 'Bollinger']).
+        :return: False if the streamed history does not cover the frame, so the pandas path must be used.
+        """
+        rows = await IndicatorService.get_rows(self.base_currency_id, self.quote_currency_id, self.candle_interval)
+        if not rows or rows[0][0] > self.data_frame.index[0]:
+            return False
+
+        streamed = pd.DataFrame(
+            [values for _, values in rows],
+            index=pd.DatetimeIndex(np.array([open_time for open_time, _ in rows], dtype='datetime64[us]')),
+            columns=IndicatorState.COLUMNS,
+        ).reindex(self.data_frame.index)
+        for indicator in indicators:
+            for column in INDICATOR_COLUMNS.get(indicator, ()):
+                self.data_frame[column] = streamed[column]
+        return True
+
+    def downsample_data(self):
+        """
+        Cap the plotted rows to what the figure can show: LTTB for line charts,
+        merged candles that keep every high and low for candlestick charts.
+        Runs after the indicators so they are computed on the full series.
+        """
+        if self.chart_type == 'candlestick':
+            self.data_frame = downsample_ohlc(self.data_frame)
+        else:
+            self.data_frame = downsample_line(self.data_frame)
+
+    async def plot_chart(self):
+        """
+        Plot the chart with optional indicators in the render pool and keep the PNG in an in-memory byte buffer.
+        """
+        image = await ChartRenderPool.render(self.data_frame, self.chart_type)
+        self.image_bytes = io.BytesIO(image)
 
     async def generate_chart(self, indicators=None):
         """
         Main method to fetch, process, and plot the chart with optional indicators.
+        Charts are served from ChartCache until a new trade is logged for the pair.
+        :param indicators: List of indicators to apply (e.g., ['RSI', 'MA', 'MACD', 'Bollinger']).
+        """
+        last_trade_log_id = await TradeLogService.get_last_trade_log_id(self.base_currency_id, self.quote_currency_id)
+        key = (
+            self.base_currency_id,
+            self.quote_currency_id,
+            self.time_period,
+            self.chart_type,
+            tuple(indicators or ()),
+            last_trade_log_id,
+        )
+        image = await ChartCache.get_or_render(key, self.render_chart, indicators)
+        self.image_bytes = io.BytesIO(image)
+        return image
+
+    async def render_chart(self, indicators=None):
+        """
+        Fetches the data, applies the indicators and renders the chart, bypassing the cache.
         :param indicators: List of indicators to apply (e.g., ['RSI', 'MA', 'MACD', 'Bollinger']).
         """
         await self.fetch_data()
-        self.resample_data()
+        if not self.aggregated:
+            self.resample_data()
+
+        if indicators and self.candle_interval is not None and await self.apply_streamed_indicators(indicators):
+            indicators = None
 
         if indicators:
             for indicator in indicators:
@@ -184,7 +254,8 @@ class ChartPlotter:
                 elif indicator == 'Bollinger':
                     self.calculate_bollinger_bands()
 
-        self.plot_chart()
+        self.downsample_data()
+        await self.plot_chart()
         return self.image_bytes.getvalue()
 
 
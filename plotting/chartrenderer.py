@@ -0,0 +1,62 @@
+import io
+import matplotlib
+
+matplotlib.use("Agg")  # Render off-screen; worker processes have no display
+
+import mplfinance as mpf
+import pandas as pd
+
+
+def render_chart(data_frame: pd.DataFrame, chart_type: str = 'line') -> bytes:
+    """
+    Plot the chart with the indicator columns present in the DataFrame and return it as PNG bytes.
+
+    Runs in a worker process of ChartRenderPool, so it must only depend on its arguments.
+
+    :param data_frame: OHLC DataFrame indexed by date, optionally with indicator columns.
+    :param chart_type: 'line' or 'candlestick'.
+    :return: The PNG image.
+    """
+    figsize = (15, 10)  # Adjust size for multiple panels
+    additional_plots = []
+    panel_count = 1  # Start with the main panel
+
+    # Add Moving Average
+    if f"MA_{14}" in data_frame.columns:
+        additional_plots.append(mpf.make_addplot(data_frame[f"MA_{14}"], color='blue'))
+
+    # Add RSI as a separate subplot
+    if 'RSI' in data_frame.columns:
+        rsi_plot = mpf.make_addplot(data_frame['RSI'], panel=panel_count, color='purple', ylabel='RSI')
+        additional_plots.append(rsi_plot)
+        panel_count += 1
+
+    # Add MACD as a separate subplot
+    if 'MACD' in data_frame.columns and 'Signal_Line' in data_frame.columns:
+        macd_plot = mpf.make_addplot(data_frame['MACD'], panel=panel_count, color='green', ylabel='MACD')
+        signal_plot = mpf.make_addplot(data_frame['Signal_Line'], panel=panel_count, color='red')
+        additional_plots.extend([macd_plot, signal_plot])
+        panel_count += 1
+
+    # Add Bollinger Bands to the main panel
+    if 'Bollinger_Upper' in data_frame.columns and 'Bollinger_Lower' in data_frame.columns:
+        additional_plots.append(mpf.make_addplot(data_frame['Bollinger_Upper'], color='orange'))
+        additional_plots.append(mpf.make_addplot(data_frame['Bollinger_Lower'], color='orange'))
+
+    # Dynamically create panel ratios
+    panel_ratios = [4] + [2] * (panel_count - 1)
+
+    image_bytes = io.BytesIO()
+    mpf.plot(
+        data_frame,
+        type='candle' if chart_type == 'candlestick' else 'line',
+        style='charles',
+        xlabel="Time",
+        ylabel="Price",
+        savefig=dict(fname=image_bytes, format='png'),
+        figsize=figsize,
+        addplot=additional_plots,
+        panel_ratios=panel_ratios,  # Dynamically adjust panel ratios
+        warn_too_much_data=len(data_frame) + 1  # The rows were already capped to the figure width
+    )
+    return image_bytes.getvalue()
@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Horizontal resolution of a rendered chart: the 15in wide figure saved at matplotlib's default 100 dpi
+CHART_WIDTH_PIXELS = int(os.getenv("CHART_WIDTH_PIXELS", "1500"))
+# Narrowest candle that still shows its body and wicks
+CANDLE_WIDTH_PIXELS = 3
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the points to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are split into
+    `threshold - 2` buckets, and each bucket keeps the point forming the largest triangle with
+    the previously kept point and the average of the next bucket, which preserves spikes.
+
+    :param x: X coordinates, increasing.
+    :param y: Y coordinates.
+    :param threshold: The number of points to keep.
+    :return: The indices of the kept points, increasing.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+        # Twice the triangle areas; the constant factor does not change the argmax
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
+
+
+def downsample_line(data_frame: pd.DataFrame, max_points: int = CHART_WIDTH_PIXELS) -> pd.DataFrame:
+    """
+    Reduce a line chart frame to at most `max_points` rows with LTTB on the close price.
+    The indicator columns are kept at the selected rows.
+    """
+    if len(data_frame) <= max_points:
+        return data_frame
+    x = data_frame.index.asi8.astype(np.float64)
+    y = data_frame['Close'].to_numpy(dtype=np.float64)
+    return data_frame.iloc[lttb_indices(x, y, max_points)]
+
+
+def downsample_ohlc(data_frame: pd.DataFrame,
+                    max_points: int = CHART_WIDTH_PIXELS // CANDLE_WIDTH_PIXELS) -> pd.DataFrame:
+    """
+    Reduce a candlestick frame to at most `max_points` rows by merging runs of adjacent candles.
+
+    A merged candle opens at the first open, closes at the last close and keeps the highest high
+    and the lowest low of its run, so no extreme disappears. The other columns take the value of
+    the last candle of the run.
+    """
+    n = len(data_frame)
+    if n <= max_points:
+        return data_frame
+    size = -(-n // max_points)  # Ceiling division
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+
+    merged = data_frame.iloc[ends].copy()
+    merged.index = data_frame.index[starts]
+    merged['Open'] = data_frame['Open'].to_numpy()[starts]
+    merged['High'] = np.maximum.reduceat(data_frame['High'].to_numpy(), starts)
+    merged['Low'] = np.minimum.reduceat(data_frame['Low'].to_numpy(), starts)
+    return merged
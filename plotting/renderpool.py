@@ -0,0 +1,131 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Worker processes rendering charts
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Renders allowed in flight at once; further requests wait on the event loop without blocking it
+CHART_RENDER_CONCURRENCY = int(os.getenv("CHART_RENDER_CONCURRENCY", str(CHART_RENDER_WORKERS)))
+
+
+def _warm_up() -> None:
+    # Runs once in every worker so the first render does not pay for the matplotlib imports
+    import plotting.chartrenderer  # noqa: F401
+
+
+def _render(data_frame: "pd.DataFrame", chart_type: str) -> bytes:
+    # Imported inside the worker so the bot process itself never loads matplotlib
+    from plotting.chartrenderer import render_chart
+    return render_chart(data_frame, chart_type)
+
+
+class ChartRenderPool:
+    """
+    Renders charts in a bounded pool of worker processes so matplotlib never runs on the event loop.
+    """
+    _executor: ProcessPoolExecutor | None = None
+    _semaphore: asyncio.Semaphore | None = None
+    _waiting = 0
+    _running = 0
+    _rendered = 0
+    _failed = 0
+    _render_seconds = 0.0
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        if ChartRenderPool._executor is None:
+            # Spawned workers do not inherit the bot's event loop, threads or database connections
+            ChartRenderPool._executor = ProcessPoolExecutor(
+                max_workers=CHART_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up,
+            )
+        return ChartRenderPool._executor
+
+    @staticmethod
+    async def render(data_frame: "pd.DataFrame", chart_type: str = 'line') -> bytes:
+        """
+        Renders a chart in a worker process.
+
+        Args:
+            data_frame (pd.DataFrame): OHLC DataFrame indexed by date, optionally with indicator columns.
+            chart_type (str): 'line' or 'candlestick'.
+
+        Returns:
+            bytes: The PNG image.
+        """
+        if ChartRenderPool._semaphore is None:
+            ChartRenderPool._semaphore = asyncio.Semaphore(CHART_RENDER_CONCURRENCY)
+
+        ChartRenderPool._waiting += 1
+        try:
+            await ChartRenderPool._semaphore.acquire()
+        finally:
+            ChartRenderPool._waiting -= 1
+
+        ChartRenderPool._running += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            image = await loop.run_in_executor(ChartRenderPool._get_executor(), _render, data_frame, chart_type)
+            ChartRenderPool._rendered += 1
+            return image
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next render
+            ChartRenderPool._failed += 1
+            ChartRenderPool.shutdown()
+            raise
+        except Exception:
+            ChartRenderPool._failed += 1
+            raise
+        finally:
+            ChartRenderPool._render_seconds += time.perf_counter() - start
+            ChartRenderPool._running -= 1
+            ChartRenderPool._semaphore.release()
+
+    @staticmethod
+    async def warm_up() -> None:
+        """
+        Starts every worker process ahead of the first render, so no user waits for
+        a worker to spawn and import matplotlib.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ChartRenderPool._get_executor()
+        # The pool spawns a worker per task it cannot hand to an idle one
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(CHART_RENDER_WORKERS)))
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Returns the current state of the render pool.
+
+        Returns:
+            dict: Configured workers and concurrency limit, renders currently running and
+                  waiting for a slot, and totals of finished renders.
+        """
+        finished = ChartRenderPool._rendered + ChartRenderPool._failed
+        return {
+            "workers": CHART_RENDER_WORKERS,
+            "concurrency": CHART_RENDER_CONCURRENCY,
+            "running": ChartRenderPool._running,
+            "waiting": ChartRenderPool._waiting,
+            "rendered": ChartRenderPool._rendered,
+            "failed": ChartRenderPool._failed,
+            "avg_render_ms": ChartRenderPool._render_seconds / finished * 1000 if finished else 0.0,
+        }
+
+    @staticmethod
+    def shutdown() -> None:
+        """
+        Stops the worker processes. Called when the bot shuts down.
+        """
+        if ChartRenderPool._executor is not None:
+            ChartRenderPool._executor.shutdown(wait=False, cancel_futures=True)
+            ChartRenderPool._executor = None
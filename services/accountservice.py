@@ -1,9 +1,12 @@
 from models.account import Account
 from models.transaction import Transaction
-from db import get_session
+from db import get_session, retry_on_deadlock
+from services.pagination import Page, KeysetPaginator
 from sqlalchemy.future import select
-from sqlalchemy import update, func
+from sqlalchemy import update, insert, func, bindparam, case
 from decimal import Decimal
+from datetime import datetime
+import uuid
 
 
 class AccountService:
@@ -95,6 +98,89 @@ class AccountService:
             else:
                 return None
 
+    @staticmethod
+    async def adjust_balances(deltas: dict[int, Decimal], held_deltas: dict[int, Decimal] = None) -> None:
+        """
+        Adds signed deltas to the available and held balances of several accounts with a single
+        executemany UPDATE. The new balances are computed by the database, so concurrent adjustments are not lost.
+
+        Args:
+            deltas (dict[int, Decimal]): Available balance change keyed by account ID.
+            held_deltas (dict[int, Decimal], optional): Held balance change keyed by account ID.
+        """
+        held_deltas = held_deltas or {}
+        params = [
+            {
+                "b_account_id": account_id,
+                "b_delta": deltas.get(account_id, Decimal(0)),
+                "b_held_delta": held_deltas.get(account_id, Decimal(0)),
+            }
+            for account_id in deltas.keys() | held_deltas.keys()
+            if deltas.get(account_id) or held_deltas.get(account_id)
+        ]
+        if not params:
+            return
+
+        account_table = Account.__table__
+        async with get_session() as session:
+            await session.execute(
+                update(account_table)
+                .where(account_table.c.account_id == bindparam("b_account_id"))
+                .values(
+                    balance=account_table.c.balance + bindparam("b_delta"),
+                    held_balance=account_table.c.held_balance + bindparam("b_held_delta"),
+                ),
+                params
+            )
+            await session.commit()
+
+    @staticmethod
+    async def hold(account_id: int, amount: Decimal) -> bool:
+        """
+        Moves an amount from the available balance to the held balance of an account, if it is available.
+        The check and the move are one conditional UPDATE, so concurrent holds can never overspend.
+
+        Args:
+            account_id (int): The ID of the account.
+            amount (Decimal): The amount to reserve.
+
+        Returns:
+            bool: True if the amount was reserved, False if the available balance is insufficient.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                update(Account)
+                .where(Account.account_id == account_id, Account.balance >= amount)
+                .values(balance=Account.balance - amount, held_balance=Account.held_balance + amount)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    @staticmethod
+    async def release(account_id: int, amount: Decimal) -> None:
+        """
+        Moves an amount from the held balance of an account back to its available balance.
+        Never releases more than is held, so rounding of earlier partial fills cannot turn the held balance negative.
+
+        Args:
+            account_id (int): The ID of the account.
+            amount (Decimal): The amount to release.
+        """
+        released = case((Account.held_balance >= amount, amount), else_=Account.held_balance)
+        async with get_session() as session:
+            await session.execute(
+                update(Account)
+                .where(Account.account_id == account_id)
+                # MySQL applies SET clauses left to right, so held_balance must be read before it is changed
+                .ordered_values(
+                    (Account.balance, Account.balance + released),
+                    (Account.held_balance, Account.held_balance - released),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
     @staticmethod
     async def disable(account_id: int, is_disabled: bool):
         """
@@ -163,27 +249,34 @@ class AccountService:
                 return False
 
     @staticmethod
-    async def get_all_accounts(page: int = 1, limit: int = 10, is_disabled: bool = False):
+    async def get_all_accounts(limit: int = 10, is_disabled: bool = False,
+                               after: tuple | None = None, before: tuple | None = None,
+                               last: bool = False, with_total: bool = False) -> Page:
         """
-        Retrieves all accounts with pagination from the database.
+        Retrieves a page of accounts, by keyset pagination on the account ID.
 
         Args:
-            page (int, optional): The page number for pagination (default is 1).
             limit (int, optional): The number of accounts per page (default is 10).
-            is_disabled (bool, optional): Whether to include disabled accounts (default is False).
+            is_disabled (bool, optional): Whether to list the disabled accounts instead (default is False).
+            after (tuple, optional): Page.next_cursor of the current page, to get the next one.
+            before (tuple, optional): Page.previous_cursor of the current page, to get the previous one.
+            last (bool, optional): Fetch the last page instead (default is False).
+            with_total (bool, optional): Whether to count the matching accounts (default is False).
 
         Returns:
-            list: A list of Account objects for the given page and limit.
+            Page: The Account objects of the page.
         """
         async with get_session() as session:
-            offset = (page - 1) * limit  # Calculate the offset based on page and limit
-
-            # Execute the query with pagination and filter by 'is_disabled'
-            result = await session.execute(
-                select(Account).filter(Account.is_disabled == is_disabled)
-                .offset(offset).limit(limit)
+            return await KeysetPaginator.fetch_page(
+                session,
+                select(Account).filter(Account.is_disabled == is_disabled),
+                [Account.account_id],
+                limit=limit,
+                after=after,
+                before=before,
+                last=last,
+                with_total=with_total,
             )
-            return result.scalars().all()
 
     @staticmethod
     async def transfer(sender_discord_id: int, receiver_discord_id: int, currency_id: int, amount: Decimal):
@@ -203,56 +296,191 @@ class AccountService:
                 -2: Sender's account does not exist for the specified currency.
                 -3: Sender and receiver accounts are the same.
                 -4: Insufficient balance in the sender's account.
+                -5: Receiver's account does not exist for the specified currency.
+                -6: Sender or receiver account is disabled.
 
         Behavior:
             - If the sender or receiver account doesn't exist, an appropriate error code is returned.
-            - If the receiver's account doesn't exist, it will be created automatically.
             - Transfers with zero or negative amounts are rejected.
-            - Atomic updates are performed on sender's and receiver's balances.
+            - Both account rows are locked in account_id order before the balance is checked, so
+              concurrent transfers can neither overdraw the sender nor deadlock on each other.
+            - The debit is a conditional UPDATE, so the balance can never go negative.
+            - A transaction rolled back by a deadlock is retried automatically.
         """
         # Check if amount is zero or negative
         if amount <= Decimal('0.00'):
             return -1
 
+        return await retry_on_deadlock(
+            AccountService._transfer, sender_discord_id, receiver_discord_id, currency_id, amount
+        )
+
+    @staticmethod
+    async def _transfer(sender_discord_id: int, receiver_discord_id: int, currency_id: int, amount: Decimal):
         async with get_session() as session:
             # Find sender and receiver accounts
-            sender = await AccountService.get_account(sender_discord_id, currency_id)
-            receiver = await AccountService.get_account(receiver_discord_id, currency_id)
+            result = await session.execute(
+                select(Account.discord_id, Account.account_id).where(
+                    Account.discord_id.in_([sender_discord_id, receiver_discord_id]),
+                    Account.currency_id == currency_id,
+                )
+            )
+            account_ids = dict(result.all())
 
             # Check if accounts exists
-            if not sender:
+            if sender_discord_id not in account_ids:
                 return -2
-            if not receiver:
+            if receiver_discord_id not in account_ids:
                 return -5
 
-            if sender.is_disabled or receiver.is_disabled:
-                return -6
+            sender_account_id = account_ids[sender_discord_id]
+            receiver_account_id = account_ids[receiver_discord_id]
 
             # Check if sender is trying to transfer to the same account
-            if sender.account_id == receiver.account_id:
+            if sender_account_id == receiver_account_id:
                 return -3
+
+            # Lock both rows through the primary key in ascending order
+            result = await session.execute(
+                select(Account)
+                .where(Account.account_id.in_([sender_account_id, receiver_account_id]))
+                .order_by(Account.account_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            accounts = {account.account_id: account for account in result.scalars()}
+            sender = accounts[sender_account_id]
+            receiver = accounts[receiver_account_id]
+
+            if sender.is_disabled or receiver.is_disabled:
+                return -6
+
             # Check if sender has sufficient funds
             if sender.balance < amount:
                 return -4
 
+            # Debit only if the funds are still there, then credit the receiver
+            result = await session.execute(
+                update(Account)
+                .where(Account.account_id == sender_account_id, Account.balance >= amount)
+                .values(balance=Account.balance - amount)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                return -4
+            await session.execute(
+                update(Account)
+                .where(Account.account_id == receiver_account_id)
+                .values(balance=Account.balance + amount)
+                .execution_options(synchronize_session=False)
+            )
+
             # Create a new transaction record
             transaction = Transaction(
-                sender_account_id=sender.account_id,
-                receiver_account_id=receiver.account_id,
+                sender_account_id=sender_account_id,
+                receiver_account_id=receiver_account_id,
                 amount=amount
             )
             session.add(transaction)
 
-            # Update the sender's and receiver's balances atomically
-            await session.execute(
-                update(Account).where(Account.account_id == sender.account_id)
-                .values(balance=func.coalesce(Account.balance, 0) - amount)
-            )
-            await session.execute(
-                update(Account).where(Account.account_id == receiver.account_id)
-                .values(balance=func.coalesce(Account.balance, 0) + amount)
-            )
-    
             # Commit the transaction and the balance updates
             await session.commit()
             return transaction
+
+    @staticmethod
+    async def batch_transfer(sender_discord_id: int, currency_id: int, transfers: list[tuple[int, Decimal]]):
+        """
+        Transfers funds from one sender to many receivers as a single transaction (e.g. salaries or airdrops).
+
+        All receivers are validated with one IN-query, the sender is debited once for the total,
+        the receivers are credited with one executemany UPDATE and the transaction records are
+        inserted with one executemany INSERT. Either every transfer is made or none is.
+
+        Args:
+            sender_discord_id (int): The Discord ID of the user sending the currency.
+            currency_id (int): The ID of the currency being transferred.
+            transfers (list[tuple[int, Decimal]]): (receiver Discord ID, amount) pairs.
+
+        Returns:
+            list[Transaction]: The transaction records of the transfers, in input order, if successful.
+            int: Error codes, as for `transfer`:
+                -1: The batch is empty or an amount is zero or negative.
+                -2: Sender's account does not exist for the specified currency.
+                -3: The sender is one of the receivers.
+                -4: Insufficient balance in the sender's account for the total.
+                -5: A receiver's account does not exist for the specified currency.
+                -6: Sender or a receiver account is disabled.
+        """
+        if not transfers or any(amount <= Decimal('0.00') for _, amount in transfers):
+            return -1
+
+        return await retry_on_deadlock(AccountService._batch_transfer, sender_discord_id, currency_id, transfers)
+
+    @staticmethod
+    async def _batch_transfer(sender_discord_id: int, currency_id: int, transfers: list[tuple[int, Decimal]]):
+        receiver_discord_ids = {receiver_discord_id for receiver_discord_id, _ in transfers}
+        if sender_discord_id in receiver_discord_ids:
+            return -3
+        total = sum(amount for _, amount in transfers)
+
+        async with get_session() as session:
+            # Find the sender and every receiver in one query
+            result = await session.execute(
+                select(Account.discord_id, Account.account_id).where(
+                    Account.discord_id.in_(receiver_discord_ids | {sender_discord_id}),
+                    Account.currency_id == currency_id,
+                )
+            )
+            account_ids = dict(result.all())
+
+            if sender_discord_id not in account_ids:
+                return -2
+            if not receiver_discord_ids <= account_ids.keys():
+                return -5
+
+            # Lock every row through the primary key in ascending order, like `transfer`
+            result = await session.execute(
+                select(Account)
+                .where(Account.account_id.in_(account_ids.values()))
+                .order_by(Account.account_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            accounts = result.scalars().all()
+            if any(account.is_disabled for account in accounts):
+                return -6
+
+            # Debit the total once, only if the funds are there
+            sender_account_id = account_ids[sender_discord_id]
+            result = await session.execute(
+                update(Account)
+                .where(Account.account_id == sender_account_id, Account.balance >= total)
+                .values(balance=Account.balance - total)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                return -4
+
+            # Credit every receiver with one executemany UPDATE
+            credits = {}
+            for receiver_discord_id, amount in transfers:
+                receiver_account_id = account_ids[receiver_discord_id]
+                credits[receiver_account_id] = credits.get(receiver_account_id, Decimal(0)) + amount
+            await AccountService.adjust_balances(credits)
+
+            # Record every transfer with one executemany INSERT
+            transaction_date = datetime.utcnow()
+            rows = [
+                {
+                    "uuid": str(uuid.uuid4()),
+                    "sender_account_id": sender_account_id,
+                    "receiver_account_id": account_ids[receiver_discord_id],
+                    "amount": amount,
+                    "transaction_date": transaction_date,
+                }
+                for receiver_discord_id, amount in transfers
+            ]
+            await session.execute(insert(Transaction), rows)
+
+            await session.commit()
+            return [Transaction(**row) for row in rows]
@@ -0,0 +1,231 @@
+from sqlalchemy.future import select
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql, sqlite
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from models.candle import Candle
+from db import get_session, engine
+
+# Candle intervals kept per pair, in seconds, from the finest to the coarsest
+INTERVALS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+MAX_CANDLES = 500  # Largest number of candles a chart or statistic should have to read
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class CandleService:
+
+    @staticmethod
+    def get_bucket(date_traded: datetime, interval: str) -> datetime:
+        """
+        Returns the start of the candle of the given interval that a trade falls in.
+
+        Args:
+            date_traded (datetime): Time of the trade, naive UTC or timezone aware.
+            interval (str): One of INTERVALS.
+
+        Returns:
+            datetime: The open time of the candle, as naive UTC like the rest of the schema.
+        """
+        if date_traded.tzinfo is not None:
+            date_traded = date_traded.astimezone(timezone.utc).replace(tzinfo=None)
+        seconds = INTERVALS[interval]
+        elapsed = int((date_traded - _EPOCH).total_seconds())
+        return _EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+    @staticmethod
+    def choose_interval(time_period: timedelta | None, max_candles: int = MAX_CANDLES) -> str:
+        """
+        Picks the finest interval that covers a time period in at most `max_candles` candles.
+
+        Args:
+            time_period (timedelta | None): The period to cover, None for the whole history.
+            max_candles (int): The largest number of candles wanted.
+
+        Returns:
+            str: One of INTERVALS.
+        """
+        if time_period is not None:
+            for interval, seconds in INTERVALS.items():
+                if time_period.total_seconds() / seconds <= max_candles:
+                    return interval
+        return "1d"
+
+    @staticmethod
+    def aggregate(base_currency_id: int, quote_currency_id: int, trades) -> list[dict]:
+        """
+        Folds trades into one candle row per (interval, bucket).
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            trades: Iterable of (price, quantity, date_traded) in execution order.
+                    The quantity may be None when it is unknown.
+
+        Returns:
+            list[dict]: Candle column values, ready to be upserted.
+        """
+        candles = {}
+        for price, quantity, date_traded in trades:
+            quantity = quantity or Decimal(0)
+            for interval in INTERVALS:
+                key = (interval, CandleService.get_bucket(date_traded, interval))
+                candle = candles.get(key)
+                if candle is None:
+                    candles[key] = {
+                        "base_currency_id": base_currency_id,
+                        "quote_currency_id": quote_currency_id,
+                        "interval": interval,
+                        "open_time": key[1],
+                        "open": price,
+                        "high": price,
+                        "low": price,
+                        "close": price,
+                        "volume": quantity,
+                        "trade_count": 1,
+                    }
+                else:
+                    candle["high"] = max(candle["high"], price)
+                    candle["low"] = min(candle["low"], price)
+                    candle["close"] = price
+                    candle["volume"] += quantity
+                    candle["trade_count"] += 1
+        return list(candles.values())
+
+    @staticmethod
+    def upsert_statement(rows: list[dict], dialect_name: str):
+        """
+        Builds a single INSERT that creates the missing candles and merges the others.
+
+        An existing candle keeps its open, widens its high and low, takes the new close
+        and accumulates volume and trade count.
+
+        Args:
+            rows (list[dict]): Candle column values from CandleService.aggregate.
+            dialect_name (str): Name of the database dialect the statement is for.
+        """
+        if dialect_name == "mysql":
+            stmt = mysql.insert(Candle).values(rows)
+            return stmt.on_duplicate_key_update(
+                high=func.greatest(Candle.high, stmt.inserted.high),
+                low=func.least(Candle.low, stmt.inserted.low),
+                close=stmt.inserted.close,
+                volume=Candle.volume + stmt.inserted.volume,
+                trade_count=Candle.trade_count + stmt.inserted.trade_count,
+            )
+
+        stmt = sqlite.insert(Candle).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[Candle.base_currency_id, Candle.quote_currency_id, Candle.interval, Candle.open_time],
+            set_={
+                "high": func.max(Candle.high, stmt.excluded.high),
+                "low": func.min(Candle.low, stmt.excluded.low),
+                "close": stmt.excluded.close,
+                "volume": Candle.volume + stmt.excluded.volume,
+                "trade_count": Candle.trade_count + stmt.excluded.trade_count,
+            }
+        )
+
+    @staticmethod
+    async def record_trades(base_currency_id: int, quote_currency_id: int, trades) -> int:
+        """
+        Adds trades to the candles of every interval with a single upsert.
+
+        Must be called in execution order, within the unit of work that logs the trades.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            trades: Iterable of (price, quantity, date_traded) in execution order.
+
+        Returns:
+            int: The number of candle rows written.
+        """
+        rows = CandleService.aggregate(base_currency_id, quote_currency_id, trades)
+        if not rows:
+            return 0
+        async with get_session() as session:
+            await session.execute(CandleService.upsert_statement(rows, engine.dialect.name))
+            await session.commit()
+            return len(rows)
+
+    @staticmethod
+    def candle_range_query(base_currency_id: int, quote_currency_id: int, interval: str,
+                           time_period: timedelta | None = None, *columns):
+        """
+        Builds a primary key range scan of the candles of a pair, newest first.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            interval (str): One of INTERVALS.
+            time_period (timedelta | None): Only read enough candles to cover this period.
+            *columns: Columns to select (default: the Candle entity).
+        """
+        stmt = (
+            select(*(columns or (Candle,)))
+            .where(
+                Candle.base_currency_id == base_currency_id,
+                Candle.quote_currency_id == quote_currency_id,
+                Candle.interval == interval,
+            )
+            .order_by(Candle.open_time.desc())
+        )
+        if time_period is not None:
+            # Enough rows to cover the period, however recent the latest candle is
+            stmt = stmt.limit(int(time_period.total_seconds() // INTERVALS[interval]) + 1)
+        return stmt
+
+    @staticmethod
+    async def get_candles(base_currency_id: int, quote_currency_id: int, interval: str,
+                          time_period: timedelta | None = None) -> list[Candle]:
+        """
+        Retrieves the candles of a pair covering a time period before its latest candle.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            interval (str): One of INTERVALS.
+            time_period (timedelta | None): The period to cover, None for the whole history.
+
+        Returns:
+            list[Candle]: The candles in chronological order.
+        """
+        async with get_session() as session:
+            candles = (await session.execute(
+                CandleService.candle_range_query(base_currency_id, quote_currency_id, interval, time_period)
+            )).scalars().all()
+
+        if candles and time_period is not None:
+            threshold = candles[0].open_time - time_period
+            candles = [candle for candle in candles if candle.open_time >= threshold]
+        return candles[::-1]
+
+    @staticmethod
+    async def get_candle_rows(base_currency_id: int, quote_currency_id: int, interval: str,
+                              time_period: timedelta | None = None) -> list[tuple]:
+        """
+        Same as get_candles, as plain (open_time, open, high, low, close) tuples without ORM objects.
+
+        Returns:
+            list[tuple]: The candles in chronological order.
+        """
+        async with get_session() as session:
+            rows = (await session.execute(
+                CandleService.candle_range_query(
+                    base_currency_id, quote_currency_id, interval, time_period,
+                    Candle.open_time, Candle.open, Candle.high, Candle.low, Candle.close
+                )
+            )).all()
+
+        if rows and time_period is not None:
+            threshold = rows[0][0] - time_period
+            rows = [row for row in rows if row[0] >= threshold]
+        return rows[::-1]
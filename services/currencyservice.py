@@ -1,7 +1,7 @@
 from models.currency import Currency
 from db import get_session
 from sqlalchemy.future import select
-from sqlalchemy.sql import func, desc, asc
+from services.pagination import Page, KeysetPaginator
 
 
 class CurrencyService:
@@ -137,37 +137,33 @@ class CurrencyService:
                 return False
 
     @staticmethod
-    async def get_all_currencies(page: int = 1, limit: int = 10, is_disabled: bool = False, sort_order: str = "oldest"):
+    async def get_all_currencies(limit: int = 10, is_disabled: bool = False, sort_order: str = "oldest",
+                                 after: tuple | None = None, before: tuple | None = None,
+                                 last: bool = False, with_total: bool = False) -> Page:
         """
-        Retrieves all currencies with pagination from the database.
+        Retrieves a page of currencies, by keyset pagination on the currency ID.
 
         Args:
-            page (int, optional): The page number for pagination (default is 1).
             limit (int, optional): The number of currencies per page (default is 10).
-            is_disabled (bool, optional): Whether to include disabled currencies (default is False).
+            is_disabled (bool, optional): Whether to list the disabled currencies instead (default is False).
             sort_order (str, optional): The sorting order, either "oldest" or "newest" (default is "oldest").
+            after (tuple, optional): Page.next_cursor of the current page, to get the next one.
+            before (tuple, optional): Page.previous_cursor of the current page, to get the previous one.
+            last (bool, optional): Fetch the last page instead (default is False).
+            with_total (bool, optional): Whether to count the matching currencies (default is False).
 
         Returns:
-            list: A list of Currency objects for the given page and limit.
+            Page: The Currency objects of the page.
         """
         async with get_session() as session:
-            offset = (page - 1) * limit  # Calculate the offset based on page and limit
-
-            # Build the query with pagination and sorting
-            query = select(Currency).filter(Currency.is_disabled == is_disabled).offset(offset).limit(limit)
-
-            # Apply sorting based on the 'sort_order' parameter
-            if sort_order == "newest":
-                query = query.order_by(desc(Currency.currency_id))  # Sort by the newest first
-            else:
-                query = query.order_by(asc(Currency.currency_id))  # Default to oldest (ascending order)
-
-            result = await session.execute(query)
-            currencies = result.scalars().all()
-
-            # Calculate the total number of pages
-            total_count = await session.execute(select(func.count(Currency.currency_id)))
-            total_currencies = total_count.scalar_one()
-            total_pages = (total_currencies + limit - 1) // limit  # Ceiling division
-
-            return currencies, total_pages
\ No newline at end of file
+            return await KeysetPaginator.fetch_page(
+                session,
+                select(Currency).filter(Currency.is_disabled == is_disabled),
+                [Currency.currency_id],
+                limit=limit,
+                descending=sort_order == "newest",
+                after=after,
+                before=before,
+                last=last,
+                with_total=with_total,
+            )
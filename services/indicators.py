@@ -0,0 +1,268 @@
+import math
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from services.candleservice import CandleService, INTERVALS
+from services.matchingengine import MatchingEngine
+
+# Closed candles of indicator history kept per pair and interval. Charts read at most
+# MAX_CANDLES of them, so the rest is warm-up for the moving averages.
+INDICATOR_HISTORY = int(os.getenv("INDICATOR_HISTORY", "1000"))
+
+NAN = float("nan")
+
+
+class SMA:
+    """
+    Simple moving average over the last `window` values, like Series.rolling(window).mean().
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def peek(self, value: float) -> float:
+        if len(self.values) + 1 < self.window:
+            return NAN
+        dropped = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total + value - dropped) / self.window
+
+    def update(self, value: float) -> float:
+        result = self.peek(value)
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return result
+
+
+class EMA:
+    """
+    Exponential moving average seeded with the first value, like Series.ewm(alpha=alpha, adjust=False).mean().
+    """
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.average = None
+        self.count = 0
+
+    @classmethod
+    def from_span(cls, span: int) -> "EMA":
+        return cls(2 / (span + 1))
+
+    def _next(self, value: float) -> float:
+        return value if self.average is None else self.average + self.alpha * (value - self.average)
+
+    def peek(self, value: float) -> float:
+        return self._next(value) if self.count + 1 >= self.min_periods else NAN
+
+    def update(self, value: float) -> float:
+        result = self.peek(value)
+        self.average = self._next(value)
+        self.count += 1
+        return result
+
+
+class RollingStd:
+    """
+    Sample standard deviation over the last `window` values, like Series.rolling(window).std().
+    Recomputed from the window with exact summation on every value, so no rounding residue of
+    values that left the window carries over, which a running update would accumulate after a
+    stretch of much larger values. Like pandas, a window of identical values is exactly 0.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.repeats = 0  # Number of trailing values equal to the last one
+
+    def _repeats(self, value: float) -> int:
+        return self.repeats + 1 if self.values and self.values[-1] == value else 1
+
+    def peek(self, value: float) -> float:
+        if len(self.values) + 1 < self.window:
+            return NAN
+        if self._repeats(value) >= self.window:
+            return 0.0
+        values = list(self.values)[len(self.values) + 1 - self.window:]
+        values.append(value)
+        mean = math.fsum(values) / self.window
+        m2 = math.fsum((v - mean) * (v - mean) for v in values)  # Sum of squared differences from the mean
+        return math.sqrt(m2 / (self.window - 1))
+
+    def update(self, value: float) -> float:
+        result = self.peek(value)
+        self.repeats = self._repeats(value)
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self.values.popleft()
+        return result
+
+
+class WilderRSI:
+    """
+    Relative Strength Index with Wilder's smoothing of the average gain and loss,
+    like an ewm(alpha=1 / window, adjust=False, min_periods=window) of the price changes.
+    """
+
+    def __init__(self, window: int):
+        self.previous = None
+        self.gain = EMA(1 / window, min_periods=window)
+        self.loss = EMA(1 / window, min_periods=window)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            return NAN
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def peek(self, value: float) -> float:
+        if self.previous is None:
+            return NAN
+        change = value - self.previous
+        return self._rsi(self.gain.peek(max(change, 0.0)), self.loss.peek(max(-change, 0.0)))
+
+    def update(self, value: float) -> float:
+        if self.previous is None:
+            self.previous = value
+            return NAN
+        change = value - self.previous
+        self.previous = value
+        return self._rsi(self.gain.update(max(change, 0.0)), self.loss.update(max(-change, 0.0)))
+
+
+class IndicatorState:
+    """
+    Streaming indicators of the closes of one candle series, with the same parameters as ChartPlotter:
+    MA 14, Wilder RSI 14, MACD 12/26/9 and Bollinger bands 20/2.
+    """
+    COLUMNS = ("MA_14", "RSI", "MACD", "Signal_Line", "Bollinger_Upper", "Bollinger_Lower")
+
+    def __init__(self, history: int = INDICATOR_HISTORY):
+        self.ma = SMA(14)
+        self.rsi = WilderRSI(14)
+        self.short_ema = EMA.from_span(12)
+        self.long_ema = EMA.from_span(26)
+        self.signal = EMA.from_span(9)
+        self.bollinger_mean = SMA(20)
+        self.bollinger_std = RollingStd(20)
+        self.rows = deque(maxlen=history)  # (open_time, indicator values) of the closed candles
+        self.pending = None  # (open_time, close) of the candle still forming
+
+    def _compute(self, close: float, commit: bool) -> tuple[float, ...]:
+        step = (lambda indicator: indicator.update) if commit else (lambda indicator: indicator.peek)
+        macd = step(self.short_ema)(close) - step(self.long_ema)(close)
+        mean = step(self.bollinger_mean)(close)
+        std = step(self.bollinger_std)(close)
+        return (
+            step(self.ma)(close),
+            step(self.rsi)(close),
+            macd,
+            step(self.signal)(macd),
+            mean + std * 2,
+            mean - std * 2,
+        )
+
+    def add_trade(self, open_time: datetime, price: float) -> None:
+        """
+        Feeds a trade of the candle opening at `open_time`. A trade in a later candle
+        closes the pending one, which updates every indicator once.
+        """
+        if self.pending is not None and open_time > self.pending[0]:
+            self.close_candle()
+        self.pending = (open_time, price)
+
+    def close_candle(self) -> None:
+        open_time, close = self.pending
+        self.rows.append((open_time, self._compute(close, commit=True)))
+        self.pending = None
+
+    def get_rows(self) -> list[tuple[datetime, tuple[float, ...]]]:
+        """
+        Returns the indicator values of every kept candle, oldest first,
+        including provisional values for the candle still forming.
+        """
+        rows = list(self.rows)
+        if self.pending is not None:
+            rows.append((self.pending[0], self._compute(self.pending[1], commit=False)))
+        return rows
+
+
+class IndicatorService:
+    """
+    Keeps the streaming indicators of each (pair, interval) candle series, hydrated from the candles
+    on first use and then fed by the matching engine, so charts read ready-made indicator series.
+    """
+    _states: dict[tuple[int, int, str], IndicatorState] = {}
+
+    @staticmethod
+    async def _load_state(base_currency_id: int, quote_currency_id: int, interval: str) -> IndicatorState:
+        key = (base_currency_id, quote_currency_id, interval)
+        state = IndicatorService._states.get(key)
+        if state is not None:
+            return state
+
+        state = IndicatorState()
+        rows = await CandleService.get_candle_rows(
+            base_currency_id, quote_currency_id, interval,
+            time_period=timedelta(seconds=INTERVALS[interval] * INDICATOR_HISTORY)
+        )
+        for open_time, _, _, _, close in rows:
+            state.add_trade(open_time, float(close))
+        IndicatorService._states[key] = state
+        return state
+
+    @staticmethod
+    async def get_rows(base_currency_id: int, quote_currency_id: int, interval: str):
+        """
+        Returns the indicator values of the candles of a pair, oldest first, as (open_time, values) rows
+        with values in IndicatorState.COLUMNS order.
+
+        The state is hydrated on the pair's matching actor the first time, so no trade
+        can be recorded between reading the candles and publishing the state.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            interval (str): One of INTERVALS.
+        """
+        state = IndicatorService._states.get((base_currency_id, quote_currency_id, interval))
+        if state is None:
+            state = await MatchingEngine.submit(
+                base_currency_id, quote_currency_id, IndicatorService._load_state,
+                base_currency_id, quote_currency_id, interval
+            )
+        return state.get_rows()
+
+    @staticmethod
+    def record_trades(base_currency_id: int, quote_currency_id: int, trades) -> None:
+        """
+        Feeds committed trades to the loaded indicator states of a pair.
+        Must be called from the pair's matching actor, in execution order.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            trades: Iterable of (price, quantity, date_traded).
+        """
+        states = [
+            (interval, IndicatorService._states.get((base_currency_id, quote_currency_id, interval)))
+            for interval in INTERVALS
+        ]
+        for interval, state in states:
+            if state is None:
+                continue
+            for price, _, date_traded in trades:
+                state.add_trade(CandleService.get_bucket(date_traded, interval), float(price))
+
+    @staticmethod
+    def discard_states(base_currency_id: int, quote_currency_id: int) -> None:
+        """
+        Drops the indicator states of a pair so the next access reloads them from the candles.
+        """
+        for interval in INTERVALS:
+            IndicatorService._states.pop((base_currency_id, quote_currency_id, interval), None)
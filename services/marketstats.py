@@ -0,0 +1,215 @@
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy.future import select
+from db import get_session
+from models.tradelog import TradeLog
+from services.matchingengine import MatchingEngine
+
+STATS_WINDOW = timedelta(hours=24)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class RollingStats:
+    """
+    Snapshot of the trailing window statistics of a pair.
+
+    `change` is the percentage from `open_price`, the last price traded before the window
+    (or the first one inside it for a pair with no older trades). `vwap` only counts trades
+    with a known quantity. Everything but `trade_count` and `volume` is None for a pair
+    that has not traded within the window.
+    """
+    __slots__ = ("last_price", "open_price", "change", "high", "low", "volume", "trade_count", "vwap")
+
+    def __init__(self, last_price: Decimal | None, open_price: Decimal | None, high: Decimal | None,
+                 low: Decimal | None, volume: Decimal, notional: Decimal, trade_count: int):
+        self.last_price = last_price
+        self.open_price = open_price
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.trade_count = trade_count
+        self.change = (last_price - open_price) / open_price * 100 \
+            if last_price is not None and open_price else None
+        self.vwap = notional / volume if volume else None
+
+    def __repr__(self):
+        return f"<RollingStats(last={self.last_price}, change={self.change}, volume={self.volume})>"
+
+
+class RollingWindow:
+    """
+    Trailing time window of the trades of one pair.
+
+    Trades are kept in arrival order and evicted from the front as they age out. High and low
+    come from monotonic deques (prices decreasing and increasing from the front), and volume,
+    notional and count are running sums, so adding, evicting and reading are O(1) amortized.
+    """
+
+    def __init__(self, window: timedelta = STATS_WINDOW):
+        self.window = window.total_seconds()
+        self.trades = deque()  # (traded_at, price, quantity), oldest first
+        self.highs = deque()  # (traded_at, price), prices strictly decreasing
+        self.lows = deque()  # (traded_at, price), prices strictly increasing
+        self.open_price = None  # Last price that left the window
+        self.volume = Decimal(0)
+        self.notional = Decimal(0)
+
+    def add(self, price: Decimal, quantity: Decimal | None, traded_at: float) -> None:
+        """
+        Adds a trade. Trades must be added in execution order.
+
+        Args:
+            price (Decimal): The trade price.
+            quantity (Decimal | None): The base amount traded, if known.
+            traded_at (float): The trade time, as a UNIX timestamp.
+        """
+        self.evict(traded_at)
+        self.trades.append((traded_at, price, quantity))
+        while self.highs and self.highs[-1][1] <= price:
+            self.highs.pop()
+        self.highs.append((traded_at, price))
+        while self.lows and self.lows[-1][1] >= price:
+            self.lows.pop()
+        self.lows.append((traded_at, price))
+        if quantity:
+            self.volume += quantity
+            self.notional += quantity * price
+
+    def evict(self, now: float) -> None:
+        """
+        Drops the trades older than the window.
+
+        Args:
+            now (float): The current time, as a UNIX timestamp.
+        """
+        threshold = now - self.window
+        while self.trades and self.trades[0][0] < threshold:
+            _, price, quantity = self.trades.popleft()
+            self.open_price = price
+            if quantity:
+                self.volume -= quantity
+                self.notional -= quantity * price
+        while self.highs and self.highs[0][0] < threshold:
+            self.highs.popleft()
+        while self.lows and self.lows[0][0] < threshold:
+            self.lows.popleft()
+
+    def get_stats(self, now: float | None = None) -> RollingStats:
+        """
+        Returns the statistics of the window ending now.
+
+        Args:
+            now (float | None): The current time, as a UNIX timestamp (default: now).
+        """
+        self.evict(time.time() if now is None else now)
+        if not self.trades:
+            return RollingStats(None, self.open_price, None, None, Decimal(0), Decimal(0), 0)
+        return RollingStats(
+            self.trades[-1][1],
+            self.open_price if self.open_price is not None else self.trades[0][1],
+            self.highs[0][1],
+            self.lows[0][1],
+            self.volume,
+            self.notional,
+            len(self.trades),
+        )
+
+
+class MarketStatsService:
+    """
+    Keeps one rolling 24 hour window per currency pair, hydrated from the trade log on first use
+    and then fed by the matching engine, so statistics never scan the trade log again.
+    """
+    _windows: dict[tuple[int, int], RollingWindow] = {}
+
+    @staticmethod
+    def to_timestamp(date_traded: datetime) -> float:
+        """
+        Converts a trade date, naive UTC or timezone aware, to a UNIX timestamp.
+        """
+        if date_traded.tzinfo is None:
+            return (date_traded - _EPOCH).total_seconds()
+        return date_traded.timestamp()
+
+    @staticmethod
+    async def _load_window(base_currency_id: int, quote_currency_id: int) -> RollingWindow:
+        pair = (base_currency_id, quote_currency_id)
+        window = MarketStatsService._windows.get(pair)
+        if window is not None:
+            return window
+
+        window = RollingWindow()
+        threshold = datetime.now(timezone.utc).replace(tzinfo=None) - STATS_WINDOW
+        pair_filter = (TradeLog.base_currency_id == base_currency_id, TradeLog.quote_currency_id == quote_currency_id)
+        async with get_session() as session:
+            window.open_price = (await session.execute(
+                select(TradeLog.price)
+                .where(*pair_filter, TradeLog.date_traded < threshold)
+                .order_by(TradeLog.date_traded.desc(), TradeLog.trade_log_id.desc())
+                .limit(1)
+            )).scalar()
+            result = await session.execute(
+                select(TradeLog.price, TradeLog.quantity, TradeLog.date_traded)
+                .where(*pair_filter, TradeLog.date_traded >= threshold)
+                .order_by(TradeLog.date_traded, TradeLog.trade_log_id)
+            )
+            for price, quantity, date_traded in result:
+                window.add(price, quantity, MarketStatsService.to_timestamp(date_traded))
+
+        MarketStatsService._windows[pair] = window
+        return window
+
+    @staticmethod
+    async def get_stats(base_currency_id: int, quote_currency_id: int) -> RollingStats:
+        """
+        Returns the trailing 24 hour statistics of a pair.
+
+        The window is hydrated on the pair's matching actor the first time, so no trade
+        can be recorded between reading the log and publishing the window.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+
+        Returns:
+            RollingStats: The statistics of the pair.
+        """
+        window = MarketStatsService._windows.get((base_currency_id, quote_currency_id))
+        if window is None:
+            window = await MatchingEngine.submit(
+                base_currency_id, quote_currency_id, MarketStatsService._load_window,
+                base_currency_id, quote_currency_id
+            )
+        return window.get_stats()
+
+    @staticmethod
+    def record_trades(base_currency_id: int, quote_currency_id: int, trades) -> None:
+        """
+        Adds committed trades to the window of a pair, if it is loaded.
+        Must be called from the pair's matching actor, in execution order.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            trades: Iterable of (price, quantity, date_traded).
+        """
+        window = MarketStatsService._windows.get((base_currency_id, quote_currency_id))
+        if window is None:
+            return
+        for price, quantity, date_traded in trades:
+            window.add(price, quantity, MarketStatsService.to_timestamp(date_traded))
+
+    @staticmethod
+    def discard_window(base_currency_id: int, quote_currency_id: int) -> None:
+        """
+        Drops the window of a pair so the next access reloads it from the trade log.
+        Needed whenever trade logs change other than through record_trades.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+        """
+        MarketStatsService._windows.pop((base_currency_id, quote_currency_id), None)
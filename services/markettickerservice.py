@@ -0,0 +1,170 @@
+from sqlalchemy.future import select
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects import mysql, sqlite
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from models.candle import Candle
+from models.currency import Currency
+from models.marketticker import MarketTicker
+from models.tradelog import TradeLog
+from services.candleservice import CandleService
+from services.pagination import Page, KeysetPaginator
+from db import get_session, engine
+
+TICKER_WINDOW = timedelta(hours=24)
+TICKER_INTERVAL = "5m"  # Candles the 24 hour statistics are folded from (288 rows per pair)
+
+
+class MarketTickerService:
+
+    @staticmethod
+    def upsert_statement(row: dict, dialect_name: str):
+        """
+        Builds a single INSERT that creates the ticker of a pair or overwrites it.
+
+        Args:
+            row (dict): MarketTicker column values.
+            dialect_name (str): Name of the database dialect the statement is for.
+        """
+        columns = [name for name in row if name not in ("base_currency_id", "quote_currency_id")]
+        if dialect_name == "mysql":
+            stmt = mysql.insert(MarketTicker).values(row)
+            return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in columns})
+
+        stmt = sqlite.insert(MarketTicker).values(row)
+        return stmt.on_conflict_do_update(
+            index_elements=[MarketTicker.base_currency_id, MarketTicker.quote_currency_id],
+            set_={name: stmt.excluded[name] for name in columns}
+        )
+
+    @staticmethod
+    async def update_ticker(base_currency_id: int, quote_currency_id: int,
+                            last_price: Decimal, last_traded_at: datetime) -> None:
+        """
+        Recomputes the ticker of a pair after a trade, from the candles of the trailing 24 hours.
+        The change is measured from the last price before those 24 hours, like RollingStats.change.
+
+        Must be called after the trade was added to the candles, within the same unit of work.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            last_price (Decimal): Price of the latest trade.
+            last_traded_at (datetime): Time of the latest trade.
+        """
+        if last_traded_at.tzinfo is not None:
+            last_traded_at = last_traded_at.astimezone(timezone.utc).replace(tzinfo=None)
+        threshold = last_traded_at - TICKER_WINDOW
+        window = (
+            Candle.base_currency_id == base_currency_id,
+            Candle.quote_currency_id == quote_currency_id,
+            Candle.interval == TICKER_INTERVAL,
+            Candle.open_time >= CandleService.get_bucket(threshold, TICKER_INTERVAL),
+        )
+        # Same reference as RollingStats.change: the last price before the window, else the first one in it.
+        # Both are single probes of idx_trade_log_pair_date.
+        pair_filter = (TradeLog.base_currency_id == base_currency_id, TradeLog.quote_currency_id == quote_currency_id)
+        price_before = (
+            select(TradeLog.price)
+            .where(*pair_filter, TradeLog.date_traded < threshold)
+            .order_by(TradeLog.date_traded.desc(), TradeLog.trade_log_id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        first_price = (
+            select(TradeLog.price)
+            .where(*pair_filter, TradeLog.date_traded >= threshold)
+            .order_by(TradeLog.date_traded, TradeLog.trade_log_id)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        async with get_session() as session:
+            high, low, volume, trade_count, open_price = (await session.execute(
+                select(
+                    func.max(Candle.high),
+                    func.min(Candle.low),
+                    func.sum(Candle.volume),
+                    func.sum(Candle.trade_count),
+                    func.coalesce(price_before, first_price),
+                ).where(*window)
+            )).one()
+
+            open_price = open_price if open_price is not None else last_price
+            await session.execute(MarketTickerService.upsert_statement(
+                {
+                    "base_currency_id": base_currency_id,
+                    "quote_currency_id": quote_currency_id,
+                    "last_price": last_price,
+                    "open_24h": open_price,
+                    "high_24h": high if high is not None else last_price,
+                    "low_24h": low if low is not None else last_price,
+                    "volume_24h": volume or 0,
+                    "change_24h": ((last_price - open_price) / open_price * 100).quantize(Decimal("0.0001"))
+                    if open_price else 0,
+                    "trade_count_24h": trade_count or 0,
+                    "last_traded_at": last_traded_at,
+                },
+                engine.dialect.name
+            ))
+            await session.commit()
+
+    @staticmethod
+    async def get_ticker(base_currency_id: int, quote_currency_id: int) -> MarketTicker | None:
+        """
+        Retrieves the ticker of a pair.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+
+        Returns:
+            MarketTicker | None: The ticker, or None if the pair was never traded.
+        """
+        async with get_session() as session:
+            return await session.get(MarketTicker, (base_currency_id, quote_currency_id))
+
+    @staticmethod
+    async def get_tickers(limit: int = 10, after: tuple | None = None, before: tuple | None = None,
+                          last: bool = False, with_total: bool = False) -> Page:
+        """
+        Retrieves a page of the tickers of every traded pair, by keyset pagination on the pair.
+
+        Args:
+            limit (int): The number of items per page.
+            after (tuple | None): Page.next_cursor of the current page, to get the next one.
+            before (tuple | None): Page.previous_cursor of the current page, to get the previous one.
+            last (bool): Fetch the last page instead.
+            with_total (bool): Whether to count the traded pairs.
+
+        Returns:
+            Page: Rows of (base_ticker, quote_ticker, last_price, change_24h, volume_24h,
+                  last_traded_at, base_currency_id, quote_currency_id)
+        """
+        base_currency_alias = aliased(Currency)
+        quote_currency_alias = aliased(Currency)
+
+        async with get_session() as session:
+            return await KeysetPaginator.fetch_page(
+                session,
+                select(
+                    base_currency_alias.ticker.label("base_ticker"),
+                    quote_currency_alias.ticker.label("quote_ticker"),
+                    MarketTicker.last_price,
+                    MarketTicker.change_24h,
+                    MarketTicker.volume_24h,
+                    MarketTicker.last_traded_at,
+                    MarketTicker.base_currency_id,
+                    MarketTicker.quote_currency_id,
+                )
+                .join(base_currency_alias, MarketTicker.base_currency_id == base_currency_alias.currency_id)
+                .join(quote_currency_alias, MarketTicker.quote_currency_id == quote_currency_alias.currency_id),
+                [MarketTicker.base_currency_id, MarketTicker.quote_currency_id],
+                limit=limit,
+                after=after,
+                before=before,
+                last=last,
+                scalars=False,
+                with_total=with_total,
+            )
@@ -0,0 +1,114 @@
+import asyncio
+import os
+from contextvars import ContextVar, Context
+
+# Maximum number of pending operations per pair before callers have to wait
+MATCHING_QUEUE_SIZE = int(os.getenv("MATCHING_QUEUE_SIZE", "100"))
+
+# The pair whose actor is running the current task, used to run nested submissions inline
+_current_pair: ContextVar[tuple[int, int] | None] = ContextVar("current_pair", default=None)
+
+
+class PairActor:
+    """
+    Single writer for one currency pair.
+
+    Operations are queued on a bounded asyncio queue and executed one at a time by a
+    dedicated task, so mutations of the same pair never interleave.
+    """
+
+    def __init__(self, pair: tuple[int, int], maxsize: int = MATCHING_QUEUE_SIZE):
+        self.pair = pair
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        # Start from an empty context so the actor never inherits the caller's database session
+        self.task = self.loop.create_task(self._run(), name=f"matching-{pair[0]}-{pair[1]}", context=Context())
+
+    def is_alive(self) -> bool:
+        return not self.task.done() and self.loop is asyncio.get_running_loop()
+
+    async def _run(self):
+        _current_pair.set(self.pair)
+        while True:
+            func, args, kwargs, future = await self.queue.get()
+            try:
+                # Skip work whose caller has already gone away
+                if future.cancelled():
+                    continue
+                result = await func(*args, **kwargs)
+                if not future.cancelled():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    async def submit(self, func, *args, **kwargs):
+        """
+        Queues an operation and waits for its result.
+
+        Args:
+            func: The coroutine function to run on the actor.
+            *args: Positional arguments for `func`.
+            **kwargs: Keyword arguments for `func`.
+
+        Returns:
+            The value returned by `func`. Exceptions raised by `func` are re-raised here.
+        """
+        future = self.loop.create_future()
+        await self.queue.put((func, args, kwargs, future))
+        return await future
+
+
+class MatchingEngine:
+    """
+    Routes every mutation of a currency pair through that pair's actor.
+    Different pairs have independent actors and proceed in parallel.
+    """
+    _actors: dict[tuple[int, int], PairActor] = {}
+
+    @staticmethod
+    def get_actor(base_currency_id: int, quote_currency_id: int) -> PairActor:
+        """
+        Returns the actor of a pair, starting it if needed.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+
+        Returns:
+            PairActor: The actor owning the pair.
+        """
+        pair = (base_currency_id, quote_currency_id)
+        actor = MatchingEngine._actors.get(pair)
+        if actor is None or not actor.is_alive():
+            actor = MatchingEngine._actors[pair] = PairActor(pair)
+        return actor
+
+    @staticmethod
+    async def submit(base_currency_id: int, quote_currency_id: int, func, *args, **kwargs):
+        """
+        Runs `func` on the actor of the given pair and returns its result.
+
+        Calls made from inside the pair's own actor run inline instead of being queued,
+        since queuing them would deadlock the actor.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            func: The coroutine function to run.
+            *args: Positional arguments for `func`.
+            **kwargs: Keyword arguments for `func`.
+        """
+        if _current_pair.get() == (base_currency_id, quote_currency_id):
+            return await func(*args, **kwargs)
+        actor = MatchingEngine.get_actor(base_currency_id, quote_currency_id)
+        return await actor.submit(func, *args, **kwargs)
+
+    @staticmethod
+    def get_queue_depths() -> dict[tuple[int, int], int]:
+        """
+        Returns the number of pending operations for every active pair.
+        """
+        return {pair: actor.queue.qsize() for pair, actor in MatchingEngine._actors.items() if not actor.task.done()}
@@ -0,0 +1,352 @@
+import asyncio
+from bisect import bisect_left, insort
+from collections import deque
+from decimal import Decimal
+from sqlalchemy.future import select
+from db import get_session
+from models.trade import TradeList, TradeType, TradeStatus
+
+
+class RestingOrder:
+    """
+    An OPEN order sitting in the in-memory order book.
+    """
+    __slots__ = ("trade_id", "discord_id", "type", "price", "amount")
+
+    def __init__(self, trade_id: int, discord_id: int, trade_type: TradeType, price: Decimal, amount: Decimal):
+        self.trade_id = trade_id
+        self.discord_id = discord_id
+        self.type = trade_type
+        self.price = Decimal(price)
+        self.amount = Decimal(amount)
+
+    @classmethod
+    def from_trade(cls, trade: TradeList) -> "RestingOrder":
+        return cls(trade.trade_id, trade.discord_id, trade.type, trade.price_offered, trade.amount)
+
+    def __repr__(self):
+        return (
+            f"<RestingOrder(trade_id={self.trade_id}, type={self.type.value}, "
+            f"price={self.price}, amount={self.amount})>"
+        )
+
+
+class Fill:
+    """
+    A planned execution of an incoming order against a resting order.
+    """
+    __slots__ = ("order", "quantity", "price", "remaining")
+
+    def __init__(self, order: RestingOrder, quantity: Decimal):
+        self.order = order
+        self.quantity = quantity
+        self.price = order.price
+        self.remaining = order.amount - quantity  # What is left of the resting order after the fill
+
+
+class BestBidOffer:
+    """
+    Top of book snapshot of a pair.
+
+    `bid_amount`/`ask_amount` are the quantities resting at the best prices, and
+    `bid_depth`/`ask_depth` the quantities resting on the whole side.
+    Prices and spread are None when the side is empty.
+    """
+    __slots__ = ("bid", "ask", "bid_amount", "ask_amount", "bid_depth", "ask_depth", "spread")
+
+    def __init__(self, bid: Decimal | None, ask: Decimal | None, bid_amount: Decimal, ask_amount: Decimal,
+                 bid_depth: Decimal, ask_depth: Decimal):
+        self.bid = bid
+        self.ask = ask
+        self.bid_amount = bid_amount
+        self.ask_amount = ask_amount
+        self.bid_depth = bid_depth
+        self.ask_depth = ask_depth
+        self.spread = ask - bid if bid is not None and ask is not None else None
+
+    def __repr__(self):
+        return f"<BestBidOffer(bid={self.bid}, ask={self.ask}, spread={self.spread})>"
+
+
+class OrderBook:
+    """
+    Price-time priority order book for a single (base, quote) currency pair.
+
+    Each side keeps a dict of price level -> FIFO queue of orders and a sorted list of
+    the prices present, so the best level is always at one end of the list.
+    The quantity resting on every level and side is kept up to date on each change,
+    so the top of book is read without walking the orders.
+    """
+
+    def __init__(self, base_currency_id: int, quote_currency_id: int):
+        self.base_currency_id = base_currency_id
+        self.quote_currency_id = quote_currency_id
+        self.orders: dict[int, RestingOrder] = {}
+        self._levels = {TradeType.BUY: {}, TradeType.SELL: {}}
+        self._prices = {TradeType.BUY: [], TradeType.SELL: []}  # Ascending on both sides
+        self._level_amounts = {TradeType.BUY: {}, TradeType.SELL: {}}
+        self._side_amounts = {TradeType.BUY: Decimal(0), TradeType.SELL: Decimal(0)}
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, trade_id: int):
+        return trade_id in self.orders
+
+    def add(self, order: RestingOrder) -> None:
+        """
+        Adds an order at the back of its price level.
+
+        Args:
+            order (RestingOrder): The order to rest on the book.
+        """
+        levels = self._levels[order.type]
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = deque()
+            insort(self._prices[order.type], order.price)
+            self._level_amounts[order.type][order.price] = Decimal(0)
+        queue.append(order)
+        self.orders[order.trade_id] = order
+        self._change_amount(order, order.amount)
+
+    def remove(self, trade_id: int) -> RestingOrder | None:
+        """
+        Removes an order from the book.
+
+        Args:
+            trade_id (int): The trade ID of the order.
+
+        Returns:
+            RestingOrder | None: The removed order, or None if it was not on the book.
+        """
+        order = self.orders.pop(trade_id, None)
+        if order is None:
+            return None
+
+        levels = self._levels[order.type]
+        queue = levels[order.price]
+        queue.remove(order)
+        self._change_amount(order, -order.amount)
+        if not queue:
+            del levels[order.price]
+            del self._level_amounts[order.type][order.price]
+            prices = self._prices[order.type]
+            del prices[bisect_left(prices, order.price)]
+        return order
+
+    def _change_amount(self, order: RestingOrder, delta: Decimal) -> None:
+        self._level_amounts[order.type][order.price] += delta
+        self._side_amounts[order.type] += delta
+
+    def best_price(self, trade_type: TradeType) -> Decimal | None:
+        """
+        Returns the best price of one side (highest BUY, lowest SELL), or None if the side is empty.
+
+        Args:
+            trade_type (TradeType): The side to read.
+        """
+        prices = self._prices[trade_type]
+        if not prices:
+            return None
+        return prices[-1] if trade_type == TradeType.BUY else prices[0]
+
+    def get_best_bid_offer(self) -> BestBidOffer:
+        """
+        Returns the best bid, best ask, spread and resting quantities of the book.
+        """
+        bid = self.best_price(TradeType.BUY)
+        ask = self.best_price(TradeType.SELL)
+        return BestBidOffer(
+            bid=bid,
+            ask=ask,
+            bid_amount=self._level_amounts[TradeType.BUY][bid] if bid is not None else Decimal(0),
+            ask_amount=self._level_amounts[TradeType.SELL][ask] if ask is not None else Decimal(0),
+            bid_depth=self._side_amounts[TradeType.BUY],
+            ask_depth=self._side_amounts[TradeType.SELL],
+        )
+
+    def iter_orders(self, trade_type: TradeType):
+        """
+        Iterates over one side of the book in priority order (best price first, then oldest first).
+
+        Args:
+            trade_type (TradeType): The side to iterate.
+        """
+        levels = self._levels[trade_type]
+        prices = self._prices[trade_type]
+        ordered_prices = reversed(prices) if trade_type == TradeType.BUY else prices
+        for price in ordered_prices:
+            yield from levels[price]
+
+    def get_depth(self, levels: int = 10):
+        """
+        Returns the aggregated price ladder of the book, best prices first.
+
+        Args:
+            levels (int): Maximum number of price levels per side.
+
+        Returns:
+            tuple[list[tuple[Decimal, Decimal, int]], list[tuple[Decimal, Decimal, int]]]:
+                The bid and ask ladders as (price, total amount, order count) tuples.
+        """
+        def ladder(trade_type: TradeType):
+            prices = self._prices[trade_type]
+            best_prices = prices[:-levels - 1:-1] if trade_type == TradeType.BUY else prices[:levels]
+            return [
+                (price, self._level_amounts[trade_type][price], len(self._levels[trade_type][price]))
+                for price in best_prices
+            ]
+
+        return ladder(TradeType.BUY), ladder(TradeType.SELL)
+
+    def match(self, discord_id: int, trade_type: TradeType, price: Decimal, amount: Decimal):
+        """
+        Plans the fills for an incoming order without modifying the book.
+
+        The incoming order sweeps the opposite side from the best price outwards for as long
+        as the resting price is within its limit. Orders from the same trader are skipped.
+
+        Args:
+            discord_id (int): The Discord ID of the incoming trader.
+            trade_type (TradeType): Side of the incoming order (BUY or SELL).
+            price (Decimal): Limit price of the incoming order.
+            amount (Decimal): Amount of the incoming order.
+
+        Returns:
+            tuple[list[Fill], Decimal]: The planned fills and the unfilled remainder.
+        """
+        opposite_trade_type = TradeType.SELL if trade_type == TradeType.BUY else TradeType.BUY
+        remaining = Decimal(amount)
+        fills = []
+
+        for order in self.iter_orders(opposite_trade_type):
+            if remaining <= 0:
+                break
+            if trade_type == TradeType.BUY and order.price > price:
+                break
+            if trade_type == TradeType.SELL and order.price < price:
+                break
+            if order.discord_id == discord_id:
+                continue
+
+            quantity = min(order.amount, remaining)
+            fills.append(Fill(order, quantity))
+            remaining -= quantity
+
+        return fills, remaining
+
+    def apply(self, fills: list[Fill]) -> None:
+        """
+        Applies planned fills to the book once they have been persisted.
+
+        Args:
+            fills (list[Fill]): Fills returned by `match`.
+        """
+        for fill in fills:
+            if fill.remaining > 0:
+                self._change_amount(fill.order, -fill.quantity)
+                fill.order.amount = fill.remaining
+            else:
+                self.remove(fill.order.trade_id)
+
+
+class OrderBookService:
+    """
+    Keeps one in-memory order book per currency pair, hydrated from OPEN `TradeList` rows.
+    """
+    _books: dict[tuple[int, int], OrderBook] = {}
+    _lock: asyncio.Lock | None = None
+
+    @staticmethod
+    def open_trades_query(base_currency_id: int = None, quote_currency_id: int = None):
+        """
+        Builds the query of the OPEN orders a book is hydrated from, in time priority,
+        for one pair or for every pair when no pair is given.
+
+        For one pair the database reads a single range of `idx_trade_open_book`.
+        """
+        query = select(TradeList).where(
+            TradeList.status == TradeStatus.OPEN,
+            TradeList.amount > 0,
+        )
+        if base_currency_id is not None:
+            query = query.where(
+                TradeList.base_currency_id == base_currency_id,
+                TradeList.quote_currency_id == quote_currency_id,
+            )
+        return query.order_by(TradeList.created_at, TradeList.trade_id)
+
+    @staticmethod
+    async def _fetch_open_trades(base_currency_id: int = None, quote_currency_id: int = None):
+        async with get_session() as session:
+            result = await session.execute(OrderBookService.open_trades_query(base_currency_id, quote_currency_id))
+            return result.scalars().all()
+
+    @staticmethod
+    async def load_order_books() -> int:
+        """
+        Rebuilds every order book from the OPEN trades in the database. Called once at startup.
+
+        Returns:
+            int: The number of orders loaded.
+        """
+        trades = await OrderBookService._fetch_open_trades()
+        books = {}
+        for trade in trades:
+            pair = (trade.base_currency_id, trade.quote_currency_id)
+            if pair not in books:
+                books[pair] = OrderBook(*pair)
+            books[pair].add(RestingOrder.from_trade(trade))
+
+        OrderBookService._books.clear()
+        OrderBookService._books.update(books)
+        return len(trades)
+
+    @staticmethod
+    async def get_order_book(base_currency_id: int, quote_currency_id: int) -> OrderBook:
+        """
+        Returns the order book of a pair, hydrating it from the database on first use.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+
+        Returns:
+            OrderBook: The order book of the pair.
+        """
+        pair = (base_currency_id, quote_currency_id)
+        book = OrderBookService._books.get(pair)
+        if book is not None:
+            return book
+
+        if OrderBookService._lock is None:
+            OrderBookService._lock = asyncio.Lock()
+
+        async with OrderBookService._lock:
+            book = OrderBookService._books.get(pair)
+            if book is None:
+                book = OrderBook(*pair)
+                for trade in await OrderBookService._fetch_open_trades(base_currency_id, quote_currency_id):
+                    book.add(RestingOrder.from_trade(trade))
+                OrderBookService._books[pair] = book
+            return book
+
+    @staticmethod
+    def discard_order_book(base_currency_id: int, quote_currency_id: int) -> None:
+        """
+        Drops the cached book of a pair so the next access reloads it from the database.
+        Used when the book may have diverged from the database (e.g. a failed write).
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+        """
+        OrderBookService._books.pop((base_currency_id, quote_currency_id), None)
+
+    @staticmethod
+    def peek_order_book(base_currency_id: int, quote_currency_id: int) -> OrderBook | None:
+        """
+        Returns the order book of a pair only if it is already loaded.
+        """
+        return OrderBookService._books.get((base_currency_id, quote_currency_id))
@@ -0,0 +1,136 @@
+from sqlalchemy.future import select
+from sqlalchemy import and_, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Page:
+    """
+    One page of a keyset paginated query.
+
+    The cursors hold the sort key values of the rows at the edges of the page. Pass `next_cursor`
+    as `after` to get the following page and `previous_cursor` as `before` to get the preceding one;
+    a cursor is None when there is no page on that side. `total` is the number of matching rows,
+    only counted when asked for.
+    """
+    __slots__ = ("items", "next_cursor", "previous_cursor", "total")
+
+    def __init__(self, items: list, next_cursor: tuple | None = None, previous_cursor: tuple | None = None,
+                 total: int | None = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __repr__(self):
+        return f"<Page(items={len(self.items)}, has_previous={self.has_previous}, has_next={self.has_next})>"
+
+
+class KeysetPaginator:
+    """
+    Pages through a query by seeking past the sort key of the last row seen instead of skipping
+    OFFSET rows, so every page costs one index range scan however deep it is.
+
+    The sort keys must end with a unique column, so the key of a row identifies it, and are all
+    sorted in the same direction.
+    """
+
+    @staticmethod
+    def seek_condition(keys: list, cursor: tuple, descending: bool):
+        """
+        Builds the condition of the rows strictly after `cursor` in the sort order,
+        i.e. the row value comparison (k1, k2, ...) > (c1, c2, ...), written out so every
+        database can use an index on the keys for it.
+        """
+        def compare(key, value):
+            return key < value if descending else key > value
+
+        condition = or_(*(
+            and_(*(keys[j] == cursor[j] for j in range(i)), compare(keys[i], cursor[i]))
+            for i in range(len(keys))
+        ))
+        if len(keys) > 1:
+            # Redundant bound on the leading key, which is the range the index scan starts from
+            bound = keys[0] <= cursor[0] if descending else keys[0] >= cursor[0]
+            condition = and_(bound, condition)
+        return condition
+
+    @staticmethod
+    def get_cursor(item, keys: list) -> tuple:
+        """
+        Reads the sort key values of an ORM object or a result row.
+        """
+        return tuple(getattr(item, key.key) for key in keys)
+
+    @staticmethod
+    async def fetch_page(session: AsyncSession, query, keys: list, limit: int = 10, descending: bool = False,
+                         after: tuple | None = None, before: tuple | None = None, last: bool = False,
+                         scalars: bool = True, with_total: bool = False) -> Page:
+        """
+        Fetches one page of a query.
+
+        Without a cursor the first page is returned. When the rows of the requested page are gone
+        (deleted since the cursor was read) the last or first page is returned instead.
+
+        Args:
+            session (AsyncSession): The session to run the query in.
+            query: A Select with its filters but without ORDER BY, LIMIT or OFFSET.
+            keys (list): Sort key columns, ending with a unique one.
+            limit (int): The number of rows per page.
+            descending (bool): Whether the keys are sorted in descending order.
+            after (tuple | None): Cursor of the row the page starts after.
+            before (tuple | None): Cursor of the row the page ends before.
+            last (bool): Fetch the last page.
+            scalars (bool): Whether the query selects a single ORM entity to return as objects.
+            with_total (bool): Also count the matching rows, which costs a scan of them all.
+
+        Returns:
+            Page: The rows of the page in sort order, with the cursors of the adjacent pages.
+        """
+        backwards = before is not None or last
+        cursor = before if before is not None else after
+        reverse = descending != backwards
+
+        stmt = query
+        if cursor is not None:
+            stmt = stmt.where(KeysetPaginator.seek_condition(keys, cursor, reverse))
+        stmt = stmt.order_by(*(key.desc() if reverse else key.asc() for key in keys)).limit(limit + 1)
+
+        result = await session.execute(stmt)
+        items = list(result.scalars().all() if scalars else result.all())
+        more = len(items) > limit
+        items = items[:limit]
+
+        if not items and cursor is not None:
+            # Nothing left on that side of the cursor: fall back to the nearest end
+            return await KeysetPaginator.fetch_page(
+                session, query, keys, limit, descending, last=before is None,
+                scalars=scalars, with_total=with_total
+            )
+        if before is not None and not more and len(items) < limit:
+            # Reached the start with a short page, so show a full first page instead
+            return await KeysetPaginator.fetch_page(
+                session, query, keys, limit, descending, scalars=scalars, with_total=with_total
+            )
+
+        if backwards:
+            items.reverse()
+            next_cursor = KeysetPaginator.get_cursor(items[-1], keys) if items and not last else None
+            previous_cursor = KeysetPaginator.get_cursor(items[0], keys) if more else None
+        else:
+            next_cursor = KeysetPaginator.get_cursor(items[-1], keys) if more else None
+            previous_cursor = KeysetPaginator.get_cursor(items[0], keys) if after is not None else None
+
+        total = None
+        if with_total:
+            total = (await session.execute(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            )).scalar()
+        return Page(items, next_cursor, previous_cursor, total)
@@ -0,0 +1,69 @@
+from sqlalchemy.future import select
+from sqlalchemy import insert, or_
+from models.tradefill import TradeFill
+from db import get_session
+
+
+class TradeFillService:
+
+    @staticmethod
+    async def create_trade_fills(fills: list[dict]) -> int:
+        """
+        Records a batch of executions with a single executemany INSERT.
+
+        Args:
+            fills (list[dict]): One dict of TradeFill column values per execution.
+
+        Returns:
+            int: The number of fills recorded.
+        """
+        if not fills:
+            return 0
+        async with get_session() as session:
+            await session.execute(insert(TradeFill), fills)
+            await session.commit()
+            return len(fills)
+
+    @staticmethod
+    async def get_fills_by_trade(trade_id: int):
+        """
+        Retrieves every execution a trade took part in, as maker or taker.
+
+        Args:
+            trade_id (int): The trade ID.
+
+        Returns:
+            list: A list of TradeFill objects ordered by execution time.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                select(TradeFill)
+                .where(or_(TradeFill.maker_trade_id == trade_id, TradeFill.taker_trade_id == trade_id))
+                .order_by(TradeFill.executed_at, TradeFill.fill_id)
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_fills_by_currency_pair(base_currency_id: int, quote_currency_id: int, limit: int = 50):
+        """
+        Retrieves the most recent executions of a currency pair.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            limit (int, optional): Maximum number of fills to return (default is 50).
+
+        Returns:
+            list: A list of TradeFill objects, newest first.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                select(TradeFill)
+                .where(
+                    TradeFill.base_currency_id == base_currency_id,
+                    TradeFill.quote_currency_id == quote_currency_id,
+                )
+                .order_by(TradeFill.executed_at.desc(), TradeFill.fill_id.desc())
+                .limit(limit)
+            )
+            return result.scalars().all()
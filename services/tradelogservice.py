@@ -1,15 +1,14 @@
 from sqlalchemy.future import select
 from sqlalchemy.sql.expression import distinct
-from sqlalchemy import func
+from sqlalchemy import func, insert, cast, type_coerce, literal_column, Integer, Float
 from sqlalchemy.orm import aliased
 from sqlalchemy.exc import NoResultFound
 from models import TradeList, TradeLog
-from db import get_session
+from db import get_session, engine
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from models.currency import Currency
-from math import ceil
-import numpy as np
+from services.candleservice import CandleService
+from services.markettickerservice import MarketTickerService
 
 
 class TradeLogService:
@@ -23,6 +22,8 @@ class TradeLogService:
         Returns:
           A list of percentage changes.
         """
+        import numpy as np  # Imported on use so loading the service does not pull in NumPy
+
         try:
             price_changes = np.diff(prices) / prices[:-1] * 100
             return price_changes.tolist()
@@ -32,43 +33,48 @@ class TradeLogService:
     @staticmethod
     async def calculate_percentage(base_currency_id: int, quote_currency_id: int, time_delta: timedelta):
         """
-        Calculate the percentage change for a currency pair within a specified time delta.
+        Calculate the percentage change of a currency pair over a time delta ending at its last trade.
+
+        The change is measured from the last price traded before the period, or from the first
+        price within it when the pair has no older trades. Both ends are single index probes.
 
         :param base_currency_id: ID of the base currency.
         :param quote_currency_id: ID of the quote currency.
         :param time_delta: Time range for the calculation (e.g., last 24 hours).
-        :return: A list of percentage changes or an empty list if no data is found.
+        :return: The percentage change as a Decimal, or None if the pair has no trades.
         """
         async with get_session() as session:
-            # Calculate the time threshold
             last_trade = await TradeLogService.get_last_trade_log(base_currency_id, quote_currency_id)
+            if last_trade is None:
+                return None
             time_threshold = last_trade.date_traded - time_delta
 
-            # Query for prices within the time range
-            result = await session.execute(
-                select(TradeLog.price)
-                .where(TradeLog.base_currency_id == base_currency_id)
-                .where(TradeLog.quote_currency_id == quote_currency_id)
-                .where(TradeLog.date_traded >= time_threshold)
-                .order_by(TradeLog.date_traded)
-            )
-            prices = [row[0] for row in result.fetchall()]
-
-            # Calculate percentage changes if prices exist
-            if prices:
-                return await TradeLogService.calculate_percentage_change(prices)
-
-            return []
+            open_price = (await session.execute(
+                TradeLogService.pair_range_query(base_currency_id, quote_currency_id, TradeLog.price)
+                .where(TradeLog.date_traded < time_threshold)
+                .limit(1)
+            )).scalar()
+            if open_price is None:
+                open_price = (await session.execute(
+                    TradeLogService.pair_range_query(
+                        base_currency_id, quote_currency_id, TradeLog.price, since=time_threshold, descending=False
+                    ).limit(1)
+                )).scalar()
+
+            if not open_price:
+                return Decimal(0)
+            return (last_trade.price - open_price) / open_price * 100
 
     @staticmethod
-    async def create_trade_log(base_currency_id, quote_currency_id, price, date_traded=None):
+    async def create_trade_log(base_currency_id, quote_currency_id, price, date_traded=None, quantity=None):
         """
-        Creates a new trade log entry.
+        Creates a new trade log entry and adds it to the candles and the ticker of the pair.
 
         :param base_currency_id: ID of the base currency.
         :param quote_currency_id: ID of the quote currency.
         :param price: The price of the trade.
         :param date_traded: The date and time the trade occurred (default: now).
+        :param quantity: The base amount traded, if known.
         :return: The created TradeLog instance.
         """
         async with get_session() as session:
@@ -76,12 +82,56 @@ class TradeLogService:
                 base_currency_id=base_currency_id,
                 quote_currency_id=quote_currency_id,
                 price=price,
+                quantity=quantity,
                 date_traded=date_traded or datetime.now(timezone.utc)
             )
             session.add(new_trade)
+            await CandleService.record_trades(
+                base_currency_id, quote_currency_id, [(price, quantity, new_trade.date_traded)]
+            )
+            await MarketTickerService.update_ticker(base_currency_id, quote_currency_id, price, new_trade.date_traded)
             await session.commit()
             return new_trade
 
+    @staticmethod
+    async def create_trade_logs(base_currency_id, quote_currency_id, prices, date_traded=None, quantities=None):
+        """
+        Creates one trade log entry per price with a single multi-row INSERT
+        and adds them to the candles and the ticker of the pair.
+
+        :param base_currency_id: ID of the base currency.
+        :param quote_currency_id: ID of the quote currency.
+        :param prices: The prices of the trades, in execution order.
+        :param date_traded: The date and time the trades occurred (default: now).
+        :param quantities: The base amounts traded, matching prices (default: unknown).
+        :return: The number of trade logs created.
+        """
+        if not prices:
+            return 0
+        date_traded = date_traded or datetime.now(timezone.utc)
+        quantities = quantities or [None] * len(prices)
+        async with get_session() as session:
+            await session.execute(
+                insert(TradeLog),
+                [
+                    {
+                        "base_currency_id": base_currency_id,
+                        "quote_currency_id": quote_currency_id,
+                        "price": price,
+                        "quantity": quantity,
+                        "date_traded": date_traded,
+                    }
+                    for price, quantity in zip(prices, quantities)
+                ]
+            )
+            await CandleService.record_trades(
+                base_currency_id, quote_currency_id,
+                [(price, quantity, date_traded) for price, quantity in zip(prices, quantities)]
+            )
+            await MarketTickerService.update_ticker(base_currency_id, quote_currency_id, prices[-1], date_traded)
+            await session.commit()
+            return len(prices)
+
     @staticmethod
     async def get_trade_log_by_id(trade_log_id):
         """
@@ -95,6 +145,33 @@ class TradeLogService:
             result = await session.execute(stmt)
             return result.scalars().first()  # Extract the first result
 
+    @staticmethod
+    def pair_range_query(base_currency_id, quote_currency_id, *columns, since=None, descending=True):
+        """
+        Builds a range scan of the trade logs of one pair on idx_trade_log_pair_date.
+        Logs are ordered by date, then by ID for logs recorded at the same time.
+
+        :param base_currency_id: ID of the base currency.
+        :param quote_currency_id: ID of the quote currency.
+        :param columns: Columns to select (default: the TradeLog entity).
+        :param since: Only include logs traded at or after this date.
+        :param descending: Whether the most recent logs come first.
+        :return: The SELECT statement.
+        """
+        stmt = (
+            select(*(columns or (TradeLog,)))
+            .where(
+                TradeLog.base_currency_id == base_currency_id,
+                TradeLog.quote_currency_id == quote_currency_id,
+            )
+        )
+        if since is not None:
+            stmt = stmt.where(TradeLog.date_traded >= since)
+
+        if descending:
+            return stmt.order_by(TradeLog.date_traded.desc(), TradeLog.trade_log_id.desc())
+        return stmt.order_by(TradeLog.date_traded, TradeLog.trade_log_id)
+
     @staticmethod
     async def get_trade_logs_by_currency_pair(base_currency_id, quote_currency_id, time_delta=None):
         """
@@ -103,159 +180,128 @@ class TradeLogService:
         :param base_currency_id: ID of the base currency.
         :param quote_currency_id: ID of the quote currency.
         :param time_delta: A timedelta object representing the time range (e.g., last 1 day, 8 hours, etc.).
-        :return: A list of TradeLog instances.
+        :return: A list of TradeLog instances, most recent first.
         """
         async with get_session() as session:
-            # Base query
-            stmt = (
-                select(TradeLog)
-                .where(
-                    TradeLog.base_currency_id == base_currency_id,
-                    TradeLog.quote_currency_id == quote_currency_id,
-                )
-            )
-            last_trade = await TradeLogService.get_last_trade_log(base_currency_id, quote_currency_id)
+            time_threshold = None
             # Apply time range filter if time_delta is provided
             if time_delta is not None:
+                last_trade = await TradeLogService.get_last_trade_log(base_currency_id, quote_currency_id)
+                if last_trade is None:
+                    return []
                 time_threshold = last_trade.date_traded - time_delta
-                stmt = stmt.where(TradeLog.date_traded >= time_threshold)
 
-            stmt = stmt.order_by(TradeLog.date_traded.desc())
-
-            result = await session.execute(stmt)
+            result = await session.execute(
+                TradeLogService.pair_range_query(base_currency_id, quote_currency_id, since=time_threshold)
+            )
             return result.scalars().all()  # Extract all results
 
     @staticmethod
-    async def get_last_trade_log(base_currency_id, quote_currency_id):
+    async def get_price_rows(base_currency_id, quote_currency_id, time_delta=None):
         """
-        Retrieves all trade logs for a specific currency pair.
+        Retrieves only the (date_traded, price) columns of the trade logs of a pair, as plain rows.
+        Prices are returned as floats, the type the charts plot, rather than Decimals.
 
         :param base_currency_id: ID of the base currency.
         :param quote_currency_id: ID of the quote currency.
-        :return: A list of TradeLog instances.
+        :param time_delta: A timedelta object representing the time range (e.g., last 1 day, 8 hours, etc.).
+        :return: A list of (date_traded, price) rows in chronological order.
         """
         async with get_session() as session:
-            stmt = (
-                select(TradeLog)
-                .where(
-                    TradeLog.base_currency_id == base_currency_id,
-                    TradeLog.quote_currency_id == quote_currency_id,
+            time_threshold = None
+            if time_delta is not None:
+                last_trade = await TradeLogService.get_last_trade_log(base_currency_id, quote_currency_id)
+                if last_trade is None:
+                    return []
+                time_threshold = last_trade.date_traded - time_delta
+
+            result = await session.execute(
+                TradeLogService.pair_range_query(
+                    base_currency_id, quote_currency_id, TradeLog.date_traded, type_coerce(TradeLog.price, Float),
+                    since=time_threshold, descending=False
                 )
-                .order_by(TradeLog.date_traded.desc())
-                .limit(1)
             )
-            result = await session.execute(stmt)
-            return result.scalars().first()
+            return result.all()
 
     @staticmethod
-    async def update_trade_log(trade_log_id, price):
+    async def get_bucketed_prices(base_currency_id, quote_currency_id, bucket_seconds: int, time_delta=None):
         """
-        Updates the price of a trade log and recalculates the percentage movement.
+        Aggregates the trade logs of a pair into fixed time buckets inside the database,
+        so only one row per bucket crosses the wire.
+
+        Open and close are the prices of the first and last log of each bucket by ID,
+        which is their recording order.
 
-        :param trade_log_id: The ID of the trade log to update.
-        :param price: The new price to set.
-        :return: The updated TradeLog instance, or None if not found.
+        :param base_currency_id: ID of the base currency.
+        :param quote_currency_id: ID of the quote currency.
+        :param bucket_seconds: The bucket width in seconds.
+        :param time_delta: A timedelta object representing the time range (e.g., last 1 day, 8 hours, etc.).
+        :return: A list of (bucket start as UNIX seconds, open, high, low, close) tuples in chronological order.
         """
         async with get_session() as session:
-            stmt = select(TradeLog).where(TradeLog.trade_log_id == trade_log_id)
-            result = await session.execute(stmt)
-            trade_log = result.scalars().first()  # Extract the first result
+            time_threshold = None
+            if time_delta is not None:
+                last_trade = await TradeLogService.get_last_trade_log(base_currency_id, quote_currency_id)
+                if last_trade is None:
+                    return []
+                time_threshold = last_trade.date_traded - time_delta
 
-            if trade_log:
-                trade_log.price = price
-                trade_log.percentage = await TradeLogService.calculate_percentage(
-                    trade_log.base_currency_id, trade_log.quote_currency_id, price
+            if engine.dialect.name == "mysql":
+                epoch_seconds = func.timestampdiff(literal_column("SECOND"), "1970-01-01", TradeLog.date_traded)
+            else:
+                epoch_seconds = cast(func.strftime("%s", TradeLog.date_traded), Integer)
+            bucket = (epoch_seconds // bucket_seconds * bucket_seconds).label("bucket")
+
+            buckets = (
+                TradeLogService.pair_range_query(
+                    base_currency_id, quote_currency_id,
+                    bucket,
+                    func.min(TradeLog.trade_log_id).label("first_id"),
+                    func.max(TradeLog.trade_log_id).label("last_id"),
+                    func.max(TradeLog.price).label("high"),
+                    func.min(TradeLog.price).label("low"),
+                    since=time_threshold
                 )
-                await session.commit()
-                return trade_log
-            return None
+                .order_by(None)
+                .group_by(bucket)
+                .subquery()
+            )
+            open_log = aliased(TradeLog)
+            close_log = aliased(TradeLog)
+            result = await session.execute(
+                select(buckets.c.bucket, open_log.price, buckets.c.high, buckets.c.low, close_log.price)
+                .join(open_log, open_log.trade_log_id == buckets.c.first_id)
+                .join(close_log, close_log.trade_log_id == buckets.c.last_id)
+                .order_by(buckets.c.bucket)
+            )
+            return [tuple(row) for row in result]
 
     @staticmethod
-    async def delete_trade_log(trade_log_id):
+    async def get_last_trade_log(base_currency_id, quote_currency_id):
         """
-        Deletes a trade log by its ID.
+        Retrieves the most recent trade log of a currency pair.
 
-        :param trade_log_id: The ID of the trade log to delete.
-        :return: True if the trade log was deleted, False if not found.
+        :param base_currency_id: ID of the base currency.
+        :param quote_currency_id: ID of the quote currency.
+        :return: The TradeLog instance, or None if the pair has no trade logs.
         """
         async with get_session() as session:
-            stmt = select(TradeLog).where(TradeLog.trade_log_id == trade_log_id)
-            result = await session.execute(stmt)
-            trade_log = result.scalars().first()  # Extract the first result
-
-            if trade_log:
-                await session.delete(trade_log)
-                await session.commit()
-                return True
-            return False
+            result = await session.execute(
+                TradeLogService.pair_range_query(base_currency_id, quote_currency_id).limit(1)
+            )
+            return result.scalars().first()
 
     @staticmethod
-    async def get_trade_log_list_with_price(page: int = 1, limit: int = 10):
+    async def get_last_trade_log_id(base_currency_id, quote_currency_id) -> int | None:
         """
-        Retrieves distinct base and quote currency pairs with their most recent price, and supports pagination.
-
-        Args:
-            page (int): The page number to retrieve.
-            limit (int): The number of items per page.
+        Retrieves the ID of the most recent trade log of a currency pair.
 
-        Returns:
-            Tuple[List[Tuple[str, str, Decimal]], int]: A tuple containing:
-                                                        - List of tuples with (base_ticker, quote_ticker, price)
-                                                        - Total number of pages
+        :param base_currency_id: ID of the base currency.
+        :param quote_currency_id: ID of the quote currency.
+        :return: The ID of the most recent trade log of the pair, or None if it has no trade logs.
         """
         async with get_session() as session:
-            # Subquery to get the most recent trade date for each currency pair
-            subquery = (
-                select(
-                    TradeLog.base_currency_id,
-                    TradeLog.quote_currency_id,
-                    func.max(TradeLog.date_traded).label("max_date")
-                )
-                .group_by(TradeLog.base_currency_id, TradeLog.quote_currency_id)
-                .subquery()
-            )
-
-            # Aliases for the currency table
-            base_currency_alias = aliased(Currency)
-            quote_currency_alias = aliased(Currency)
-
-            # Alias the trade log table for the join
-            trade_log_alias = aliased(TradeLog)
-
-            # Main query to fetch distinct currency pairs with their tickers and the most recent price
-            query = (
-                select(
-                    base_currency_alias.ticker.label("base_ticker"),
-                    quote_currency_alias.ticker.label("quote_ticker"),
-                    trade_log_alias.price
-                )
-                .select_from(subquery)  # Start explicitly from the subquery
-                .join(
-                    trade_log_alias,
-                    (trade_log_alias.base_currency_id == subquery.c.base_currency_id)
-                    & (trade_log_alias.quote_currency_id == subquery.c.quote_currency_id)
-                    & (trade_log_alias.date_traded == subquery.c.max_date)
-                )
-                .join(
-                    base_currency_alias,
-                    trade_log_alias.base_currency_id == base_currency_alias.currency_id
-                )
-                .join(
-                    quote_currency_alias,
-                    trade_log_alias.quote_currency_id == quote_currency_alias.currency_id
-                )
+            result = await session.execute(
+                TradeLogService.pair_range_query(base_currency_id, quote_currency_id, TradeLog.trade_log_id).limit(1)
             )
-
-            # Count total distinct records
-            count_query = select(func.count()).select_from(subquery)
-            total_records = (await session.execute(count_query)).scalar()
-            total_pages = ceil(total_records / limit)
-
-            # Apply pagination using limit and offset
-            paginated_query = query.limit(limit).offset((page - 1) * limit)
-
-            # Execute the paginated query
-            result = await session.execute(paginated_query)
-            records = result.all()
-
-            return records, total_pages
\ No newline at end of file
+            return result.scalar()
@@ -1,82 +1,39 @@
-from pandas.core.dtypes.cast import maybe_cast_to_datetime
 from sqlalchemy.future import select
 from sqlalchemy import func, update
 from sqlalchemy import and_
+from sqlalchemy.orm import aliased
 from db import get_session
 from models.account import Account
-from models.trade import TradeList, TradeType, OrderType, TradeStatus
+from models.currency import Currency
+from models.trade import TradeList, TradeType, OrderType, TradeStatus, TimeInForce
 from services.accountservice import AccountService
 from services.currencyservice import CurrencyService
 from services.tradelogservice import TradeLogService
+from services.orderbook import OrderBookService, RestingOrder, Fill, BestBidOffer
+from services.tradefillservice import TradeFillService
+from services.matchingengine import MatchingEngine
+from services.marketstats import MarketStatsService
+from services.indicators import IndicatorService
+from services.pagination import Page, KeysetPaginator
+from collections import defaultdict
 from decimal import Decimal
-from math import ceil
+from datetime import datetime, timezone
+import os
+
+# Default fraction of the best price a MARKET order may move the price by
+MARKET_MAX_SLIPPAGE = Decimal(os.getenv("MARKET_MAX_SLIPPAGE", "0.05"))
 
 
 class TradeService:
 
     @staticmethod
-    async def create_trade(
-            discord_id: int,
-            base_currency_id: int,
-            quote_currency_id: int,
-            trade_type: TradeType,
-            price_offered: Decimal,
-            amount: Decimal,
-            order_type: OrderType = OrderType.LIMIT,
-            status: TradeStatus = TradeStatus.OPEN,  # Default status to OPEN
-            executed_at: str | None = None,  # Optional field
-            executed_price: Decimal | None = None,  # Optional field
-    ) -> TradeList | None:
+    def _remove_from_order_book(trade: TradeList) -> None:
         """
-        Creates a new trade in the system with all trade parameters.
-
-        Args:
-            discord_id (int): ID of the Discord user creating the trade.
-            base_currency_id (int): ID of the base currency.
-            quote_currency_id (int): ID of the quote currency.
-            trade_type (TradeType): Type of the trade (BUY or SELL).
-            price_offered (Decimal): Offered price for the trade.
-            amount (Decimal): Amount involved in the trade.
-            order_type (OrderType): The type of order (LIMIT, MARKET, P2P).
-            status (TradeStatus): The status of the trade (default is 'OPEN').
-            executed_at (str | None): The timestamp when the trade was executed (optional).
-            executed_price (Decimal | None): The price at which the trade was executed (optional).
-
-        Returns:
-            TradeList | None: The newly created trade, or None if creation fails.
+        Removes a trade from its pair's in-memory order book if the book is loaded.
         """
-        # Validate the inputs
-        if price_offered <= 0 or amount <= 0:
-            raise ValueError("Price offered and amount must be greater than zero.")
-
-        if base_currency_id == quote_currency_id:
-            raise ValueError("Base currency and quote currency must be different.")
-
-        # Create the trade asynchronously
-        async with get_session() as session:
-            try:
-                new_trade = TradeList(
-                    discord_id=discord_id,
-                    base_currency_id=base_currency_id,
-                    quote_currency_id=quote_currency_id,
-                    type=trade_type,
-                    price_offered=price_offered,
-                    amount=amount,
-                    order_type=order_type,
-                    status=status,
-                    executed_at=executed_at,
-                    executed_price=executed_price,
-                )
-                session.add(new_trade)
-                await session.commit()
-                await session.refresh(new_trade)
-                return new_trade
-
-            except Exception as e:
-                # Log or handle any exceptions that occur during trade creation
-                print(f"Error creating trade: {e}")
-                await session.rollback()
-                return None
+        order_book = OrderBookService.peek_order_book(trade.base_currency_id, trade.quote_currency_id)
+        if order_book is not None:
+            order_book.remove(trade.trade_id)
 
     @staticmethod
     async def read_trade_by_id(trade_id: int):
@@ -93,61 +50,6 @@ class TradeService:
             result = await session.execute(select(TradeList).filter(TradeList.trade_id == trade_id))
             return result.scalars().first()
 
-    @staticmethod
-    async def update_trade(
-            trade_id: int,
-            new_price_offered: Decimal = None,
-            new_amount: Decimal = None,
-    ):
-        """
-        Updates the details of a specific trade.
-
-        Args:
-            trade_id (int): The trade ID.
-            new_price_offered (Decimal, optional): The new price offered.
-            new_amount (Decimal, optional): The new trade amount.
-
-        Returns:
-            TradeList: The updated trade, or None if not found.
-        """
-        async with get_session() as session:
-            result = await session.execute(select(TradeList).filter(TradeList.trade_id == trade_id))
-            trade = result.scalars().first()
-            if trade:
-                if new_price_offered is not None:
-                    trade.price_offered = new_price_offered
-                if new_amount is not None:
-                    trade.amount = new_amount
-                await session.commit()
-                return trade
-            return None
-
-    @staticmethod
-    async def set_status(trade_id: int, status: TradeStatus) -> None:
-        """
-        Updates the status of a trade for the given discord_id, base_currency_id, and quote_currency_id.
-
-        Args:
-            trade_id (str): The trade id
-            status (str): The new status to set.
-
-        Returns:
-            None
-        """
-        async with get_session() as session:  # Create a session
-            query = (
-                select(TradeList)
-                .where(
-                    TradeList.trade_id == trade_id
-                )
-            )
-            result = await session.execute(query)
-            trade = result.scalar_one_or_none()
-
-            if trade:  # If a trade exists, update its status
-                trade.status = status
-                await session.commit()
-
     @staticmethod
     async def get_status(trade_id: int) -> str | None:
         """
@@ -173,62 +75,89 @@ class TradeService:
 
 
     @staticmethod
-    async def delete_trade(trade_id: int):
+    async def get_best_bid_offer(base_currency_id: int, quote_currency_id: int) -> BestBidOffer:
         """
-        Deletes a trade by its ID.
+        Get the best bid, best ask, spread and depth of a currency pair in one call.
+
+        Served from the pair's in-memory order book, which is kept current on every
+        order insert, fill and cancel, so no database query is made once the book is loaded.
+        A book that is not loaded is hydrated on the pair's actor, so it is never built
+        from a snapshot taken in the middle of a trade or cancel.
 
         Args:
-            trade_id (int): The trade ID.
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
 
         Returns:
-            bool: True if the trade was deleted, False otherwise.
+            BestBidOffer: The top of book of the pair.
         """
-        async with get_session() as session:
-            result = await session.execute(select(TradeList).filter(TradeList.trade_id == trade_id))
-            trade = result.scalars().first()
-            if trade:
-                await session.delete(trade)
-                await session.commit()
-                return True
-            return False
+        order_book = OrderBookService.peek_order_book(base_currency_id, quote_currency_id)
+        if order_book is None:
+            order_book = await MatchingEngine.submit(
+                base_currency_id, quote_currency_id, OrderBookService.get_order_book,
+                base_currency_id, quote_currency_id
+            )
+        return order_book.get_best_bid_offer()
 
     @staticmethod
-    async def get_bid_price(base_currency_id: int, quote_currency_id: int):
+    async def get_depth(base_currency_id: int, quote_currency_id: int, levels: int = 10):
         """
-        Get the highest bid price for the given currency pair.
+        Get the aggregated price ladder of a currency pair.
+
+        Served from the in-memory order book when the pair's book is loaded, otherwise
+        computed by a single GROUP BY over the OPEN orders of the pair.
+
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            levels (int): Maximum number of price levels per side (default is 10).
 
-        :param base_currency_id: ID of the base currency.
-        :param quote_currency_id: ID of the quote currency.
-        :return: Highest bid price (Decimal).
+        Returns:
+            tuple[list[tuple[Decimal, Decimal, int]], list[tuple[Decimal, Decimal, int]]]:
+                The bid and ask ladders, best price first, as (price, total amount, order count) tuples.
         """
+        order_book = OrderBookService.peek_order_book(base_currency_id, quote_currency_id)
+        if order_book is not None:
+            return order_book.get_depth(levels)
+
         async with get_session() as session:
-            result = await session.execute(
-                select(func.max(TradeList.price_offered))
-                .where(TradeList.base_currency_id == base_currency_id)
-                .where(TradeList.quote_currency_id == quote_currency_id)
-                .where(TradeList.status == TradeStatus.OPEN)
-            )
-            bid_price = result.scalar()
-            return Decimal(bid_price) if bid_price is not None else Decimal(0)
+            result = await session.execute(TradeService.depth_query(base_currency_id, quote_currency_id))
+
+            ladders = {TradeType.BUY: [], TradeType.SELL: []}
+            for trade_type, price, amount, order_count in result.all():
+                ladders[trade_type].append((Decimal(price), Decimal(amount), order_count))
+
+            return ladders[TradeType.BUY][:-levels - 1:-1], ladders[TradeType.SELL][:levels]
 
     @staticmethod
-    async def get_ask_price(base_currency_id: int, quote_currency_id: int):
+    def depth_query(base_currency_id: int, quote_currency_id: int):
         """
-        Get the lowest ask price for the given currency pair.
+        Builds the price ladder query of a pair: the total amount and order count of its OPEN
+        orders per side and price.
+
+        The equality filters follow `idx_trade_open_book`, whose next columns are the grouping
+        columns, so the database groups the rows of one index range without sorting them.
 
-        :param base_currency_id: ID of the base currency.
-        :param quote_currency_id: ID of the quote currency.
-        :return: Lowest ask price (Decimal).
+        Args:
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
         """
-        async with get_session() as session:
-            result = await session.execute(
-                select(func.min(TradeList.price_offered))
-                .where(TradeList.base_currency_id == base_currency_id)
-                .where(TradeList.quote_currency_id == quote_currency_id)
-                .where(TradeList.status == TradeStatus.OPEN)
+        return (
+            select(
+                TradeList.type,
+                TradeList.price_offered,
+                func.sum(TradeList.amount),
+                func.count(TradeList.trade_id)
+            )
+            .where(
+                TradeList.base_currency_id == base_currency_id,
+                TradeList.quote_currency_id == quote_currency_id,
+                TradeList.status == TradeStatus.OPEN,
+                TradeList.amount > 0,
             )
-            ask_price = result.scalar()
-            return Decimal(ask_price) if ask_price is not None else Decimal(0)
+            .group_by(TradeList.type, TradeList.price_offered)
+            .order_by(TradeList.type, TradeList.price_offered)
+        )
 
     @staticmethod
     async def get_all_trades(
@@ -237,101 +166,126 @@ class TradeService:
             quote_currency_id: int = None,
             trade_type: TradeType = None,
             status: TradeStatus = None,
-            page: int = 1,
             limit: int = 10,
-    ):
+            after: tuple | None = None,
+            before: tuple | None = None,
+            last: bool = False,
+            with_total: bool = False,
+    ) -> Page:
         """
-        Retrieves trades with optional filtering and pagination.
+        Retrieves a page of trades with optional filtering, by keyset pagination.
+
+        Trades of one type are sorted by price, BUY ascending and SELL descending, then by trade ID.
+        Trades of both types are sorted by trade ID.
 
         Args:
+            discord_id (int, optional): Filter by the Discord ID of the trader.
             base_currency_id (int, optional): Filter by base currency ID.
             quote_currency_id (int, optional): Filter by quote currency ID.
             trade_type (TradeType, optional): Filter by trade type (BUY or SELL).
-            page (int, optional): The page number (default is 1).
+            status (TradeStatus, optional): Filter by trade status.
             limit (int, optional): The number of trades per page (default is 10).
+            after (tuple, optional): Page.next_cursor of the current page, to get the next one.
+            before (tuple, optional): Page.previous_cursor of the current page, to get the previous one.
+            last (bool, optional): Fetch the last page instead (default is False).
+            with_total (bool, optional): Whether to count the matching trades (default is False).
 
         Returns:
-            list: A list of TradeList objects matching the criteria.
+            Page: The TradeList objects of the page.
         """
-        async with get_session() as session:
-            query = select(TradeList)
-
-            # Apply filters if provided
-            if discord_id:
-                query = query.where(TradeList.discord_id == discord_id)
-            if base_currency_id:
-                query = query.where(TradeList.base_currency_id == base_currency_id)
-            if quote_currency_id:
-                query = query.where(TradeList.quote_currency_id == quote_currency_id)
-            if trade_type:
-                query = query.where(TradeList.type == trade_type)
-            if status:
-                query = query.where(TradeList.status == status)
-
-            # Apply sorting based on trade type
-            if trade_type == TradeType.BUY:
-                query = query.order_by(TradeList.price_offered.asc())
-            elif trade_type == TradeType.SELL:
-                query = query.order_by(TradeList.price_offered.desc())
+        query = TradeService._filter_trades(
+            select(TradeList), discord_id, base_currency_id, quote_currency_id, trade_type, status
+        )
 
-            # Apply pagination
-            offset = (page - 1) * limit
-            query = query.offset(offset).limit(limit)
-
-            result = await session.execute(query)
-            return result.scalars().all()
+        async with get_session() as session:
+            return await KeysetPaginator.fetch_page(
+                session,
+                query,
+                TradeService._trade_sort_keys(trade_type),
+                limit=limit,
+                descending=trade_type == TradeType.SELL,
+                after=after,
+                before=before,
+                last=last,
+                with_total=with_total,
+            )
 
     @staticmethod
-    async def get_total_pages(
-        discord_id: int = None,
-        base_currency_id: int = None,
-        quote_currency_id: int = None,
-        trade_type: TradeType = None,
-        status: TradeStatus = None,
-        limit: int = 10
-    ) -> int:
+    async def get_trade_rows(
+            discord_id: int = None,
+            base_currency_id: int = None,
+            quote_currency_id: int = None,
+            trade_type: TradeType = None,
+            status: TradeStatus = None,
+            limit: int = 10,
+            after: tuple | None = None,
+            before: tuple | None = None,
+            last: bool = False,
+            with_total: bool = False,
+    ) -> Page:
         """
-        Calculate the total number of pages for the given filters.
-
-        Args:
-            discord_id (int): The Discord ID of the user (optional).
-            base_currency_id (int): The ID of the base currency (optional).
-            quote_currency_id (int): The ID of the quote currency (optional).
-            trade_type (TradeType): The type of the trade (optional).
-            status (TradeStatus): The status of the trade (optional).
+        Same as get_all_trades, as display rows with the pair tickers joined in, so a page
+        is a single query however many currencies it shows.
 
         Returns:
-            int: Total number of pages.
-            :param limit: Number of rows per page
+            Page: Rows of (trade_id, base_ticker, quote_ticker, type, price_offered, amount).
         """
+        base_currency_alias = aliased(Currency)
+        quote_currency_alias = aliased(Currency)
+        query = TradeService._filter_trades(
+            select(
+                TradeList.trade_id,
+                base_currency_alias.ticker.label("base_ticker"),
+                quote_currency_alias.ticker.label("quote_ticker"),
+                TradeList.type,
+                TradeList.price_offered,
+                TradeList.amount,
+            )
+            .join(base_currency_alias, TradeList.base_currency_id == base_currency_alias.currency_id)
+            .join(quote_currency_alias, TradeList.quote_currency_id == quote_currency_alias.currency_id),
+            discord_id, base_currency_id, quote_currency_id, trade_type, status
+        )
+
         async with get_session() as session:
-            # Base query
-            query = select(func.count()).select_from(TradeList)
-
-            # Apply filters dynamically based on provided arguments
-            if discord_id is not None:
-                query = query.where(TradeList.discord_id == discord_id)
-            if base_currency_id is not None:
-                query = query.where(TradeList.base_currency_id == base_currency_id)
-            if quote_currency_id is not None:
-                query = query.where(TradeList.quote_currency_id == quote_currency_id)
-            if trade_type is not None:
-                query = query.where(TradeList.type == trade_type)
-            if status is not None:
-                query = query.where(TradeList.status == status)
-
-            # Execute the query
-            result = await session.execute(query)
-            total_trades = result.scalar()  # Extract the total count
+            return await KeysetPaginator.fetch_page(
+                session,
+                query,
+                TradeService._trade_sort_keys(trade_type),
+                limit=limit,
+                descending=trade_type == TradeType.SELL,
+                after=after,
+                before=before,
+                last=last,
+                scalars=False,
+                with_total=with_total,
+            )
 
-            # Calculate total pages based on PAGE_SIZE
-            total_pages = ceil(total_trades / limit) if total_trades else 1
-            return total_pages
+    @staticmethod
+    def _filter_trades(query, discord_id: int = None, base_currency_id: int = None, quote_currency_id: int = None,
+                       trade_type: TradeType = None, status: TradeStatus = None):
+        # Apply filters if provided
+        if discord_id:
+            query = query.where(TradeList.discord_id == discord_id)
+        if base_currency_id:
+            query = query.where(TradeList.base_currency_id == base_currency_id)
+        if quote_currency_id:
+            query = query.where(TradeList.quote_currency_id == quote_currency_id)
+        if trade_type:
+            query = query.where(TradeList.type == trade_type)
+        if status:
+            query = query.where(TradeList.status == status)
+        return query
+
+    @staticmethod
+    def _trade_sort_keys(trade_type: TradeType = None) -> list:
+        # Sort keys based on trade type, ending with the unique trade ID
+        return [TradeList.price_offered, TradeList.trade_id] if trade_type else [TradeList.trade_id]
 
     @staticmethod
     async def cancel_trade(trade_id: int) -> bool:
         """
         Cancels a trade by marking its status as 'CANCELLED'.
+        Runs on the matching actor of the trade's pair.
 
         Args:
             trade_id (int): The trade ID.
@@ -339,6 +293,15 @@ class TradeService:
         Returns:
             bool: True if the trade was successfully cancelled, False otherwise.
         """
+        trade = await TradeService.read_trade_by_id(trade_id)
+        if not trade:
+            return False
+        return await MatchingEngine.submit(
+            trade.base_currency_id, trade.quote_currency_id, TradeService._cancel_trade, trade_id
+        )
+
+    @staticmethod
+    async def _cancel_trade(trade_id: int) -> bool:
         async with get_session() as session:
             result = await session.execute(select(TradeList).filter(TradeList.trade_id == trade_id))
             trade = result.scalars().first()
@@ -346,377 +309,268 @@ class TradeService:
             if trade and trade.status == TradeStatus.OPEN:
                 # Set the trade status to CANCELED
                 trade.status = TradeStatus.CANCELED
-                await session.commit()
 
-                # Reverse any reserved funds for the cancelled trade
+                # Release the funds the trade still holds
                 if trade.type == TradeType.BUY:
-                    # Refund the reserved quote currency
-                    trader_account = await AccountService.get_account(trade.discord_id, trade.quote_currency_id)
-                    if trader_account:
-                        refund_amount = trade.price_offered * trade.amount
-                        await AccountService.update_account_balance(
-                            trader_account.account_id,
-                            trader_account.balance + refund_amount
-                        )
-                elif trade.type == TradeType.SELL:
-                    # Refund the reserved base currency
-                    trader_account = await AccountService.get_account(trade.discord_id, trade.base_currency_id)
-                    if trader_account:
-                        await AccountService.update_account_balance(
-                            trader_account.account_id,
-                            trader_account.balance + trade.amount
-                        )
+                    currency_id, held_amount = trade.quote_currency_id, trade.price_offered * trade.amount
+                else:
+                    currency_id, held_amount = trade.base_currency_id, trade.amount
+                trader_account = await AccountService.get_account(trade.discord_id, currency_id)
+                if trader_account:
+                    await AccountService.release(trader_account.account_id, held_amount)
+
+                # The status change and the refund are committed together
+                await session.commit()
+                TradeService._remove_from_order_book(trade)
                 return True
 
             return False
 
-    @staticmethod
-    async def find_matching_trade(
-            discord_id: int,
-            base_currency_id: int,
-            quote_currency_id: int,
-            trade_type: TradeType,
-            price_offered: Decimal,
-            amount: Decimal,
-            order_type: OrderType = OrderType.LIMIT
-    ) -> TradeList:
-        """
-        Finds a matching trade based on the criteria.
-
-        Args:
-            discord_id (int): Discord ID of the trader (to exclude their own trades).
-            base_currency_id (int): Base currency ID of the trade.
-            quote_currency_id (int): Quote currency ID of the trade.
-            trade_type (TradeType): Type of trade (BUY or SELL).
-            price_offered (Decimal): Price offered for the trade.
-            amount (Decimal): Amount to trade.
-            order_type (OrderType): The type of order (default. LIMIT)
-
-        Returns:
-            TradeList: The first matching trade, or None if no match found.
-        """
-        # Determine the opposite trade type
-        opposite_trade_type = TradeType.BUY if trade_type == TradeType.SELL else TradeType.SELL
-
-        async with get_session() as session:
-            # Build the query
-            query = (
-                select(TradeList)
-                .filter(
-                    TradeList.discord_id != discord_id,  # Exclude the user's own trades
-                    TradeList.order_type == order_type,
-                    TradeList.status == TradeStatus.OPEN,
-                    TradeList.base_currency_id == base_currency_id,
-                    TradeList.quote_currency_id == quote_currency_id,
-                    TradeList.type == opposite_trade_type,
-                    TradeList.price_offered >= price_offered if trade_type == TradeType.SELL else TradeList.price_offered <= price_offered,
-                    TradeList.amount > 0,
-                )
-                .order_by(
-                    TradeList.price_offered.asc() if trade_type == TradeType.BUY else TradeList.price_offered.desc())
-                .limit(1)
-            )
-
-            # Execute the query
-            result = await session.execute(query)
-            return result.scalars().first()
-
     @staticmethod
     async def process_trade(discord_id: int, base_currency_id: int, quote_currency_id: int,
-                            trade_type: TradeType, price: Decimal, amount: Decimal) -> int:
+                            trade_type: TradeType, price: Decimal, amount: Decimal,
+                            order_type: OrderType = OrderType.LIMIT,
+                            time_in_force: TimeInForce = TimeInForce.GTC,
+                            max_slippage: Decimal = None) -> int:
         """
-        Processes a trade by finding matching trades and subtracting amounts accordingly.
+        Processes a trade by matching it against the pair's in-memory order book and
+        persisting all resulting fills in a single write.
+        Runs on the matching actor of the pair, so trades of the same pair never interleave.
+
+        Only LIMIT orders with GTC time in force rest on the book. MARKET orders sweep the
+        opposite side up to `max_slippage` away from its best price, and like IOC and FOK
+        orders their unfilled remainder is canceled instead of listed.
 
         :param int discord_id: The trader's Discord ID.
         :param int base_currency_id: The base currency ID.
         :param int quote_currency_id: The quote currency ID.
         :param TradeType trade_type: Type of trade (BUY or SELL).
-        :param Decimal price: Price offered for the trade.
+        :param Decimal price: Price offered for the trade. Ignored for MARKET orders.
         :param Decimal amount: Amount to be traded.
+        :param OrderType order_type: LIMIT or MARKET (default is LIMIT).
+        :param TimeInForce time_in_force: GTC, IOC or FOK (default is GTC). MARKET orders are never GTC.
+        :param Decimal max_slippage: Fraction of the best price a MARKET order may move the price
+                                     (default is MARKET_MAX_SLIPPAGE).
         :returns: Status code indicating the result of the trade:
                   1 - Trade fully fulfilled,
                   2 - Trade partially fulfilled and listed,
                   3 - Insufficient balance.
                   4 - Accounts are disabled
+                  5 - Nothing executed (no liquidity within the price limit, or a FOK order that cannot fill in full)
+                  6 - Trade partially fulfilled and the remainder canceled
         """
-        opposite_trade_type = TradeType.BUY if trade_type == TradeType.SELL else TradeType.SELL
-        remaining_amount = Decimal(amount)
+        return await MatchingEngine.submit(
+            base_currency_id, quote_currency_id, TradeService._process_trade,
+            discord_id, base_currency_id, quote_currency_id, trade_type, price, amount,
+            order_type, time_in_force, max_slippage
+        )
+
+    @staticmethod
+    async def _process_trade(discord_id: int, base_currency_id: int, quote_currency_id: int,
+                             trade_type: TradeType, price: Decimal, amount: Decimal,
+                             order_type: OrderType = OrderType.LIMIT,
+                             time_in_force: TimeInForce = TimeInForce.GTC,
+                             max_slippage: Decimal = None) -> int:
+        amount = Decimal(amount)
+        order_book = await OrderBookService.get_order_book(base_currency_id, quote_currency_id)
+
+        if order_type == OrderType.MARKET:
+            # Derive the limit price from the best opposite price and the slippage bound
+            opposite_trade_type = TradeType.SELL if trade_type == TradeType.BUY else TradeType.BUY
+            best_price = order_book.best_price(opposite_trade_type)
+            if best_price is None:
+                return 5
+            slippage = Decimal(max_slippage) if max_slippage is not None else MARKET_MAX_SLIPPAGE
+            price = best_price * (1 + slippage) if trade_type == TradeType.BUY else best_price * (1 - slippage)
+            if time_in_force == TimeInForce.GTC:
+                time_in_force = TimeInForce.IOC
+        price = Decimal(price)
+        rests = time_in_force == TimeInForce.GTC
 
         async with get_session() as session:
             # Fetch the trader's accounts
-            trader_base_account = await session.execute(
-                select(Account).where(Account.discord_id == discord_id, Account.currency_id == base_currency_id)
-            )
-            trader_base_account = trader_base_account.scalars().first()
-
-            trader_quote_account = await session.execute(
-                select(Account).where(Account.discord_id == discord_id, Account.currency_id == quote_currency_id)
+            result = await session.execute(
+                select(Account).where(
+                    Account.discord_id == discord_id,
+                    Account.currency_id.in_([base_currency_id, quote_currency_id]),
+                )
             )
-            trader_quote_account = trader_quote_account.scalars().first()
-
-            # Ensure accounts exist
-            if not trader_base_account:
-                trader_base_account = Account(discord_id=discord_id, currency_id=base_currency_id,
-                                              balance=Decimal("0.00"))
-                session.add(trader_base_account)
-
-            if not trader_quote_account:
-                trader_quote_account = Account(discord_id=discord_id, currency_id=quote_currency_id,
-                                               balance=Decimal("0.00"))
-                session.add(trader_quote_account)
-
-            await session.commit()
+            accounts = {(account.discord_id, account.currency_id): account for account in result.scalars()}
+            trader_base_account = accounts.get((discord_id, base_currency_id))
+            trader_quote_account = accounts.get((discord_id, quote_currency_id))
 
             # Check if accounts are disabled:
-            if trader_base_account.is_disabled or trader_quote_account.is_disabled:
+            if (trader_base_account and trader_base_account.is_disabled) or \
+                    (trader_quote_account and trader_quote_account.is_disabled):
                 return 4
 
-            # Verify balance before processing
-            if trade_type == TradeType.SELL:
-                if trader_base_account.balance < amount:
-                    return 3  # Insufficient base currency balance
-            elif trade_type == TradeType.BUY:
-                if trader_quote_account.balance < amount * price:
-                    return 3  # Insufficient quote currency balance
-
-            # Process trades in batches
-            while remaining_amount > 0:
-                matching_trades_result = await session.execute(
-                    select(
-                        TradeList.trade_id,
-                        TradeList.amount,
-                        TradeList.price_offered,
-                        TradeList.discord_id
-                    )
-                    .where(
-                        TradeList.discord_id != discord_id,
-                        TradeList.base_currency_id == base_currency_id,
-                        TradeList.quote_currency_id == quote_currency_id,
-                        TradeList.type == opposite_trade_type,
-                        (
-                            TradeList.price_offered >= price if trade_type == TradeType.SELL else TradeList.price_offered <= price
-                        ),
-                        TradeList.status == TradeStatus.OPEN
-                    )
-                    .order_by(
-                        TradeList.price_offered.asc() if trade_type == TradeType.SELL else TradeList.price_offered.desc(),
-                        TradeList.created_at
-                    )
-                    .limit(10)
-                )
-                matching_trades = matching_trades_result.mappings().all()
-
-                if not matching_trades:
-                    break
-
-                updates = []
-                for trade in matching_trades:
-                    if remaining_amount <= 0:
-                        break
-
-                    trade_id = trade["trade_id"]
-                    trade_amount = trade["amount"]
-                    counterparty_id = trade["discord_id"]
-                    counterparty_price = trade["price_offered"]
-
-                    # Fetch counterparty accounts
-                    counterparty_base_account = await session.execute(
-                        select(Account).where(Account.discord_id == counterparty_id,
-                                              Account.currency_id == base_currency_id)
+            # Match against the in-memory book; nothing is applied to it until the fills are persisted
+            fills, remaining_amount = order_book.match(discord_id, trade_type, price, amount)
+
+            if not rests:
+                if not fills or (time_in_force == TimeInForce.FOK and remaining_amount > 0):
+                    return 5
+                # Orders that never rest only need to cover what they actually execute
+                amount = amount - remaining_amount
+                required = sum(fill.quantity * fill.price for fill in fills)
+            else:
+                required = amount * price
+
+            # Reserve the funds the order needs; the conditional UPDATE is the balance check
+            reserve_account = trader_base_account if trade_type == TradeType.SELL else trader_quote_account
+            reserve_amount = amount if trade_type == TradeType.SELL else required
+            if not reserve_account or not await AccountService.hold(reserve_account.account_id, reserve_amount):
+                return 3  # Insufficient balance
+
+            new_trade = None
+            try:
+                # Fetch every counterparty account in one query
+                counterparty_ids = {fill.order.discord_id for fill in fills}
+                if counterparty_ids:
+                    result = await session.execute(
+                        select(Account).where(
+                            Account.discord_id.in_(counterparty_ids),
+                            Account.currency_id.in_([base_currency_id, quote_currency_id]),
+                        )
                     )
-                    counterparty_base_account = counterparty_base_account.scalars().first()
-
-                    counterparty_quote_account = await session.execute(
-                        select(Account).where(Account.discord_id == counterparty_id,
-                                              Account.currency_id == quote_currency_id)
+                    accounts.update({(account.discord_id, account.currency_id): account for account in result.scalars()})
+
+                # Ensure accounts exist
+                for trader_id in counterparty_ids | {discord_id}:
+                    for currency_id in (base_currency_id, quote_currency_id):
+                        if (trader_id, currency_id) not in accounts:
+                            account = Account(discord_id=trader_id, currency_id=currency_id, balance=Decimal("0.00"))
+                            session.add(account)
+                            accounts[(trader_id, currency_id)] = account
+                await session.flush()
+
+                # If there is any remaining amount on a resting order, create a new trade
+                if remaining_amount > 0 and rests:
+                    new_trade = TradeList(
+                        discord_id=discord_id,
+                        base_currency_id=base_currency_id,
+                        quote_currency_id=quote_currency_id,
+                        type=trade_type,
+                        price_offered=price,
+                        amount=remaining_amount,
+                        order_type=OrderType.LIMIT,
+                        status=TradeStatus.OPEN
                     )
-                    counterparty_quote_account = counterparty_quote_account.scalars().first()
-
-                    # Ensure accounts exist
-                    if not counterparty_base_account:
-                        counterparty_base_account = Account(discord_id=counterparty_id, currency_id=base_currency_id,
-                                                            balance=Decimal("0.00"))
-                        session.add(counterparty_base_account)
-
-                    if not counterparty_quote_account:
-                        counterparty_quote_account = Account(discord_id=counterparty_id, currency_id=quote_currency_id,
-                                                             balance=Decimal("0.00"))
-                        session.add(counterparty_quote_account)
-
-                    await session.commit()
-
-                    if trade_amount <= remaining_amount:
-                        # Fully consume this trade
-                        remaining_amount -= trade_amount
-                        updates.append({
-                            "trade_id": trade_id,
-                            "new_amount": Decimal("0"),
-                            "status": TradeStatus.CLOSED
-                        })
-
-                        # Update balances
-                        if trade_type == TradeType.SELL:
-                            trader_base_account.balance -= trade_amount
-                            trader_quote_account.balance += trade_amount * trade["price_offered"]
-                            counterparty_base_account.balance += trade_amount
-                            counterparty_quote_account.balance -= trade_amount * trade["price_offered"]
-                        else:
-                            trader_base_account.balance += trade_amount
-                            trader_quote_account.balance -= trade_amount * trade["price_offered"]
-                            counterparty_base_account.balance -= trade_amount
-                            counterparty_quote_account.balance += trade_amount * trade["price_offered"]
-
-                        # Log the price
-                        await TradeLogService.create_trade_log(base_currency_id, quote_currency_id, counterparty_price)
-
-                    else:
-                        # Partially consume this trade
-                        updates.append({
-                            "trade_id": trade_id,
-                            "new_amount": trade_amount - remaining_amount,
-                            "status": TradeStatus.OPEN
-                        })
-
-                        # Update balances
-                        if trade_type == TradeType.SELL:
-                            trader_base_account.balance -= remaining_amount
-                            trader_quote_account.balance += remaining_amount * trade["price_offered"]
-                            counterparty_base_account.balance += remaining_amount
-                            counterparty_quote_account.balance -= remaining_amount * trade["price_offered"]
-                        else:
-                            trader_base_account.balance += remaining_amount
-                            trader_quote_account.balance -= remaining_amount * trade["price_offered"]
-                            counterparty_base_account.balance -= remaining_amount
-                            counterparty_quote_account.balance += remaining_amount * trade["price_offered"]
-
-                        remaining_amount = Decimal("0")
-
-                        # Log the price
-                        await TradeLogService.create_trade_log(base_currency_id, quote_currency_id, counterparty_price)
-
-                # Batch update trades in the database
-                for update_data in updates:
-                    stmt = (
-                        update(TradeList)
-                        .where(TradeList.trade_id == update_data["trade_id"])
-                        .values(
-                            amount=update_data["new_amount"],
-                            status=update_data["status"],
-                            updated_at=func.now()
-                        )
+                    session.add(new_trade)
+                    await session.flush()
+
+                if fills:
+                    executed_at = await TradeService._persist_fills(
+                        discord_id, base_currency_id, quote_currency_id, trade_type, fills, accounts,
+                        taker_trade_id=new_trade.trade_id if new_trade is not None else None,
+                        reserved_price=price if rests else None
                     )
 
-                    await session.execute(stmt)
-
                 await session.commit()
+            except Exception:
+                await session.rollback()
+                OrderBookService.discard_order_book(base_currency_id, quote_currency_id)
+                raise
 
-            # If there is any remaining amount, create a new trade
-            if remaining_amount > 0:
-                new_trade = TradeList(
-                    discord_id=discord_id,
-                    base_currency_id=base_currency_id,
-                    quote_currency_id=quote_currency_id,
-                    type=trade_type,
-                    price_offered=price,
-                    amount=remaining_amount,
-                    order_type=OrderType.LIMIT,
-                    status=TradeStatus.OPEN
-                )
-                session.add(new_trade)
-                await session.commit()
-                return 2  # Trade partially fulfilled and listed
+            order_book.apply(fills)
+            if new_trade is not None:
+                order_book.add(RestingOrder.from_trade(new_trade))
+            if fills:
+                trades = [(fill.price, fill.quantity, executed_at) for fill in fills]
+                MarketStatsService.record_trades(base_currency_id, quote_currency_id, trades)
+                IndicatorService.record_trades(base_currency_id, quote_currency_id, trades)
+
+        if new_trade is not None:
+            return 2  # Trade partially fulfilled and listed
+        if remaining_amount > 0:
+            return 6  # Trade partially fulfilled, remainder canceled
 
-            return 1  # Trade fully fulfilled
+        return 1  # Trade fully fulfilled
 
     @staticmethod
-    async def peer_trade(
-        base_currency_id: int,
-        quote_currency_id: int,
-        sender_discord_id: int,
-        receiver_discord_id: int,
-        sender_amount: Decimal,
-        receiver_amount: Decimal
-    ):
+    async def _persist_fills(discord_id: int, base_currency_id: int, quote_currency_id: int,
+                             trade_type: TradeType, fills: list[Fill], accounts: dict,
+                             taker_trade_id: int | None = None, reserved_price: Decimal | None = None) -> datetime:
         """
-        Handles a peer-to-peer trade between two users.
+        Writes every fill of one incoming order with a constant number of statements:
+        one executemany UPDATE of the consumed trades, one executemany INSERT of the fill records,
+        one multi-row INSERT of the trade logs, one upsert of the candles
+        and one executemany UPDATE of the balances.
+
+        Both sides pay out of their held balance, which was reserved when their orders were placed,
+        and are credited to their available balance.
 
         Args:
-            base_currency_id (int): ID of the base currency being traded.
-            quote_currency_id (int): ID of the quote currency being traded.
-            sender_discord_id (int): Discord ID of the sender.
-            receiver_discord_id (int): Discord ID of the receiver.
-            sender_amount (Decimal): Amount of the base currency the sender is offering.
-            receiver_amount (Decimal): Amount of the quote currency the receiver is offering.
+            discord_id (int): The Discord ID of the incoming trader (the taker).
+            base_currency_id (int): The base currency ID.
+            quote_currency_id (int): The quote currency ID.
+            trade_type (TradeType): Side of the incoming order.
+            fills (list[Fill]): The fills planned by the order book.
+            accounts (dict): Account objects of every party keyed by (discord_id, currency_id).
+            taker_trade_id (int | None): The trade ID of the taker's resting remainder, if any.
+            reserved_price (Decimal | None): Price at which a BUY taker reserved its quote currency.
+                                             Any price improvement is returned to its available balance.
+                                             None if the taker reserved the exact cost of the fills.
 
         Returns:
-            Union[int, TradeList]:
-                - TradeList: The created TradeList object if the trade succeeds.
-                - int: Error codes for failures.
-
-        Error Codes:
-            1: One or both currencies do not exist.
-            2: Sender does not have sufficient balance.
-            3: Receiver's account does not exist.
-            4: Unexpected error during trade.
+            datetime: The execution time recorded for the fills.
         """
+        executed_at = datetime.now(timezone.utc)
+        deltas = defaultdict(Decimal)
+        held_deltas = defaultdict(Decimal)
+
+        for fill in fills:
+            total = fill.quantity * fill.price
+            maker_id = fill.order.discord_id
+            if trade_type == TradeType.BUY:
+                reserved_total = fill.quantity * (reserved_price if reserved_price is not None else fill.price)
+                held_deltas[accounts[(discord_id, quote_currency_id)].account_id] -= reserved_total
+                deltas[accounts[(discord_id, quote_currency_id)].account_id] += reserved_total - total
+                deltas[accounts[(discord_id, base_currency_id)].account_id] += fill.quantity
+                held_deltas[accounts[(maker_id, base_currency_id)].account_id] -= fill.quantity
+                deltas[accounts[(maker_id, quote_currency_id)].account_id] += total
+            else:
+                held_deltas[accounts[(discord_id, base_currency_id)].account_id] -= fill.quantity
+                deltas[accounts[(discord_id, quote_currency_id)].account_id] += total
+                held_deltas[accounts[(maker_id, quote_currency_id)].account_id] -= total
+                deltas[accounts[(maker_id, base_currency_id)].account_id] += fill.quantity
+
         async with get_session() as session:
-            try:
-                # Validate currencies
-                currencies = await session.execute(
-                    select(Currency).where(Currency.currency_id.in_([base_currency_id, quote_currency_id]))
-                )
-                currencies = currencies.scalars().all()
-                if len(currencies) != 2:
-                    return 1  # Error Code: 1
-
-                # Validate sender's account and balance
-                sender_account = await session.execute(
-                    select(Account).where(
-                        Account.discord_id == sender_discord_id,
-                        Account.currency_id == base_currency_id
-                    )
-                )
-                sender_account = sender_account.scalar_one_or_none()
-                if not sender_account or sender_account.balance < sender_amount:
-                    return 2  # Error Code: 2
-
-                # Validate receiver's account
-                receiver_account = await session.execute(
-                    select(Account).where(
-                        Account.discord_id == receiver_discord_id,
-                        Account.currency_id == quote_currency_id
-                    )
-                )
-                receiver_account = receiver_account.scalar_one_or_none()
-                if not receiver_account:
-                    return 3  # Error Code: 3
-
-                # Perform balance updates
-                sender_account.balance -= sender_amount
-                receiver_account.balance += receiver_amount
-
-                # Create trade record
-                trade = TradeList(
-                    discord_id=sender_discord_id,
-                    recipient_discord_id=receiver_discord_id,
-                    base_currency_id=base_currency_id,
-                    quote_currency_id=quote_currency_id,
-                    type=TradeType.SELL,
-                    price_offered=receiver_amount / sender_amount,  # Implied price
-                    amount=sender_amount,
-                    order_type=OrderType.P2P,
-                    status=TradeStatus.CLOSED,
-                    created_at=datetime.utcnow(),
-                    executed_at=datetime.utcnow(),
-                    executed_price=receiver_amount / sender_amount,
-                )
-                session.add(trade)
+            # Batch update the consumed trades by primary key
+            await session.execute(
+                update(TradeList),
+                [
+                    {
+                        "trade_id": fill.order.trade_id,
+                        "amount": fill.remaining,
+                        "status": TradeStatus.OPEN if fill.remaining > 0 else TradeStatus.CLOSED,
+                    }
+                    for fill in fills
+                ]
+            )
 
-                # Commit the transaction
-                await session.commit()
+            await TradeFillService.create_trade_fills([
+                {
+                    "maker_trade_id": fill.order.trade_id,
+                    "taker_trade_id": taker_trade_id,
+                    "maker_discord_id": fill.order.discord_id,
+                    "taker_discord_id": discord_id,
+                    "base_currency_id": base_currency_id,
+                    "quote_currency_id": quote_currency_id,
+                    "taker_side": trade_type,
+                    "price": fill.price,
+                    "quantity": fill.quantity,
+                    "executed_at": executed_at,
+                }
+                for fill in fills
+            ])
+
+            # Log the prices
+            await TradeLogService.create_trade_logs(
+                base_currency_id, quote_currency_id, [fill.price for fill in fills], date_traded=executed_at,
+                quantities=[fill.quantity for fill in fills]
+            )
 
-                return trade  # Return the created trade object
-            except Exception as e:
-                await session.rollback()
-                print(f"Unexpected error during trade: {e}")  # Replace with proper logging
-                return 4  # Error Code: 4
\ No newline at end of file
+            await AccountService.adjust_balances(deltas, held_deltas)
+            await session.commit()
+            return executed_at
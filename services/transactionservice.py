@@ -1,9 +1,11 @@
 from models.transaction import Transaction
 from models.account import Account
+from models.currency import Currency
 from db import get_session
+from services.pagination import Page, KeysetPaginator
 from sqlalchemy.future import select
-from sqlalchemy import func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload, aliased
 
 from services.accountservice import AccountService
 
@@ -53,37 +55,39 @@ class TransactionService:
             return transaction
 
     @staticmethod
-    async def get_transactions_by_account(account_id: int, page: int = 1, limit: int = 10, recent: bool = True):
+    async def get_transactions_by_account(account_id: int, limit: int = 10, recent: bool = True,
+                                          after: tuple | None = None, before: tuple | None = None,
+                                          last: bool = False, with_total: bool = False) -> Page:
         """
-        Retrieves transactions for a specific account with pagination, sorted by date.
+        Retrieves a page of the transactions of an account, by keyset pagination on the date.
 
         Args:
             account_id (int): The account ID to retrieve transactions for.
-            page (int, optional): The page number for pagination (default is 1).
             limit (int, optional): The number of transactions per page (default is 10).
             recent (bool, optional): Whether to sort by the most recent transactions first (default is True).
+            after (tuple, optional): Page.next_cursor of the current page, to get the next one.
+            before (tuple, optional): Page.previous_cursor of the current page, to get the previous one.
+            last (bool, optional): Fetch the last page instead (default is False).
+            with_total (bool, optional): Whether to count the matching transactions (default is False).
 
         Returns:
-            list: A list of Transaction objects for the given account and pagination.
+            Page: The Transaction objects of the page.
         """
         async with get_session() as session:
-            offset = (page - 1) * limit
-
-            # Determine the sorting order based on the 'recent' flag
-            order_by_clause = Transaction.transaction_date.desc() if recent else Transaction.transaction_date.asc()
-
-            # Execute the query with filtering, pagination, and sorting
-            result = await session.execute(
-                select(Transaction)
-                .filter(
+            return await KeysetPaginator.fetch_page(
+                session,
+                select(Transaction).filter(
                     (Transaction.sender_account_id == account_id) |
                     (Transaction.receiver_account_id == account_id)
-                )
-                .order_by(order_by_clause)
-                .offset(offset)
-                .limit(limit)
+                ),
+                [Transaction.transaction_date, Transaction.uuid],
+                limit=limit,
+                descending=recent,
+                after=after,
+                before=before,
+                last=last,
+                with_total=with_total,
             )
-            return result.scalars().all()
 
     @staticmethod
     async def delete_transaction(transaction_uuid: str):
@@ -107,62 +111,83 @@ class TransactionService:
                 return False
 
     @staticmethod
-    async def get_all_transactions(discord_id: int, page: int = 1, limit: int = 10, recent: bool = True):
+    async def get_all_transactions(discord_id: int, limit: int = 10, recent: bool = True,
+                                   after: tuple | None = None, before: tuple | None = None,
+                                   last: bool = False, with_total: bool = False) -> Page:
         """
-        Retrieves all transactions for a specific user (either as sender or receiver) with pagination, sorted by date.
+        Retrieves a page of the transactions of a user (either as sender or receiver),
+        by keyset pagination on the date.
 
         Args:
             discord_id (int): The Discord ID of the user to filter transactions.
-            page (int, optional): The page number for pagination (default is 1).
             limit (int, optional): The number of transactions per page (default is 10).
             recent (bool, optional): Whether to sort by the most recent transactions first (default is True).
+            after (tuple, optional): Page.next_cursor of the current page, to get the next one.
+            before (tuple, optional): Page.previous_cursor of the current page, to get the previous one.
+            last (bool, optional): Fetch the last page instead (default is False).
+            with_total (bool, optional): Whether to count the matching transactions (default is False).
 
         Returns:
-            list: A list of Transaction objects for the given page and limit.
+            Page: The Transaction objects of the page, with their sender and receiver loaded.
         """
-        async with get_session() as session:
-            offset = (page - 1) * limit
-
-            # Determine the sorting order based on the 'recent' flag
-            order_by_clause = Transaction.transaction_date.desc() if recent else Transaction.transaction_date.asc()
+        # Accounts of the user, matched on either side of the transaction
+        account_ids = select(Account.account_id).where(Account.discord_id == discord_id)
 
-            # Join with the Account table to filter by discord_id
-            result = await session.execute(
+        async with get_session() as session:
+            return await KeysetPaginator.fetch_page(
+                session,
                 select(Transaction)
                 .options(selectinload(Transaction.sender),
                          selectinload(Transaction.receiver))  # Eager load related Account objects
-                .join(Account, or_(Transaction.sender_account_id == Account.account_id,
-                                   Transaction.receiver_account_id == Account.account_id))
-                .where(Account.discord_id == discord_id)  # Filter by discord_id
-                .order_by(order_by_clause)
-                .offset(offset)
-                .limit(limit)
+                .where(or_(Transaction.sender_account_id.in_(account_ids),
+                           Transaction.receiver_account_id.in_(account_ids))),
+                [Transaction.transaction_date, Transaction.uuid],
+                limit=limit,
+                descending=recent,
+                after=after,
+                before=before,
+                last=last,
+                with_total=with_total,
             )
 
-            # Return the list of transaction objects
-            return result.scalars().all()
-
     @staticmethod
-    async def get_total_pages(discord_id: int, limit: int = 10) -> int:
+    async def get_transaction_rows(discord_id: int, limit: int = 10, recent: bool = True,
+                                   after: tuple | None = None, before: tuple | None = None,
+                                   last: bool = False, with_total: bool = False) -> Page:
         """
-        Get the total number of pages of transactions for a user.
-
-        Args:
-            discord_id (int): The Discord ID of the user.
-            limit (int): Number of transactions per page.
+        Same as get_all_transactions, as display rows with the currency ticker and both Discord IDs
+        joined in, so a page is a single query however many accounts it shows.
 
         Returns:
-            int: Total number of pages.
+            Page: Rows of (uuid, transaction_date, amount, ticker, sender_discord_id, receiver_discord_id).
         """
+        sender_alias = aliased(Account)
+        receiver_alias = aliased(Account)
+        # Accounts of the user, matched on either side of the transaction
+        account_ids = select(Account.account_id).where(Account.discord_id == discord_id)
+
         async with get_session() as session:
-            # Join with the Account table to filter by discord_id
-            result = await session.execute(
-                select(func.count(Transaction.uuid))  # Count the total number of transactions
-                .join(Account, or_(Transaction.sender_account_id == Account.account_id,
-                                   Transaction.receiver_account_id == Account.account_id))
-                .where(Account.discord_id == discord_id)  # Filter by discord_id
+            return await KeysetPaginator.fetch_page(
+                session,
+                select(
+                    Transaction.uuid,
+                    Transaction.transaction_date,
+                    Transaction.amount,
+                    Currency.ticker,
+                    sender_alias.discord_id.label("sender_discord_id"),
+                    receiver_alias.discord_id.label("receiver_discord_id"),
+                )
+                .join(sender_alias, Transaction.sender_account_id == sender_alias.account_id)
+                .join(receiver_alias, Transaction.receiver_account_id == receiver_alias.account_id)
+                .join(Currency, sender_alias.currency_id == Currency.currency_id)
+                .where(or_(Transaction.sender_account_id.in_(account_ids),
+                           Transaction.receiver_account_id.in_(account_ids))),
+                [Transaction.transaction_date, Transaction.uuid],
+                limit=limit,
+                descending=recent,
+                after=after,
+                before=before,
+                last=last,
+                scalars=False,
+                with_total=with_total,
             )
-
-            # Calculate total pages
-            total_transactions = result.scalar() or 0
-            return (total_transactions + limit - 1) // limit  # Round up to the next whole page
@@ -0,0 +1,60 @@
+"""
+Accuracy check for the streamed rolling standard deviation behind the Bollinger bands.
+
+Feeds RollingStd prices that jump between magnitudes with flat stretches in between and
+compares every value with the exact sample standard deviation of its window. Fails if a flat
+window is not exactly 0 or any value is off by more than rounding:
+
+    PYTHONPATH=. python test/indicator_check.py
+"""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import math
+import random
+import statistics
+from services.indicators import RollingStd
+
+WINDOW = 20
+RELATIVE_TOLERANCE = 1e-12
+
+
+def get_prices(seed: int = 1) -> list[float]:
+    rand = random.Random(seed)
+    return (
+        [rand.uniform(1e4, 1e6) for _ in range(500)]
+        + [12345.678] * 40  # Flat after large swings
+        + [rand.uniform(0.01, 2) for _ in range(200)]  # Small prices after large ones
+        + [0.1] * 25  # Flat at a price with no exact binary form
+        + [0.1 + 1e-9 * i for i in range(30)]  # Barely moving
+    )
+
+
+def main(seed: int = 1):
+    prices = get_prices(seed)
+    rolling_std = RollingStd(WINDOW)
+    worst = 0.0
+    for i, price in enumerate(prices):
+        peeked = rolling_std.peek(price)
+        value = rolling_std.update(price)
+        assert value == peeked or math.isnan(value) and math.isnan(peeked), (i, value, peeked)
+
+        if i + 1 < WINDOW:
+            assert math.isnan(value), (i, value)
+            continue
+        window = prices[i + 1 - WINDOW:i + 1]
+        if len(set(window)) == 1:
+            assert value == 0.0, (i, value)
+            continue
+        expected = statistics.stdev(window)  # Computed with exact fractions
+        error = abs(value - expected) / expected
+        assert error <= RELATIVE_TOLERANCE, (i, value, expected)
+        worst = max(worst, error)
+
+    print(f"{len(prices)} prices, flat windows exactly 0, worst relative error {worst:.1e}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,162 @@
+"""
+Read benchmark for the per pair trade log queries on a large trade_log table.
+
+Fills trade_log with synthetic trades spread over a year and many pairs, checks that the
+last price and time window queries use `idx_trade_log_pair_date`, then times them:
+    - last price: the latest trade log of a random pair,
+    - window: the trade logs of the last hour of a random pair.
+
+Uses the database in DATABASE_URL (create the schema with create_tables.py or Alembic first),
+or a SQLite file when DATABASE_URL is not set. The rows are kept between runs, so only the
+first run pays for the inserts:
+
+    PYTHONPATH=. python test/trade_log_benchmark.py [rows] [pairs] [reads]
+"""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///trade_log_benchmark.db")
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import insert, func, text
+from sqlalchemy.future import select
+from db import engine, get_session
+from models import Base, TradeLog, Currency
+from models.boatauthlist import BoatAuthList  # noqa: F401 - not exported by models, needed by Currency
+from services.tradelogservice import TradeLogService
+
+INDEX_NAME = "idx_trade_log_pair_date"
+INSERT_BATCH_SIZE = 50_000
+START_DATE = datetime(2025, 1, 1)
+TRADED_PERIOD = timedelta(days=365)
+WINDOW = timedelta(hours=1)
+
+
+async def setup(row_count: int, pair_count: int) -> list[tuple[int, int]]:
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async with get_session() as session:
+        tickers = [f"TLB{i}" for i in range(pair_count + 1)]
+        existing = set((await session.execute(select(Currency.ticker).where(Currency.ticker.in_(tickers)))).scalars())
+        session.add_all(Currency(name=f"Benchmark {ticker}", ticker=ticker) for ticker in tickers if ticker not in existing)
+        await session.commit()
+
+        currency_ids = dict((await session.execute(
+            select(Currency.ticker, Currency.currency_id).where(Currency.ticker.in_(tickers))
+        )).all())
+        base_currency_id = currency_ids[tickers[0]]
+        pairs = [(base_currency_id, currency_ids[ticker]) for ticker in tickers[1:]]
+
+        logged = (await session.execute(
+            select(func.count()).select_from(TradeLog).where(TradeLog.base_currency_id == base_currency_id)
+        )).scalar()
+        if logged >= row_count:
+            print(f"Reusing {logged:,} trade logs")
+            return pairs
+
+    # Trades arrive in date order across all pairs, like they would in production
+    step = TRADED_PERIOD / row_count
+    start = time.perf_counter()
+    for offset in range(logged, row_count, INSERT_BATCH_SIZE):
+        async with get_session() as session:
+            await session.execute(
+                insert(TradeLog),
+                [
+                    {
+                        "base_currency_id": pairs[i % pair_count][0],
+                        "quote_currency_id": pairs[i % pair_count][1],
+                        "price": Decimal(random.randint(1_000, 100_000)) / 100,
+                        "quantity": Decimal(random.randint(1, 10_000)) / 100,
+                        "date_traded": START_DATE + step * i,
+                    }
+                    for i in range(offset, min(offset + INSERT_BATCH_SIZE, row_count))
+                ]
+            )
+            await session.commit()
+        print(f"\rInserted {min(offset + INSERT_BATCH_SIZE, row_count):,} trade logs", end="", flush=True)
+    print(f" in {time.perf_counter() - start:.0f}s")
+
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as connection:
+            await connection.execute(text("ANALYZE"))
+    return pairs
+
+
+async def check_plans(pair: tuple[int, int]) -> None:
+    queries = {
+        "last price": TradeLogService.pair_range_query(*pair).limit(1),
+        "window": TradeLogService.pair_range_query(*pair, since=START_DATE + TRADED_PERIOD - WINDOW),
+    }
+    async with engine.connect() as connection:
+        for name, query in queries.items():
+            sql = str(query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+            if connection.dialect.name == "sqlite":
+                rows = (await connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+                plan = " | ".join(row.detail for row in rows)
+                assert INDEX_NAME in plan and "TEMP B-TREE" not in plan, plan
+            else:
+                rows = (await connection.execute(text(f"EXPLAIN {sql}"))).mappings().all()
+                plan = " | ".join(f"type={row['type']} key={row['key']} extra={row['Extra']}" for row in rows)
+                assert rows[0]["key"] == INDEX_NAME and "filesort" not in (rows[0]["Extra"] or ""), plan
+            print(f"{name} plan: {plan}")
+
+
+async def measure(name: str, read, pairs: list[tuple[int, int]], reads: int) -> float:
+    timings = []
+    for _ in range(reads):
+        pair = random.choice(pairs)
+        start = time.perf_counter()
+        await read(*pair)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    median = statistics.median(timings)
+    print(f"{name}: median {median:.3f}ms, p99 {timings[int(len(timings) * 0.99) - 1]:.3f}ms over {reads} reads")
+    return median
+
+
+async def main(row_count: int, pair_count: int, reads: int):
+    try:
+        pairs = await setup(row_count, pair_count)
+        await check_plans(pairs[0])
+        since = START_DATE + TRADED_PERIOD - WINDOW
+
+        async with engine.connect() as connection:
+            async def last_price(base_currency_id, quote_currency_id):
+                query = TradeLogService.pair_range_query(base_currency_id, quote_currency_id, TradeLog.price).limit(1)
+                return (await connection.execute(query)).scalar()
+
+            async def window(base_currency_id, quote_currency_id):
+                query = TradeLogService.pair_range_query(base_currency_id, quote_currency_id, TradeLog.price, since=since)
+                return (await connection.execute(query)).all()
+
+            # Statement round trips on one connection, what the index is responsible for
+            last_price_median = await measure("last price query", last_price, pairs, reads)
+            window_median = await measure("1h window query", window, pairs, reads)
+
+        # The same reads through the service layer, including session and ORM overhead
+        await measure("TradeLogService.get_last_trade_log", TradeLogService.get_last_trade_log, pairs, reads)
+        await measure(
+            "TradeLogService.get_trade_logs_by_currency_pair (1h)",
+            lambda base, quote: TradeLogService.get_trade_logs_by_currency_pair(base, quote, WINDOW),
+            pairs, reads
+        )
+
+        assert last_price_median < 1, f"Last price reads are not sub-millisecond: {last_price_median:.3f}ms"
+        assert window_median < 1, f"Window reads are not sub-millisecond: {window_median:.3f}ms"
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 1000,
+    ))
@@ -0,0 +1,124 @@
+"""
+Concurrency benchmark for AccountService.transfer.
+
+Fires many transfers in parallel between a small set of accounts, with amounts chosen so
+that most senders would be overdrawn if balance checks raced, then verifies that:
+    - no balance went negative,
+    - the total supply is unchanged,
+    - every balance equals its opening balance plus the transaction records touching it.
+
+Uses the database in DATABASE_URL (create the schema with create_tables.py or Alembic first),
+or a throwaway SQLite file when DATABASE_URL is not set:
+
+    PYTHONPATH=. python test/transfer_benchmark.py [transfers] [accounts]
+"""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///transfer_benchmark.db")
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import delete
+from sqlalchemy.future import select
+from db import engine, get_session
+from models import Base, Account, Transaction, Currency
+from models.boatauthlist import BoatAuthList  # noqa: F401 - not exported by models, needed by Currency
+from services.accountservice import AccountService
+
+BENCHMARK_DISCORD_ID = 900_000_000_000_000_000  # Far away from real Discord IDs
+OPENING_BALANCE = Decimal("100.00")
+
+
+async def setup(account_count: int) -> tuple[int, list[int]]:
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    discord_ids = [BENCHMARK_DISCORD_ID + i for i in range(account_count)]
+    async with get_session() as session:
+        currency = (await session.execute(select(Currency).where(Currency.ticker == "BNCH"))).scalars().first()
+        if currency is None:
+            currency = Currency(name="Benchmark", ticker="BNCH")
+            session.add(currency)
+            await session.flush()
+
+        # Start from a clean slate for the benchmark accounts
+        old_ids = select(Account.account_id).where(Account.currency_id == currency.currency_id)
+        await session.execute(delete(Transaction).where(Transaction.sender_account_id.in_(old_ids)))
+        await session.execute(delete(Account).where(Account.currency_id == currency.currency_id))
+        session.add_all(
+            Account(discord_id=discord_id, currency_id=currency.currency_id, balance=OPENING_BALANCE)
+            for discord_id in discord_ids
+        )
+        await session.commit()
+        return currency.currency_id, discord_ids
+
+
+async def verify(currency_id: int, account_count: int) -> None:
+    async with get_session() as session:
+        accounts = (await session.execute(
+            select(Account).where(Account.currency_id == currency_id)
+        )).scalars().all()
+        account_ids = [account.account_id for account in accounts]
+        transactions = (await session.execute(
+            select(Transaction).where(Transaction.sender_account_id.in_(account_ids))
+        )).scalars().all()
+
+    expected = defaultdict(lambda: OPENING_BALANCE)
+    for transaction in transactions:
+        expected[transaction.sender_account_id] -= transaction.amount
+        expected[transaction.receiver_account_id] += transaction.amount
+
+    negative = [account for account in accounts if account.balance < 0]
+    assert not negative, f"Overdrawn accounts: {[(a.account_id, a.balance) for a in negative]}"
+    total = sum(account.balance for account in accounts)
+    assert total == OPENING_BALANCE * account_count, f"Supply changed: {total}"
+    for account in accounts:
+        assert account.balance == expected[account.account_id], \
+            f"Account {account.account_id}: {account.balance} != {expected[account.account_id]}"
+
+    print(f"Verified {len(accounts)} accounts and {len(transactions)} transactions: no overdraft, supply intact")
+
+
+async def main(transfer_count: int, account_count: int):
+    try:
+        currency_id, discord_ids = await setup(account_count)
+
+        # Amounts large enough that a sender can only afford a few of the transfers aimed at it
+        transfers = []
+        for _ in range(transfer_count):
+            sender, receiver = random.sample(discord_ids, 2)
+            transfers.append((sender, receiver, Decimal(random.randint(1, 60))))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(AccountService.transfer(sender, receiver, currency_id, amount) for sender, receiver, amount in transfers),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+
+        succeeded = sum(isinstance(result, Transaction) for result in results)
+        insufficient = sum(result == -4 for result in results if not isinstance(result, (Transaction, Exception)))
+        errors = [result for result in results if isinstance(result, Exception)]
+        print(
+            f"{transfer_count} transfers in {elapsed:.2f}s ({transfer_count / elapsed:.0f}/s): "
+            f"{succeeded} succeeded, {insufficient} insufficient balance, {len(errors)} errors"
+        )
+        for error in errors[:5]:
+            print(f"  {type(error).__name__}: {error}")
+
+        await verify(currency_id, account_count)
+        assert not errors, "Some transfers failed with an exception"
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    ))
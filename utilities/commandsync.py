@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+from discord.ext import commands
+
+# Where the hash of the last synced command tree is kept, next to the bot
+COMMAND_TREE_HASH_FILE = os.getenv("COMMAND_TREE_HASH_FILE", ".command_tree_hash")
+
+
+class CommandTreeSync:
+    """
+    Syncs the global slash commands with Discord only when they changed since the last sync.
+
+    Syncing is rate limited and slow, so instead of syncing on every start the payload
+    the sync would upload is hashed and compared with the hash stored after the last
+    successful sync. Delete the hash file to force a sync.
+    """
+
+    @staticmethod
+    async def get_tree_hash(bot: commands.Bot) -> str:
+        """
+        Hashes the global command tree exactly as CommandTree.sync would upload it,
+        along with the application it belongs to.
+
+        Args:
+            bot (commands.Bot): The bot, with every cog loaded.
+
+        Returns:
+            str: The SHA-256 hex digest of the payload.
+        """
+        tree = bot.tree
+        if tree.translator:
+            payload = [await command.get_translated_payload(tree, tree.translator) for command in tree.get_commands()]
+        else:
+            payload = [command.to_dict(tree) for command in tree.get_commands()]
+        payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+        serialized = json.dumps(
+            {"application_id": bot.application_id, "commands": payload},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    @staticmethod
+    def read_hash() -> str | None:
+        try:
+            with open(COMMAND_TREE_HASH_FILE) as file:
+                return file.read().strip()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def write_hash(tree_hash: str) -> None:
+        with open(COMMAND_TREE_HASH_FILE, "w") as file:
+            file.write(tree_hash)
+
+    @staticmethod
+    async def sync_if_changed(bot: commands.Bot) -> bool:
+        """
+        Syncs the global command tree if it differs from the last synced one.
+
+        Args:
+            bot (commands.Bot): The bot, logged in and with every cog loaded.
+
+        Returns:
+            bool: True if the commands were synced, False if they were already up to date.
+        """
+        tree_hash = await CommandTreeSync.get_tree_hash(bot)
+        if tree_hash == CommandTreeSync.read_hash():
+            return False
+        await bot.tree.sync()
+        # Only stored once Discord accepted the commands, so a failed sync is retried next start
+        CommandTreeSync.write_hash(tree_hash)
+        return True
@@ -0,0 +1,41 @@
+import time
+
+
+class StartupReport:
+    """
+    Wall-clock durations of the startup phases of the bot, measured back to back
+    from the moment this module is first imported.
+    """
+    _started = time.perf_counter()
+    _last = _started
+    _phases: dict[str, float] = {}
+
+    @staticmethod
+    def mark(phase: str) -> float:
+        """
+        Ends a phase, timed from the end of the previous one.
+
+        Args:
+            phase (str): Name of the phase that just finished.
+
+        Returns:
+            float: The duration of the phase, in seconds.
+        """
+        now = time.perf_counter()
+        StartupReport._phases[phase] = now - StartupReport._last
+        StartupReport._last = now
+        return StartupReport._phases[phase]
+
+    @staticmethod
+    def get_phases() -> dict[str, float]:
+        """
+        Returns the duration of every finished phase in order, plus their total, in seconds.
+        """
+        return {**StartupReport._phases, "total": StartupReport._last - StartupReport._started}
+
+    @staticmethod
+    def format() -> str:
+        """
+        Formats the phases as a single line, e.g. "imports 0.41s | cogs 0.12s | total 0.53s".
+        """
+        return " | ".join(f"{phase} {seconds:.2f}s" for phase, seconds in StartupReport.get_phases().items())
@@ -2,8 +2,8 @@ import discord
 from discord import Interaction
 from discord.ui import View, Button, Select
 from models.trade import TradeStatus, TradeType
-from services.currencyservice import CurrencyService
 from services.tradeservice import TradeService
+from services.pagination import Page
 from utilities.embedtable import EmbedTable
 
 
@@ -16,8 +16,7 @@ class ActiveTradeView(View):
             timeout (float): The timeout in seconds for the view.
         """
         super().__init__(timeout=timeout)
-        self.page = 1
-        self.total_pages = 0
+        self.page: Page | None = None  # Page of trades currently shown
         self.user = None
         self.trade_type = None
         self.message = None
@@ -39,42 +38,32 @@ class ActiveTradeView(View):
         Updates the navigation buttons based on the current page.
         Disables the left button on the first page and the right button on the last page.
         """
-        self.children[0].disabled = self.page == 1  # Disable the left button if on the first page
-        self.children[1].disabled = self.page == self.total_pages  # Disable the right button if on the last page
+        self.children[0].disabled = not self.page.has_previous  # Disable the left button if on the first page
+        self.children[1].disabled = not self.page.has_next  # Disable the right button if on the last page
 
-    async def trade_view(self, interaction: discord.Interaction):
+    async def trade_view(self, interaction: discord.Interaction,
+                         after: tuple | None = None, before: tuple | None = None):
         """
-        Generates and displays a table of trades for the current page.
+        Generates and displays a table of trades for the page after or before a cursor,
+        or the first page without one.
         """
-        # Get total pages for the user
-        self.total_pages = await TradeService.get_total_pages(
+        # Fetch the trades of the page; a page emptied by fills falls back to the last one
+        self.page = await TradeService.get_trade_rows(
             discord_id=self.user.id if self.filter == "user" else None,
             trade_type=self.trade_type,
             status=TradeStatus.OPEN,
-            limit=10
-        )
-        # Adjust page if it exceeds total pages
-        if self.page > self.total_pages:
-            self.page = self.total_pages
-
-
-        # Fetch trades for the current page UNNECESSARY REMOVE THIS IN THE FUTURE
-        trades = await TradeService.get_all_trades(
-            discord_id=self.user.id if self.filter == "user" else None,
-            trade_type=self.trade_type,
-            status=TradeStatus.OPEN,
-            page=self.page,
-            limit=10
+            limit=10,
+            after=after,
+            before=before,
         )
+        trades = self.page.items
 
         # Prepare data for the table
         trade_data = [["Trade ID", "Ticker Pair", "Type", "Price", "Quantity"]]
         for trade in trades:
-            base_currency = await CurrencyService.read_currency_by_id(trade.base_currency_id)
-            quote_currency = await CurrencyService.read_currency_by_id(trade.quote_currency_id)
             trade_data.append([
                 str(trade.trade_id),
-                f"{base_currency.ticker.upper()}/{quote_currency.ticker.upper()}",
+                f"{trade.base_ticker.upper()}/{trade.quote_ticker.upper()}",
                 str(trade.type.value),
                 str(trade.price_offered),
                 str(trade.amount)
@@ -94,17 +83,15 @@ class ActiveTradeView(View):
 
     @discord.ui.button(label="◀️", style=discord.ButtonStyle.gray, custom_id="left_button")
     async def left_button(self, interaction: discord.Interaction, button: Button):
-        if self.page > 1:
+        if self.page.has_previous:
             await interaction.response.defer()
-            self.page -= 1
-            await self.trade_view(interaction)
+            await self.trade_view(interaction, before=self.page.previous_cursor)
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.gray, custom_id="right_button")
     async def right_button(self, interaction: discord.Interaction, button: Button):
-        if self.page < self.total_pages:
+        if self.page.has_next:
             await interaction.response.defer()
-            self.page += 1
-            await self.trade_view(interaction)
+            await self.trade_view(interaction, after=self.page.next_cursor)
 
     @discord.ui.select(
         placeholder="Select Trade Type",
@@ -121,8 +108,7 @@ class ActiveTradeView(View):
             "sell": TradeType.SELL
         }.get(selected_trade_type, None)
         await interaction.response.defer()
-        self.page = 1  # Reset to the first page
-        await self.trade_view(interaction)
+        await self.trade_view(interaction)  # Back to the first page
 
     @discord.ui.select(
         placeholder="Filter",
@@ -138,7 +124,6 @@ class ActiveTradeView(View):
         else:
             self.filter = "all"
         await interaction.response.defer()
-        self.page = 1
         await self.trade_view(interaction)
 
     async def on_timeout(self):
@@ -1,13 +1,13 @@
 import discord
 from discord.ui import View, Button, Select
 from services.currencyservice import CurrencyService
+from services.pagination import Page
 from utilities.embedtable import EmbedTable
 
 class CurrencyListView(View):
     def __init__(self, is_disabled: bool = False, timeout: float = 180):
         super().__init__(timeout=timeout)
-        self.page = 1  # Start at page 1
-        self.total_pages = 0  # Total number of pages will be calculated dynamically
+        self.page: Page | None = None  # Page of currencies currently shown
         self.is_disabled = is_disabled  # Whether we are including disabled currencies
         self.user = None  # User associated with the view
         self.sort_order = "oldest"  # Default sorting is by oldest
@@ -28,18 +28,20 @@ class CurrencyListView(View):
         Updates the navigation buttons based on the current page.
         Disables the left button on the first page and the right button on the last page.
         """
-        self.children[0].disabled = self.page == 1  # Disable the left button if on the first page
-        self.children[1].disabled = self.page == self.total_pages  # Disable the right button if on the last page
+        self.children[0].disabled = not self.page.has_previous  # Disable the left button if on the first page
+        self.children[1].disabled = not self.page.has_next  # Disable the right button if on the last page
 
-    async def currency_view(self, interaction: discord.Interaction):
+    async def currency_view(self, interaction: discord.Interaction,
+                            after: tuple | None = None, before: tuple | None = None):
         """
-        Generates and displays a table of currencies for the current page.
+        Generates and displays a table of currencies for the page after or before a cursor,
+        or the first page without one.
         """
-
-        # Get the total number of pages for the user based on the currencies available
-        currencies, self.total_pages = await CurrencyService.get_all_currencies(
-            page=self.page, limit=10, is_disabled=self.is_disabled, sort_order=self.sort_order
+        # Fetch the currencies of the page
+        self.page = await CurrencyService.get_all_currencies(
+            limit=10, is_disabled=self.is_disabled, sort_order=self.sort_order, after=after, before=before
         )
+        currencies = self.page.items
 
         # If no currencies, show a message stating there are none
         if not currencies:
@@ -68,22 +70,20 @@ class CurrencyListView(View):
         """
         Navigate to the previous page when the left button is clicked.
         """
-        if self.page > 1:
+        if self.page.has_previous:
             # Defer the response to prevent timeout errors
             await interaction.response.defer()
-            self.page -= 1  # Decrease page number
-            await self.currency_view(interaction)  # Re-render the view with updated data
+            await self.currency_view(interaction, before=self.page.previous_cursor)  # Re-render the previous page
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.gray, custom_id="right_button")
     async def right_button(self, interaction: discord.Interaction, button: Button):
         """
         Navigate to the next page when the right button is clicked.
         """
-        if self.page < self.total_pages:
+        if self.page.has_next:
             # Defer the response to prevent timeout errors
             await interaction.response.defer()
-            self.page += 1  # Increase page number
-            await self.currency_view(interaction)  # Re-render the view with updated data
+            await self.currency_view(interaction, after=self.page.next_cursor)  # Re-render the next page
 
     @discord.ui.select(
         placeholder="Sort by",
@@ -98,8 +98,7 @@ class CurrencyListView(View):
         """
         await interaction.response.defer()
         self.sort_order = select.values[0]  # Update the sort order based on the user's selection
-        self.page = 1
-        await self.currency_view(interaction)  # Re-render the view with the new sort order
+        await self.currency_view(interaction)  # Re-render the first page with the new sort order
 
     async def on_timeout(self):
         """
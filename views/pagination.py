@@ -1,5 +1,6 @@
 import discord
 from typing import Callable, Optional
+from services.pagination import Page
 
 
 class Pagination(discord.ui.View):
@@ -8,13 +9,13 @@ class Pagination(discord.ui.View):
         Initialize the pagination view.
 
         :param interaction: The original interaction that triggered the pagination.
-        :param get_page: A callable that fetches the embed and total pages for the current index.
+        :param get_page: A coroutine function taking the `after`, `before` and `last` keyword arguments of
+                         KeysetPaginator.fetch_page, returning the embed and the Page it shows.
         """
         super().__init__(timeout=100)
         self.interaction = interaction
         self.get_page = get_page
-        self.total_pages: Optional[int] = None
-        self.current_page = 1
+        self.page: Optional[Page] = None
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """
@@ -33,9 +34,9 @@ class Pagination(discord.ui.View):
         """
         Send the initial page and setup pagination.
         """
-        embed, self.total_pages = await self.get_page(self.current_page)
+        embed, self.page = await self.get_page()
 
-        if self.total_pages == 1:
+        if not self.page.has_previous and not self.page.has_next:
             # Send a message without buttons if there's only one page
             await self.interaction.response.send_message(embed=embed)
         else:
@@ -43,11 +44,11 @@ class Pagination(discord.ui.View):
             self.update_buttons()
             await self.interaction.response.send_message(embed=embed, view=self)
 
-    async def update_page(self, interaction: discord.Interaction):
+    async def update_page(self, interaction: discord.Interaction, **cursor):
         """
-        Update the current page's embed and buttons.
+        Fetch the page at the given cursor and update the embed and buttons.
         """
-        embed, self.total_pages = await self.get_page(self.current_page)
+        embed, self.page = await self.get_page(**cursor)
         self.update_buttons()
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -55,36 +56,33 @@ class Pagination(discord.ui.View):
         """
         Enable or disable buttons based on the current page.
         """
-        self.previous_button.disabled = self.current_page == 1
-        self.next_button.disabled = self.current_page == self.total_pages
-        self.jump_button.label = "Go to Start" if self.current_page > self.total_pages // 2 else "Go to End"
+        self.previous_button.disabled = not self.page.has_previous
+        self.next_button.disabled = not self.page.has_next
+        self.jump_button.label = "Go to End" if self.page.has_next else "Go to Start"
 
     @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.blurple)
     async def previous_button(self, interaction: discord.Interaction, button: discord.Button):
         """
         Navigate to the previous page.
         """
-        self.current_page -= 1
-        await self.update_page(interaction)
+        await self.update_page(interaction, before=self.page.previous_cursor)
 
     @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.blurple)
     async def next_button(self, interaction: discord.Interaction, button: discord.Button):
         """
         Navigate to the next page.
         """
-        self.current_page += 1
-        await self.update_page(interaction)
+        await self.update_page(interaction, after=self.page.next_cursor)
 
     @discord.ui.button(label="Go to End", style=discord.ButtonStyle.blurple)
     async def jump_button(self, interaction: discord.Interaction, button: discord.Button):
         """
         Jump to the start or end of the pages.
         """
-        if self.current_page <= self.total_pages // 2:
-            self.current_page = self.total_pages
+        if self.page.has_next:
+            await self.update_page(interaction, last=True)
         else:
-            self.current_page = 1
-        await self.update_page(interaction)
+            await self.update_page(interaction)
 
     async def on_timeout(self):
         """
@@ -0,0 +1,130 @@
+import discord
+from discord.ui import View, Button, Select
+from models.currency import Currency
+from services.currencyservice import CurrencyService
+from services.tradeservice import TradeService
+from utilities.embedtable import EmbedTable
+
+
+class TradeDepthView(View):
+    def __init__(self, user: discord.User, timeout: float = 180):
+        """
+        Initializes the TradeDepthView that displays the price ladder of a pair.
+
+        Args:
+            user (discord.User): The user who opened the view.
+            timeout (float, optional): Timeout for the view. Defaults to 180.
+        """
+        super().__init__(timeout=timeout)
+        self.user = user
+        self.base_currency = None
+        self.quote_currency = None
+        self.levels = 10
+        self.message = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """
+        Ensures only the user who initiated the interaction can interact with the view.
+        """
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message(
+                "This interaction is not for you!", ephemeral=True
+            )
+            return False
+        return True
+
+    @staticmethod
+    async def generate_depth_embed(base_currency: Currency, quote_currency: Currency, levels: int) -> discord.Embed:
+        """
+        Builds an embed with the ask ladder above the bid ladder, best prices closest to the middle.
+        """
+        bids, asks = await TradeService.get_depth(base_currency.currency_id, quote_currency.currency_id, levels)
+
+        embed = discord.Embed(
+            title=f"{base_currency.ticker.upper()}/{quote_currency.ticker.upper()} DEPTH",
+            color=0x808080,
+        )
+        if not bids and not asks:
+            embed.description = "### No open orders found"
+            return embed
+
+        header = ["Price", f"Quantity ({base_currency.ticker.upper()})", "Orders"]
+        for name, ladder in (("🔴 ASKS", reversed(asks)), ("🟢 BIDS", bids)):
+            rows = [[f"{price:,.2f}", f"{amount:,.2f}", str(order_count)] for price, amount, order_count in ladder]
+            embed.add_field(
+                name=name,
+                value=EmbedTable([header] + rows).generate_table() if rows else "No orders",
+                inline=False
+            )
+        return embed
+
+    async def depth_view(self):
+        """
+        Regenerates the ladder and edits the message.
+        """
+        embed = await TradeDepthView.generate_depth_embed(self.base_currency, self.quote_currency, self.levels)
+        if self.message:
+            await self.message.edit(embed=embed, view=self)
+        else:
+            raise ValueError("View message is not set.")
+
+    @discord.ui.button(label="Refresh", style=discord.ButtonStyle.secondary, custom_id="refresh_button", emoji="🔁")
+    async def refresh_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.defer()
+        await self.depth_view()
+
+    @discord.ui.select(
+        placeholder="Levels",
+        options=[
+            discord.SelectOption(label="5", description="5 LEVELS PER SIDE", value="5"),
+            discord.SelectOption(label="10", description="10 LEVELS PER SIDE", value="10"),
+            discord.SelectOption(label="20", description="20 LEVELS PER SIDE", value="20"),
+        ]
+    )
+    async def select_levels(self, interaction: discord.Interaction, select: Select):
+        await interaction.response.defer()
+        self.levels = int(select.values[0])
+        await self.depth_view()
+
+    @classmethod
+    async def display(cls, interaction: discord.Interaction, ticker_pair: str):
+        await interaction.response.defer()
+        try:
+            base_ticker, quote_ticker = ticker_pair.split("/")
+        except ValueError:
+            embed = discord.Embed(
+                title="Invalid Pair",
+                description="Your pair might be in the wrong format\n"
+                            "The format should be like: (ex. USD/EUR, BTC/USD, etc.)",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed)
+            return
+
+        base_currency = await CurrencyService.read_currency_by_ticker(base_ticker)
+        quote_currency = await CurrencyService.read_currency_by_ticker(quote_ticker)
+
+        if not base_currency or not quote_currency:
+            embed = discord.Embed(
+                title="Invalid Ticker",
+                description="The ticker you entered is invalid or does not exist.",
+                color=0xff0000,
+            )
+            await interaction.followup.send(embed=embed)
+            return
+
+        view = cls(user=interaction.user)
+        view.base_currency = base_currency
+        view.quote_currency = quote_currency
+
+        embed = await cls.generate_depth_embed(base_currency, quote_currency, view.levels)
+        view.message = await interaction.followup.send(embed=embed, view=view)
+
+    async def on_timeout(self):
+        """
+        Handles view timeout by disabling all interaction components.
+        """
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            await self.message.edit(view=self)
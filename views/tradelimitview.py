@@ -1,4 +1,5 @@
 import io
+from typing import TYPE_CHECKING
 import discord
 from datetime import timedelta
 from discord import Interaction
@@ -7,10 +8,14 @@ from discord.ui import View, Button, Select
 from models.currency import Currency
 from models.tradelog import TradeLog
 from modals.trademodal import TradeModal
+from modals.markettrademodal import MarketTradeModal
 from services.tradeservice import TradeType, TradeService
 from services.tradelogservice import TradeLogService
 from services.currencyservice import CurrencyService
-from plotting.chartplotter import ChartPlotter
+from services.marketstats import MarketStatsService
+
+if TYPE_CHECKING:
+    from plotting.chartplotter import ChartPlotter
 
 
 class TradeLimitView(View):
@@ -58,6 +63,30 @@ class TradeLimitView(View):
             )
         )
 
+    @discord.ui.button(label="MARKET BUY", style=discord.ButtonStyle.green, custom_id="market_buy_button")
+    async def market_buy_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(
+            MarketTradeModal(
+                self.bot,
+                TradeType.BUY,
+                base_currency=self.base_currency,
+                quote_currency=self.quote_currency,
+                view=self,
+            )
+        )
+
+    @discord.ui.button(label="MARKET SELL", style=discord.ButtonStyle.red, custom_id="market_sell_button")
+    async def market_sell_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(
+            MarketTradeModal(
+                self.bot,
+                TradeType.SELL,
+                base_currency=self.base_currency,
+                quote_currency=self.quote_currency,
+                view=self,
+            )
+        )
+
     @discord.ui.button(label="Refresh", style=discord.ButtonStyle.secondary, custom_id="refresh_button", emoji="🔁")
     async def refresh_button(self, interaction: discord.Interaction, button: Button):
         await interaction.response.defer()
@@ -118,10 +147,14 @@ class TradeLimitView(View):
         self.embed.set_image(url="attachment://chart.png")
         await interaction.message.edit(embed=self.embed, view=self, attachments=[discord_image])
 
+    @staticmethod
+    def format_price(price) -> str:
+        return f"{price:,.2f}" if price is not None else "-"
+
     @staticmethod
     async def generate_trade_info(
         base_currency: Currency, quote_currency: Currency, last_trade_log: TradeLog
-    ) -> tuple[discord.Embed, ChartPlotter, discord.File]:
+    ) -> tuple[discord.Embed, "ChartPlotter", discord.File]:
         if not last_trade_log:
             embed = discord.Embed(
                 title=f"{base_currency.ticker.upper()}/{quote_currency.ticker.upper()}",
@@ -130,19 +163,34 @@ class TradeLimitView(View):
             )
             return embed, None, None
 
-        bid_price = await TradeService.get_bid_price(
-            base_currency.currency_id, quote_currency.currency_id
-        )
-        ask_price = await TradeService.get_ask_price(
+        best_bid_offer = await TradeService.get_best_bid_offer(
             base_currency.currency_id, quote_currency.currency_id
         )
+        stats = await MarketStatsService.get_stats(base_currency.currency_id, quote_currency.currency_id)
 
         embed = discord.Embed(
             title=f"{base_currency.ticker.upper()}/{quote_currency.ticker.upper()}",
             description=f"# {last_trade_log.price:,.2f} {quote_currency.ticker.upper()}",
         )
-        embed.add_field(name="🟢 BID", value=f"{bid_price:,.2f}")
-        embed.add_field(name="🔴 ASK", value=f"{ask_price:,.2f}")
+        embed.add_field(name="🟢 BID", value=TradeLimitView.format_price(best_bid_offer.bid))
+        embed.add_field(name="🔴 ASK", value=TradeLimitView.format_price(best_bid_offer.ask))
+        embed.add_field(name="↔️ SPREAD", value=TradeLimitView.format_price(best_bid_offer.spread))
+        embed.add_field(name="🟢 BID DEPTH", value=f"{best_bid_offer.bid_depth:,.2f} {base_currency.ticker.upper()}")
+        embed.add_field(name="🔴 ASK DEPTH", value=f"{best_bid_offer.ask_depth:,.2f} {base_currency.ticker.upper()}")
+        embed.add_field(
+            name="📊 24H CHANGE",
+            value=f"{stats.change:+.2f}%" if stats.change is not None else "-"
+        )
+        embed.add_field(name="⬆️ 24H HIGH", value=TradeLimitView.format_price(stats.high))
+        embed.add_field(name="⬇️ 24H LOW", value=TradeLimitView.format_price(stats.low))
+        embed.add_field(name="📦 24H VOLUME", value=f"{stats.volume:,.2f} {base_currency.ticker.upper()}")
+        embed.add_field(name="🔢 24H TRADES", value=f"{stats.trade_count:,}")
+        embed.add_field(name="⚖️ 24H VWAP", value=TradeLimitView.format_price(stats.vwap))
+        # The board measures its 24h up to the last trade of each pair instead, so say which window this is
+        embed.set_footer(text="24H figures cover the last 24 hours up to now")
+
+        # Imported on first use: the plotting stack (pandas, NumPy) is too heavy to load at startup
+        from plotting.chartplotter import ChartPlotter
 
         chart = ChartPlotter(
             base_currency_id=base_currency.currency_id,
@@ -1,6 +1,7 @@
 import discord
 from discord.ui import View, Button
-from services.tradelogservice import TradeLogService
+from services.markettickerservice import MarketTickerService
+from services.pagination import Page
 from utilities.embedtable import EmbedTable
 
 class TradeLogView(View):
@@ -12,8 +13,7 @@ class TradeLogView(View):
             timeout (float, optional): Timeout for the view. Defaults to 180.
         """
         super().__init__(timeout=timeout)
-        self.page = 1
-        self.total_pages = 0
+        self.page: Page | None = None  # Page of tickers currently shown
         self.user = None
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -31,28 +31,39 @@ class TradeLogView(View):
         """
         Updates the state of navigation buttons based on the current page.
         """
-        self.children[0].disabled = self.page == 1  # Disable left button on the first page
-        self.children[1].disabled = self.page == self.total_pages  # Disable right button on the last page
+        self.children[0].disabled = not self.page.has_previous  # Disable left button on the first page
+        self.children[1].disabled = not self.page.has_next  # Disable right button on the last page
 
-    async def trade_log_view(self, interaction: discord.Interaction):
+    async def trade_log_view(self, interaction: discord.Interaction,
+                             after: tuple | None = None, before: tuple | None = None):
         """
-        Generates and displays the trade log list for the current page.
+        Generates and displays the trade log list for the page after or before a cursor,
+        or the first page without one.
         """
-        # Fetch paginated trade log data
-        trade_logs, self.total_pages = await TradeLogService.get_trade_log_list_with_price(page=self.page, limit=10)
+        # Fetch paginated market tickers
+        self.page = await MarketTickerService.get_tickers(limit=10, after=after, before=before)
+        tickers = self.page.items
 
         # If no trade logs, show a message
-        if not trade_logs:
+        if not tickers:
             table_message = "No trade logs available."
         else:
             # Prepare data for the table
-            trade_data = [["Base Ticker", "Quote Ticker", "Recent Price"]]
-            for base_ticker, quote_ticker, price in trade_logs:
-                trade_data.append([base_ticker, quote_ticker, str(price)])
+            trade_data = [["Base Ticker", "Quote Ticker", "Recent Price", "24h Change", "24h Volume", "Last Trade"]]
+            for ticker in tickers:
+                # 24 hours up to the last trade of the pair, as stored with it
+                trade_data.append([
+                    ticker.base_ticker,
+                    ticker.quote_ticker,
+                    str(ticker.last_price),
+                    f"{ticker.change_24h:+.2f}%",
+                    f"{ticker.volume_24h:,.2f}",
+                    ticker.last_traded_at.strftime("%Y-%m-%d %H:%M"),
+                ])
 
             # Generate table using EmbedTable utility
             table = EmbedTable(trade_data)
-            table_message = table.generate_table()
+            table_message = table.generate_table() + "\n-# 24h figures cover the 24 hours up to each pair's last trade. Times are UTC."
 
         # Update navigation buttons
         await self.update_buttons()
@@ -68,20 +79,18 @@ class TradeLogView(View):
         """
         Navigates to the previous page when the left button is clicked.
         """
-        if self.page > 1:
+        if self.page.has_previous:
             await interaction.response.defer()
-            self.page -= 1
-            await self.trade_log_view(interaction)
+            await self.trade_log_view(interaction, before=self.page.previous_cursor)
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.gray, custom_id="right_button")
     async def right_button(self, interaction: discord.Interaction, button: Button):
         """
         Navigates to the next page when the right button is clicked.
         """
-        if self.page < self.total_pages:
+        if self.page.has_next:
             await interaction.response.defer()
-            self.page += 1
-            await self.trade_log_view(interaction)
+            await self.trade_log_view(interaction, after=self.page.next_cursor)
 
     async def on_timeout(self):
         """
@@ -1,9 +1,8 @@
 import discord
 from discord.ui import View, Button
 
-from services.accountservice import AccountService
-from services.currencyservice import CurrencyService
 from services.transactionservice import TransactionService
+from services.pagination import Page
 from utilities.embedtable import EmbedTable
 
 
@@ -16,8 +15,7 @@ class TransactionListView(View):
             timeout (float, optional): The timeout in seconds for the view. Defaults to 180.
         """
         super().__init__(timeout=timeout)
-        self.page = 1  # Start at page 1
-        self.total_pages = 0  # Total number of pages will be calculated dynamically
+        self.page: Page | None = None  # Page of transactions currently shown
         self.user = None  # User associated with the view
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -36,46 +34,38 @@ class TransactionListView(View):
         Updates the navigation buttons based on the current page.
         Disables the left button on the first page and the right button on the last page.
         """
-        self.children[0].disabled = self.page == 1  # Disable the left button if on the first page
-        self.children[1].disabled = self.page == self.total_pages  # Disable the right button if on the last page
+        self.children[0].disabled = not self.page.has_previous  # Disable the left button if on the first page
+        self.children[1].disabled = not self.page.has_next  # Disable the right button if on the last page
 
-    async def transaction_view(self, interaction: discord.Interaction):
+    async def transaction_view(self, interaction: discord.Interaction,
+                               after: tuple | None = None, before: tuple | None = None):
         """
-        Generates and displays a table of transactions for the current page.
+        Generates and displays a table of transactions for the page after or before a cursor,
+        or the first page without one.
         """
-
-        # Get the total number of pages for the user based on the transactions available
-        self.total_pages = await TransactionService.get_total_pages(
-            discord_id=interaction.user.id
-        )
-
-        # Fetch the transactions for the current page
-        transactions = await TransactionService.get_all_transactions(
+        # Fetch the transactions of the page
+        self.page = await TransactionService.get_transaction_rows(
             discord_id=interaction.user.id,
-            page=self.page,
-            limit=10  # Number of transactions per page
+            limit=10,  # Number of transactions per page
+            after=after,
+            before=before,
         )
+        transactions = self.page.items
 
         # If no transactions, show a message stating there are none
         if not transactions:
-            print("No transactions")
             table_message = "No transactions available."
         else:
             # Prepare data for the table
             transaction_data = [["Currency Ticker", "Date", "Amount", "Sender", "Receiver"]]
             for transaction in transactions:
-                sender_account = transaction.sender  # Assuming sender is an Account object
-                receiver_account = transaction.receiver  # Assuming receiver is an Account object
-
-                sender_account = await AccountService.read_account_by_id(transaction.sender_account_id)
-                currency = await CurrencyService.read_currency_by_id(sender_account.currency_id)
                 # Append formatted data to the table
                 transaction_data.append([
-                    str(currency.ticker),
+                    str(transaction.ticker),
                     transaction.transaction_date.strftime("%Y-%m-%d %H:%M:%S"),  # Format date
                     str(transaction.amount),  # Transaction amount
-                    str(sender_account.discord_id),  # Use sender's Discord ID (or another identifier)
-                    str(receiver_account.discord_id),  # Use receiver's Discord ID (or another identifier)
+                    str(transaction.sender_discord_id),  # Sender's Discord ID
+                    str(transaction.receiver_discord_id),  # Receiver's Discord ID
                 ])
 
             # Generate the table using the EmbedTable utility
@@ -95,22 +85,20 @@ class TransactionListView(View):
         """
         Navigate to the previous page when the left button is clicked.
         """
-        if self.page > 1:
+        if self.page.has_previous:
             # Defer the response to prevent timeout errors
             await interaction.response.defer()
-            self.page -= 1  # Decrease page number
-            await self.transaction_view(interaction)  # Re-render the view with updated data
+            await self.transaction_view(interaction, before=self.page.previous_cursor)  # Re-render the previous page
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.gray, custom_id="right_button")
     async def right_button(self, interaction: discord.Interaction, button: Button):
         """
         Navigate to the next page when the right button is clicked.
         """
-        if self.page < self.total_pages:
+        if self.page.has_next:
             # Defer the response to prevent timeout errors
             await interaction.response.defer()
-            self.page += 1  # Increase page number
-            await self.transaction_view(interaction)  # Re-render the view with updated data
+            await self.transaction_view(interaction, after=self.page.next_cursor)  # Re-render the next page
 
     async def on_timeout(self):
         """